@@ -0,0 +1,158 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: batch_writer.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Headless entry point, without Qt. Customizes, writes and restores the nodes of a script from a JSON job spec:
+           nuke -t batch_writer.py <script.nk> <job_spec.json> [--only-selected] [--events events.jsonl]
+       The job spec has the same 'scanlines', 'rays', 'writes' and 'settings' entries as the custom dictionary
+       built by the widget. Exits with 1 if anything failed.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import nuke
+import nuke_specific_functions
+import pipeline_events
+import run_timing
+import scene_index
+
+# Keys every Write of a job spec must have, the others get the widget's defaults
+REQUIRED_WRITE_KEYS = ('file',)
+
+
+def load_job_spec(job_spec_path):
+
+    with open(job_spec_path) as f:
+        job_spec = json.load(f)
+
+    custom_dict = {'scanlines': job_spec.get('scanlines') or None,
+                   'rays': job_spec.get('rays') or None,
+                   'writes': job_spec.get('writes') or None,
+                   'settings': job_spec.get('settings') or {}}
+
+    # Checked before anything is opened, a missing key would otherwise stop the run halfway through
+    for write_name, write_dict in (custom_dict['writes'] or {}).items():
+        if not isinstance(write_dict, dict):
+            raise ValueError('Write {0} has to be an object'.format(write_name))
+        missing = [key for key in REQUIRED_WRITE_KEYS if key not in write_dict]
+        if missing:
+            raise ValueError('Write {0} has no {1}'.format(write_name, ', '.join(missing)))
+
+        # Same defaults as a freshly populated Write row of the widget
+        write_dict.setdefault('selected', True)
+        write_dict.setdefault('range', '1-10')
+
+    return custom_dict, job_spec.get('only_selected_writes', False)
+
+
+def print_event(event):
+
+    stream = sys.stderr if event['level'] == pipeline_events.ERROR else sys.stdout
+    stream.write(event['message'] + '\n')
+    stream.flush()
+
+
+def run(script, custom_dict, only_selected_writes, emit=print_event, restore=True, report=True):
+
+    # Every event goes to emit as soon as it happens. Returns the exit status: 0 if every step succeeded, 1 otherwise
+    errors = []
+
+    def stream(events):
+        for event in events:
+            emit(event)
+            if event['level'] == pipeline_events.ERROR:
+                errors.append(event['message'])
+
+    timer = run_timing.RunTimer(script, nuke_specific_functions.get_setting(custom_dict, 'render_mode'))
+
+    # Nothing is restored unless the snapshot was taken
+    original_dict = None
+    stage = 'open'
+    try:
+        with timer.stage(stage):
+            nuke.scriptOpen(script)
+        index = scene_index.SceneIndex()
+
+        # Preview mode only changes the custom values, the snapshot below then covers every knob it touches
+        stage = 'preview'
+        stream(pipeline_events.from_response(stage, nuke_specific_functions.apply_preview(custom_dict)))
+
+        stage = 'snapshot'
+        with timer.stage(stage):
+            snapshot, response = nuke_specific_functions.snapshot_nodes(custom_dict, index)
+            delta = nuke_specific_functions.build_delta(snapshot, custom_dict, only_selected_writes)
+        original_dict = snapshot
+        stream(pipeline_events.from_response(stage, response))
+
+        stage = 'customize'
+        with timer.stage(stage):
+            stream(nuke_specific_functions.iter_customize_nodes(custom_dict, only_selected_writes, index, delta))
+
+        stage = 'write'
+        with timer.stage(stage):
+            stream(nuke_specific_functions.iter_write_custom(custom_dict, only_selected_writes, index, timer))
+
+    except Exception as e:
+        stream([pipeline_events.event(stage, 'ERROR: {0}'.format(e), 'red')])
+
+    finally:
+        if restore and original_dict is not None:
+            with timer.stage('restore'):
+                stream(nuke_specific_functions.iter_return_to_normal(original_dict, index, delta,
+                                                                     nuke_specific_functions.get_setting(custom_dict, 'suspend_callbacks')))
+
+    if report:
+        stream(pipeline_events.from_response('report', nuke_specific_functions.timing_report(custom_dict, timer)))
+
+    return 1 if errors else 0
+
+
+def main(argv):
+
+    parser = argparse.ArgumentParser(prog='nuke -t batch_writer.py',
+                                     description='Customize, write and restore the render nodes of a Nuke script')
+    parser.add_argument('script', help='.nk script to render')
+    parser.add_argument('job_spec', help='JSON job spec with scanlines/rays/writes/settings overrides')
+    parser.add_argument('--only-selected', action='store_true',
+                        help="only render the Writes with 'selected' set to true in the job spec")
+    parser.add_argument('--events', default=None, help='also append every event, as one JSON object per line, to this file')
+    args = parser.parse_args(argv[1:])
+
+    try:
+        custom_dict, only_selected_writes = load_job_spec(args.job_spec)
+    except (IOError, ValueError) as e:
+        sys.stderr.write('ERROR: Could not read job spec {0}: {1}\n'.format(args.job_spec, e))
+        return 2
+
+    if not args.events:
+        return run(args.script, custom_dict, only_selected_writes or args.only_selected)
+
+    sink = pipeline_events.JsonlSink(args.events)
+    try:
+        return run(args.script, custom_dict, only_selected_writes or args.only_selected, pipeline_events.tee(print_event, sink))
+    finally:
+        sink.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
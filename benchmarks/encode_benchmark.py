@@ -0,0 +1,238 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: encode_benchmark.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Encode time and output size of every Write codec preset, to pick fast ones. Needs Nuke:
+           nuke -t benchmarks/encode_benchmark.py [--size 4096x2160] [--frames 3] [--save results.json]
+           nuke -t benchmarks/encode_benchmark.py --script shot.nk --node ScanlineRender1
+       The source (a synthetic checkerboard with noise, or a node of a script) is rendered once to uncompressed EXR
+       and read back by every preset, so the upstream graph is not part of the times.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+
+import nuke
+
+import write_codecs
+
+OUTPUT_DIR = tempfile.gettempdir()
+FORMAT_NAME = 'scene_writer_encode_benchmark'
+
+# (name, extension, datatype, compression), None leaves the Write's default
+PRESETS = [('exr-none-half', '.exr', '16 bit half', 'none'),
+           ('exr-rle-half', '.exr', '16 bit half', 'RLE'),
+           ('exr-zip1-half', '.exr', '16 bit half', 'Zip (1 scanline)'),
+           ('exr-zip16-half', '.exr', '16 bit half', 'Zip (16 scanlines)'),
+           ('exr-piz-half', '.exr', '16 bit half', 'PIZ Wavelet (32 scanlines)'),
+           ('exr-b44-half', '.exr', '16 bit half', 'B44'),
+           ('exr-dwaa-half', '.exr', '16 bit half', 'DWAA'),
+           ('exr-zip1-float', '.exr', '32 bit float', 'Zip (1 scanline)'),
+           ('exr-piz-float', '.exr', '32 bit float', 'PIZ Wavelet (32 scanlines)'),
+           ('png-8', '.png', '8 bit', None),
+           ('png-16', '.png', '16 bit', None),
+           ('tiff-lzw-8', '.tif', '8 bit', 'LZW'),
+           ('tiff-deflate-16', '.tif', '16 bit', 'Deflate'),
+           ('jpeg', '.jpg', None, None)]
+
+
+def frame_path(directory, name, extension):
+
+    return '{0}/{1}.%04d{2}'.format(directory.replace('\\', '/'), name, extension)
+
+
+def codec_write(input_node, file_value, datatype=None, compression=None):
+
+    # A Write set up the same way the scene writer customizes one
+    write = nuke.nodes.Write(inputs=[input_node])
+    write['file'].setValue(file_value)
+    knobs, errors = write_codecs.codec_knobs(file_value, datatype, compression)
+    if errors:
+        raise ValueError('; '.join(errors))
+    for attr in write_codecs.CODEC_KNOBS:
+        if attr in knobs:
+            write[attr].setValue(knobs[attr])
+    return write
+
+
+def synthetic_source(width, height):
+
+    # Flat areas and noise, so run-length and wavelet compressions both have something to chew on
+    nuke.addFormat('{0} {1} 1 {2}'.format(width, height, FORMAT_NAME))
+    checker = nuke.nodes.CheckerBoard2()
+    checker['format'].setValue(FORMAT_NAME)
+    noise = nuke.nodes.Noise(inputs=[checker])
+    noise['opacity'].setValue(0.5)
+    return noise
+
+
+def cache_source(source, frames, output_dir):
+
+    # Renders the source once to uncompressed float EXR and returns a Read of it
+    file_value = frame_path(output_dir, 'source', '.exr')
+    write = codec_write(source, file_value, '32 bit float', 'none')
+    write['channels'].setValue('rgba')
+    nuke.execute(write, 1, frames, 1)
+    nuke.delete(write)
+
+    read = nuke.nodes.Read(file=file_value)
+    for knob_name in ('first', 'origfirst'):
+        read[knob_name].setValue(1)
+    for knob_name in ('last', 'origlast'):
+        read[knob_name].setValue(frames)
+    return read
+
+
+def output_bytes(file_value, frames):
+
+    total = 0
+    for frame in range(1, frames + 1):
+        total += os.path.getsize(file_value % frame)
+    return total
+
+
+def run_preset(read, preset, frames, repeat, output_dir):
+
+    name, extension, datatype, compression = preset
+    file_value = frame_path(output_dir, name, extension)
+    write = codec_write(read, file_value, datatype, compression)
+    write['channels'].setValue('rgba' if extension == '.exr' else 'rgb')
+
+    # Fastest of the runs, every run writes over the frames of the previous one
+    best = None
+    try:
+        for _ in range(repeat):
+            start_time = time.time()
+            nuke.execute(write, 1, frames, 1)
+            elapsed = time.time() - start_time
+            best = elapsed if best is None else min(best, elapsed)
+        size = output_bytes(file_value, frames)
+    finally:
+        nuke.delete(write)
+
+    return {'extension': extension,
+            'datatype': datatype,
+            'compression': compression,
+            'seconds_per_frame': best / frames,
+            'bytes_per_frame': size // frames}
+
+
+def run(presets, frames, repeat, output_dir, width=None, height=None, script=None, node_name=None):
+
+    if script:
+        nuke.scriptOpen(script)
+        source = nuke.toNode(node_name)
+        if source is None:
+            raise ValueError('Node {0} not found in {1}'.format(node_name, script))
+        width, height = source.width(), source.height()
+    else:
+        source = synthetic_source(width, height)
+
+    read = cache_source(source, frames, output_dir)
+    results = {'host': platform.node(),
+               'nuke': nuke.NUKE_VERSION_STRING,
+               'source': '{0}:{1}'.format(script, node_name) if script else 'synthetic',
+               'size': '{0}x{1}'.format(width, height),
+               'frames': frames,
+               'presets': {}}
+
+    for preset in presets:
+        results['presets'][preset[0]] = run_preset(read, preset, frames, repeat, output_dir)
+        print('{0}: {1:.3f}s per frame'.format(preset[0], results['presets'][preset[0]]['seconds_per_frame']))
+
+    return results
+
+
+def report(results):
+
+    presets = results['presets']
+    fastest = min(preset['seconds_per_frame'] for preset in presets.values())
+    lines = ['Encode times, {0} {1}, {2} frame(s) ({3}, Nuke {4})'
+             ''.format(results['source'], results['size'], results['frames'], results['host'], results['nuke']),
+             '{0:<18}{1:>12}{2:>10}{3:>12}{4:>12}'.format('preset', 's/frame', 'ratio', 'MB/frame', 'MB/s')]
+
+    for name in sorted(presets, key=lambda name: presets[name]['seconds_per_frame']):
+        preset = presets[name]
+        megabytes = preset['bytes_per_frame'] / (1024.0 * 1024.0)
+        lines.append('{0:<18}{1:>12.3f}{2:>9.2f}x{3:>12.2f}{4:>12.1f}'
+                     ''.format(name, preset['seconds_per_frame'], preset['seconds_per_frame'] / fastest,
+                               megabytes, megabytes / max(preset['seconds_per_frame'], 1e-6)))
+
+    return '\n'.join(lines)
+
+
+def main(argv):
+
+    parser = argparse.ArgumentParser(prog='encode_benchmark.py',
+                                     description='Time the encoding and measure the output size of the Write codec presets')
+    parser.add_argument('--size', default='4096x2160', help='WIDTHxHEIGHT of the synthetic source')
+    parser.add_argument('--frames', type=int, default=3, help='frames written by every preset')
+    parser.add_argument('--repeat', type=int, default=2, help='runs per preset, the fastest one is reported')
+    parser.add_argument('--presets', nargs='+', help='names of the presets to run, all of them by default')
+    parser.add_argument('--script', help='script holding the node to use as source instead of the synthetic one')
+    parser.add_argument('--node', help='node of --script to use as source')
+    parser.add_argument('--output', default=OUTPUT_DIR,
+                        help='directory a new folder for the frames is made in, only that folder is removed afterwards')
+    parser.add_argument('--keep', action='store_true', help='keep the folder of the frames written')
+    parser.add_argument('--save', help='save the results to this JSON file')
+    args = parser.parse_args(argv[1:])
+
+    if bool(args.script) != bool(args.node):
+        parser.error('--script and --node go together')
+
+    presets = [preset for preset in PRESETS if not args.presets or preset[0] in args.presets]
+    if not presets:
+        parser.error('no preset named {0}, choose among {1}'.format(', '.join(args.presets),
+                                                                     ', '.join(preset[0] for preset in PRESETS)))
+
+    width, height = (int(value) for value in args.size.lower().split('x'))
+
+    # The frames go to a folder of their own, so nothing that was already in --output is ever removed
+    if not os.path.isdir(args.output):
+        os.makedirs(args.output)
+    output_dir = tempfile.mkdtemp(prefix='scene_writer_encode_benchmark_', dir=args.output)
+    try:
+        results = run(presets, max(1, args.frames), max(1, args.repeat), output_dir,
+                      width, height, args.script, args.node)
+    finally:
+        if args.keep:
+            print('Frames kept in {0}'.format(output_dir))
+        else:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    print(report(results))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print('Results saved to {0}'.format(args.save))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,390 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: fake_nuke.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: In-process stand-in for the parts of the nuke module used by the scene writer, with synthetic scenes of
+       ScanlineRender, RayRender and Write nodes. Installed as sys.modules['nuke'] by install().
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import sys
+import time
+
+# Simulated cost of rendering one frame of one Write, in seconds
+EXECUTE_COST_PER_FRAME = 0.0
+
+# Codec knobs a Write gets for each file type, with their defaults; they are replaced when file_type is set
+FILE_TYPE_KNOBS = {'exr': {'datatype': '16 bit half', 'compression': 'Zip (1 scanline)'},
+                   'png': {'datatype': '8 bit'},
+                   'tiff': {'datatype': '8 bit', 'compression': 'none'},
+                   'dpx': {'datatype': '10 bit'},
+                   'jpeg': {}}
+
+
+class Knob(object):
+
+    def __init__(self, name, value):
+
+        self._name = name
+        self._value = value
+
+
+    def name(self):
+
+        return self._name
+
+
+    def value(self):
+
+        return self._value
+
+
+    def getValue(self):
+
+        return self._value
+
+
+    def setValue(self, value):
+
+        if self._name == 'name':
+            self.node.setName(value)
+        if self._name == 'file_type':
+            self.node.set_file_type(value)
+        self._value = value
+        ROOT._modified = True
+        STATS['setValue'] += 1
+        run_callbacks(knobChangeds, self.node, self)
+        return True
+
+
+class Node(object):
+
+    def __init__(self, node_class, name, knobs, parent=None):
+
+        self._class = node_class
+        self._name = name
+        self._parent = parent
+        self._inputs = []
+        self._knobs = {}
+        for knob_name, knob_value in knobs.items():
+            knob = Knob(knob_name, knob_value)
+            knob.node = self
+            self._knobs[knob_name] = knob
+        self._knobs.setdefault('name', Knob('name', name))
+        self._knobs['name'].node = self
+
+
+    def Class(self):
+
+        return self._class
+
+
+    def name(self):
+
+        return self._name
+
+
+    def fullName(self):
+
+        if self._parent is None or self._parent is ROOT:
+            return self._name
+        return self._parent.fullName() + '.' + self._name
+
+
+    def setName(self, name):
+
+        del NODES[self.fullName()]
+        self._name = name
+        NODES[self.fullName()] = self
+
+
+    def set_file_type(self, file_type):
+
+        for knob_name in ('datatype', 'compression'):
+            self._knobs.pop(knob_name, None)
+        for knob_name, knob_value in FILE_TYPE_KNOBS.get(file_type, {}).items():
+            knob = Knob(knob_name, knob_value)
+            knob.node = self
+            self._knobs[knob_name] = knob
+
+
+    def knob(self, name):
+
+        return self._knobs.get(name)
+
+
+    def knobs(self):
+
+        return dict(self._knobs)
+
+
+    def __getitem__(self, name):
+
+        return self._knobs[name]
+
+
+    def inputs(self):
+
+        return len(self._inputs)
+
+
+    def input(self, index):
+
+        if index < len(self._inputs):
+            return self._inputs[index]
+        return None
+
+
+    def setInput(self, index, node):
+
+        while len(self._inputs) <= index:
+            self._inputs.append(None)
+        self._inputs[index] = node
+
+
+    def dependencies(self, what=None):
+
+        return [node for node in self._inputs if node is not None]
+
+
+class Group(Node):
+
+    def __init__(self, node_class, name, knobs, parent=None):
+
+        Node.__init__(self, node_class, name, knobs, parent)
+        self._children = []
+
+
+    def nodes(self):
+
+        return list(self._children)
+
+
+class Root(Group):
+
+    def name(self):
+
+        return self._knobs['name'].value() or 'Root'
+
+
+    def modified(self):
+
+        return getattr(self, '_modified', False)
+
+
+ROOT = Root('Root', 'root', {'name': '', 'first_frame': 1, 'last_frame': 100, 'proxy': False, 'proxy_scale': 0.5})
+NODES = {}
+STATS = {'toNode': 0, 'setValue': 0, 'execute': 0, 'frames': 0, 'undo_groups': 0}
+
+# Same layout as the registries of nuke.callbacks: {node class: [(callback, args, kwargs, node class)]}
+onCreates = {}
+onDestroys = {}
+knobChangeds = {}
+updateUIs = {}
+THIS = {'node': None, 'knob': None}
+
+
+class current(object):
+
+    def __init__(self, node, knob=None):
+
+        self.node = node
+        self.knob = knob
+
+
+    def __enter__(self):
+
+        self.previous = (THIS['node'], THIS['knob'])
+        THIS['node'], THIS['knob'] = self.node, self.knob
+
+
+    def __exit__(self, *args):
+
+        THIS['node'], THIS['knob'] = self.previous
+
+
+# SCENE
+def clear():
+
+    NODES.clear()
+    ROOT._children = []
+    ROOT._modified = False
+    for key in STATS:
+        STATS[key] = 0
+
+
+def add_node(node_class, name, knobs, parent=None, group=False):
+
+    parent = parent or ROOT
+    node = (Group if group else Node)(node_class, name, knobs, parent)
+    parent._children.append(node)
+    NODES[node.fullName()] = node
+    run_callbacks(onCreates, node)
+    return node
+
+
+def build_scene(node_count, script='/tmp/scene_writer_benchmark.nk', output_dir='/tmp/scene_writer_benchmark'):
+
+    # node_count ScanlineRender, RayRender and Write nodes, each Write fed by one of the renders
+    clear()
+    ROOT['name']._value = script
+
+    for i in range(node_count):
+        scanline = add_node('ScanlineRender', 'ScanlineRender{0}'.format(i + 1),
+                            {'filter': 1, 'antialiasing': 0, 'samples': 1, 'shutter': 0.5})
+        ray = add_node('RayRender', 'RayRender{0}'.format(i + 1),
+                       {'filter': 1, 'samples': 1, 'shutter': 0.5})
+        write = add_node('Write', 'Write{0}'.format(i + 1),
+                         dict({'file': '{0}/write{1}.####.exr'.format(output_dir, i + 1), 'proxy': '', 'file_type': 'exr'},
+                              **FILE_TYPE_KNOBS['exr']))
+        write.setInput(0, scanline if i % 2 == 0 else ray)
+
+
+# nuke API
+def root():
+
+    return ROOT
+
+
+def toNode(name):
+
+    STATS['toNode'] += 1
+    if name == 'root':
+        return ROOT
+    return NODES.get(name)
+
+
+def allNodes(filter=None, group=None, recurseGroups=False):
+
+    pending = [group or ROOT]
+    found = []
+    while pending:
+        parent = pending.pop(0)
+        for node in parent.nodes():
+            if filter is None or node.Class() == filter:
+                found.append(node)
+            if recurseGroups and isinstance(node, Group):
+                pending.append(node)
+    return found
+
+
+def thisNode():
+
+    return THIS['node']
+
+
+def thisKnob():
+
+    return THIS['knob']
+
+
+def execute(node, start, end, incr=1, views=None):
+
+    frames = len(range(int(start), int(end) + 1, int(incr)))
+    STATS['execute'] += 1
+    STATS['frames'] += frames
+    if EXECUTE_COST_PER_FRAME:
+        time.sleep(EXECUTE_COST_PER_FRAME * frames)
+
+
+def executeMultiple(nodes, ranges, views=None, continueOnError=False):
+
+    # Shared upstream work is only paid once per frame, whatever the number of Writes
+    for start, end, incr in ranges:
+        execute(nodes[0], start, end, incr)
+
+
+def executeInMainThreadWithResult(function, args=(), kwargs=None):
+
+    return function(*args, **(kwargs or {}))
+
+
+def scriptOpen(path):
+
+    ROOT._modified = False
+
+
+def add_callback(registry, callback, args, kwargs, nodeClass):
+
+    registry.setdefault(nodeClass, []).append((callback, args, kwargs, nodeClass))
+
+
+def remove_callback(registry, callback, args, kwargs, nodeClass):
+
+    registry[nodeClass].remove((callback, args, kwargs, nodeClass))
+
+
+def run_callbacks(registry, node, knob=None):
+
+    for node_class in ('*', node.Class()):
+        for callback, args, kwargs, callback_class in list(registry.get(node_class, [])):
+            with current(node, knob):
+                callback(*args, **kwargs)
+
+
+def delete(node):
+
+    run_callbacks(onDestroys, node)
+    node._parent._children.remove(node)
+    del NODES[node.fullName()]
+
+
+def addOnCreate(callback, args=(), kwargs={}, nodeClass='*'):
+
+    add_callback(onCreates, callback, args, kwargs, nodeClass)
+
+
+def removeOnCreate(callback, args=(), kwargs={}, nodeClass='*'):
+
+    remove_callback(onCreates, callback, args, kwargs, nodeClass)
+
+
+def addOnDestroy(callback, args=(), kwargs={}, nodeClass='*'):
+
+    add_callback(onDestroys, callback, args, kwargs, nodeClass)
+
+
+def removeOnDestroy(callback, args=(), kwargs={}, nodeClass='*'):
+
+    remove_callback(onDestroys, callback, args, kwargs, nodeClass)
+
+
+def addKnobChanged(callback, args=(), kwargs={}, nodeClass='*'):
+
+    add_callback(knobChangeds, callback, args, kwargs, nodeClass)
+
+
+def removeKnobChanged(callback, args=(), kwargs={}, nodeClass='*'):
+
+    remove_callback(knobChangeds, callback, args, kwargs, nodeClass)
+
+
+class Undo(object):
+
+    def begin(self, name=None):
+
+        STATS['undo_groups'] += 1
+
+
+    def end(self):
+
+        pass
+
+
+def install():
+
+    sys.modules['nuke'] = sys.modules[__name__]
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: fake_worker.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Stand-in for the Nuke binary as render_pool launches it, to run the pool without a Nuke license:
+           fake_worker.py [-m threads] [-c cacheM] -t render_worker.py <job.json>
+       Prints [message, color] lines like render_worker.py does. Extra job keys drive it:
+           fake_seconds: time spent per frame
+           fake_failures: attempts that fail before one succeeds, counted in the fake_attempts file
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import json
+import sys
+import time
+
+
+def emit(message, color):
+
+    sys.stdout.write(json.dumps([message, color]) + '\n')
+    sys.stdout.flush()
+
+
+def parse_arguments(argv):
+
+    # ({flag: value}, job file), the flags as nuke takes them
+    flags = {}
+    args = list(argv[1:])
+    while args and args[0].startswith('-'):
+        flag = args.pop(0)
+        flags[flag] = args.pop(0) if args else None
+    if '-t' not in flags or len(args) != 1:
+        return flags, None
+    return flags, args[0]
+
+
+def attempt_number(job):
+
+    # Attempts so far at this job, this one included
+    if not job.get('fake_attempts'):
+        return 1
+    with open(job['fake_attempts'], 'a') as f:
+        f.write('{0}\n'.format(job['write']))
+    with open(job['fake_attempts']) as f:
+        return sum(1 for line in f if line.strip() == job['write'])
+
+
+def main(argv):
+
+    flags, job_file = parse_arguments(argv)
+    if job_file is None:
+        sys.stderr.write('Usage: fake_worker.py [-m threads] [-c cacheM] -t render_worker.py <job.json>\n')
+        return 2
+
+    with open(job_file) as f:
+        job = json.load(f)
+
+    emit('Worker for {0}, threads {1}, cache {2}'.format(job['write'], flags.get('-m', 'default'),
+                                                         flags.get('-c', 'default')), 'grey')
+    if attempt_number(job) <= job.get('fake_failures', 0):
+        emit('ERROR: Simulated failure of {0}'.format(job['write']), 'red')
+        return 1
+
+    frames = range(job['first'], job['last'] + 1, job.get('step', 1))
+    for frame in frames:
+        time.sleep(job.get('fake_seconds', 0.0))
+    emit('FINISHED Writing node {0} for frame range {1}-{2}'.format(job['write'], job['first'], job['last']), 'lime')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
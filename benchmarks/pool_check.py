@@ -0,0 +1,127 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: pool_check.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Runs the worker pool end to end with benchmarks/fake_worker.py standing in for Nuke, no license needed:
+           python benchmarks/pool_check.py [--workers 2]
+       Chunks of a range are rendered, the exit status and log of every worker are collected, a chunk failing
+       once is retried and a chunk that keeps failing is reported. The exit status is 1 if any check fails.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import argparse
+import os
+import shutil
+import stat
+import sys
+import tempfile
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+
+import render_admission
+import render_pool
+
+FAKE_WORKER = os.path.join(BENCHMARKS_DIR, 'fake_worker.py')
+
+
+def pool_jobs(temp_dir):
+
+    # Two chunks that render, one failing on its first attempt only and one failing on every attempt
+    attempts_file = os.path.join(temp_dir, 'attempts.txt')
+    jobs = []
+    for first, last, step in render_pool.split_range(1, 10, 5):
+        jobs.append({'script': '/tmp/pool_check.nk', 'write': 'Write1', 'file': '/tmp/pool_check/write1.####.exr',
+                     'first': first, 'last': last, 'step': step, 'fake_seconds': 0.01})
+    jobs.append({'script': '/tmp/pool_check.nk', 'write': 'WriteFlaky', 'file': '/tmp/pool_check/flaky.####.exr',
+                 'first': 1, 'last': 3, 'fake_failures': 1, 'fake_attempts': attempts_file})
+    jobs.append({'script': '/tmp/pool_check.nk', 'write': 'WriteBroken', 'file': '/tmp/pool_check/broken.####.exr',
+                 'first': 1, 'last': 3, 'fake_failures': 99, 'fake_attempts': attempts_file})
+    return jobs
+
+
+def results_of(results, write):
+
+    return [result for result in results if result['job']['write'] == write]
+
+
+def check_results(results, admitted):
+
+    # [(check, passed)]
+    write1 = results_of(results, 'Write1')
+    flaky = results_of(results, 'WriteFlaky')
+    broken = results_of(results, 'WriteBroken')
+    failed = [job['write'] for job in render_pool.failed_jobs(results)]
+    response = render_pool.results_to_response(results)
+    messages = [message for message, color in response]
+
+    checks = [('every chunk of Write1 rendered once',
+               sorted((result['job']['first'], result['returncode']) for result in write1) == [(1, 0), (6, 0)]),
+              ('worker log collected',
+               all('FINISHED Writing node Write1' in result['output'] for result in write1)),
+              ('failing chunk retried until it renders',
+               [result['returncode'] for result in flaky] == [1, 0] and flaky[1].get('attempt') == 1),
+              ('chunk failing every attempt reported',
+               len(broken) == 2 and all(result['returncode'] == 1 for result in broken) and failed == ['WriteBroken']),
+              ('exit statuses in the response',
+               any(message.startswith('ERROR: Worker job WriteBroken') for message in messages)
+               and any(message.startswith('FINISHED worker job Write1') for message in messages))]
+    if admitted:
+        checks.append(('thread and cache limits passed to the workers',
+                       all('threads default' not in result['output'] for result in results)))
+    return checks
+
+
+def run(workers, admitted):
+
+    temp_dir = tempfile.mkdtemp(prefix='scene_writer_pool_check_')
+    try:
+        admission = None
+        if admitted:
+            footprints = render_admission.FootprintStore(os.path.join(temp_dir, 'footprints.json'), default_mb=64)
+            admission = render_admission.AdmissionController(workers, footprints, reserve_mb=0)
+        results = render_pool.run_jobs_with_retries(pool_jobs(temp_dir), FAKE_WORKER, workers, retries=1,
+                                                    admission=admission)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return results
+
+
+def main(argv):
+
+    parser = argparse.ArgumentParser(prog='pool_check.py',
+                                     description='Run the worker pool end to end against a stand-in Nuke binary')
+    parser.add_argument('--workers', type=int, default=2, help='workers running at once')
+    args = parser.parse_args(argv[1:])
+
+    # Launched directly by the pool, as the Nuke binary would be
+    mode = os.stat(FAKE_WORKER).st_mode
+    if not mode & stat.S_IXUSR:
+        os.chmod(FAKE_WORKER, mode | stat.S_IXUSR)
+
+    all_passed = True
+    for admitted in (False, True):
+        print('-- {0} --'.format('With admission control' if admitted else 'Without admission control'))
+        for check, passed in check_results(run(max(1, args.workers), admitted), admitted):
+            all_passed = all_passed and passed
+            print('{0:<6}{1}'.format('ok' if passed else 'FAIL', check))
+
+    return 0 if all_passed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,241 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: run_benchmarks.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Times the hot paths of the scene writer on synthetic scenes, without a Nuke license:
+           python benchmarks/run_benchmarks.py [--sizes 10 1000 10000] [--save results.json] [--compare old.json]
+       The widget steps (table population, original/custom dictionaries) run offscreen and are skipped when
+       PySide2 is not available.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+import fake_nuke
+fake_nuke.install()
+
+import nuke_specific_functions
+import scene_index
+
+DEFAULT_SIZES = (10, 1000, 10000)
+OUTPUT_DIR = '/tmp/scene_writer_benchmark'
+
+# A step is reported as a regression when it is this many times slower than in the compared results
+REGRESSION_RATIO = 1.2
+# Steps faster than this are timer noise and never flagged
+REGRESSION_MIN_SECONDS = 0.001
+
+
+def timed(function, *args):
+
+    start_time = time.time()
+    result = function(*args)
+    return result, time.time() - start_time
+
+
+def best_of(repeat, function):
+
+    # function() -> {step: seconds}, the fastest run of every step is kept
+    best = {}
+    for _ in range(repeat):
+        for step, elapsed in function().items():
+            best[step] = min(elapsed, best.get(step, elapsed))
+    return best
+
+
+def heavy_callback(cost):
+
+    # Stand-in for a studio knobChanged callback that does real work
+    def callback():
+        time.sleep(cost)
+    return callback
+
+
+def synthetic_custom_dict(node_count, suspend_callbacks=False):
+
+    # Same shape as SceneWriter.build_custom_dictionary, with every knob changed and every Write selected
+    custom_dict = {'scanlines': {}, 'rays': {}, 'writes': {},
+                   'settings': {'render_mode': nuke_specific_functions.RENDER_MODE_LOCAL,
+                                'suspend_callbacks': suspend_callbacks}}
+
+    for i in range(node_count):
+        custom_dict['scanlines']['ScanlineRender{0}'.format(i + 1)] = {'filter': 2, 'antialiasing': 1, 'samples': 4, 'shutter': 0.75}
+        custom_dict['rays']['RayRender{0}'.format(i + 1)] = {'filter': 2, 'samples': 4, 'shutter': 0.75}
+        custom_dict['writes']['Write{0}'.format(i + 1)] = {'selected': True,
+                                                           'file': '{0}/custom{1}.####.png'.format(OUTPUT_DIR, i + 1),
+                                                           'range': '1-10',
+                                                           'chunk_size': 0,
+                                                           'workers': None}
+    return custom_dict
+
+
+def bench_pipeline(node_count, suspend_callbacks=False):
+
+    # Qt-free customize -> write -> restore, as run by batch_writer
+    fake_nuke.build_scene(node_count, output_dir=OUTPUT_DIR)
+    custom_dict = synthetic_custom_dict(node_count, suspend_callbacks)
+    timings = {}
+
+    index = scene_index.SceneIndex()
+    _, timings['scan'] = timed(index.scan)
+    (original_dict, _), timings['snapshot_nodes'] = timed(nuke_specific_functions.snapshot_nodes, custom_dict, index)
+    delta, timings['build_delta'] = timed(nuke_specific_functions.build_delta, original_dict, custom_dict, False)
+    _, timings['customize_nodes'] = timed(nuke_specific_functions.customize_nodes, custom_dict, False, index, delta)
+    _, timings['write_custom'] = timed(nuke_specific_functions.write_custom, custom_dict, False, index)
+    _, timings['return_to_normal'] = timed(nuke_specific_functions.return_to_normal, original_dict, index, delta, suspend_callbacks)
+
+    return timings
+
+
+def bench_widget(widget_class, node_count):
+
+    # Offscreen table population and dictionaries, as run by the widget before starting a job
+    fake_nuke.build_scene(node_count, output_dir=OUTPUT_DIR)
+    timings = {}
+
+    widget, timings['widget_startup'] = timed(widget_class)
+    for model in (widget.scanline_model, widget.ray_model, widget.write_model):
+        model.clear()
+
+    _, timings['populate_scanline'] = timed(widget.populate_scanline)
+    _, timings['populate_ray'] = timed(widget.populate_ray)
+    _, timings['populate_write'] = timed(widget.populate_write)
+    widget.populated_tabs = set(range(widget.ui.tabs.count()))
+
+    index = scene_index.SceneIndex()
+    _, timings['build_original_dictionary'] = timed(widget.build_original_dictionary, index)
+    _, timings['build_custom_dictionary'] = timed(widget.build_custom_dictionary, index)
+    _, timings['log_flush'] = timed(widget.log_sink.flush)
+
+    widget.scene_watcher.unregister_callbacks()
+    widget.log_sink.close()
+    widget.deleteLater()
+    return timings
+
+
+def load_widget_class():
+
+    # None when PySide2 can't be imported, the widget steps are then skipped
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try:
+        from PySide2 import QtWidgets
+        import scene_writerUI
+    except ImportError as e:
+        print('Skipping the widget benchmarks: {0}'.format(e))
+        return None
+
+    global QT_APP
+    QT_APP = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    return scene_writerUI.SceneWriter
+
+
+def run(sizes, repeat, frame_cost, callback_cost=0.0, suspend_callbacks=False):
+
+    fake_nuke.EXECUTE_COST_PER_FRAME = frame_cost
+    fake_nuke.knobChangeds.clear()
+    if callback_cost:
+        fake_nuke.addKnobChanged(heavy_callback(callback_cost))
+    if not os.path.isdir(OUTPUT_DIR):
+        os.makedirs(OUTPUT_DIR)
+
+    widget_class = load_widget_class()
+
+    results = {'python': platform.python_version(),
+               'platform': platform.platform(),
+               'repeat': repeat,
+               'frame_cost': frame_cost,
+               'callback_cost': callback_cost,
+               'suspend_callbacks': suspend_callbacks,
+               'timings': {}}
+
+    for node_count in sizes:
+        timings = best_of(repeat, lambda: bench_pipeline(node_count, suspend_callbacks))
+        if widget_class is not None:
+            timings.update(best_of(repeat, lambda: bench_widget(widget_class, node_count)))
+        results['timings'][str(node_count)] = timings
+
+    return results
+
+
+def report(results, baseline=None):
+
+    # One line per size and step; with a baseline, the ratio to it and a REGRESSION flag
+    lines = []
+    for size in sorted(results['timings'], key=int):
+        lines.append('-- {0} node(s) of each class --'.format(size))
+        for step, elapsed in sorted(results['timings'][size].items()):
+            line = '{0:<28}{1:>10.4f}s'.format(step, elapsed)
+
+            if baseline is not None:
+                old_elapsed = baseline['timings'].get(size, {}).get(step)
+                if old_elapsed:
+                    ratio = elapsed / old_elapsed
+                    line += '{0:>10.2f}x'.format(ratio)
+                    if ratio > REGRESSION_RATIO and elapsed > REGRESSION_MIN_SECONDS:
+                        line += '  REGRESSION'
+
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def main(argv):
+
+    parser = argparse.ArgumentParser(prog='run_benchmarks.py',
+                                     description='Time the scene writer on synthetic scenes with a fake nuke module')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='number of ScanlineRender, RayRender and Write nodes in each scene')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per size, the fastest one is reported')
+    parser.add_argument('--frame-cost', type=float, default=0.0,
+                        help='simulated seconds to render one frame of one Write')
+    parser.add_argument('--callback-cost', type=float, default=0.0,
+                        help='simulated seconds taken by a knobChanged callback registered for every class')
+    parser.add_argument('--suspend-callbacks', action='store_true',
+                        help='suspend knobChanged callbacks while customizing and restoring')
+    parser.add_argument('--save', help='save the results to this JSON file')
+    parser.add_argument('--compare', help='JSON results of a previous version to compare against')
+    args = parser.parse_args(argv[1:])
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results = run(args.sizes, max(1, args.repeat), args.frame_cost, args.callback_cost, args.suspend_callbacks)
+    results_report = report(results, baseline)
+    print(results_report)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print('Results saved to {0}'.format(args.save))
+
+    if 'REGRESSION' in results_report:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
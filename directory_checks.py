@@ -0,0 +1,130 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: directory_checks.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Existence checks of output directories, done at once for every distinct directory on a thread pool, so the
+       latency of network mounts is paid once per batch instead of once per Write. Results are cached for a few
+       seconds, missing directories can be created in the same batch.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import os
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
+DEFAULT_MAX_WORKERS = 16
+
+# Seconds a result is trusted; a missing directory is looked at again sooner, it may be created at any moment
+EXISTING_TTL = 30
+MISSING_TTL = 5
+
+
+def directory_key(path):
+
+    return os.path.normcase(os.path.abspath(path))
+
+
+def check_directory(path, create=False):
+
+    # {'exists', 'created', 'error'} for one directory
+    if os.path.isdir(path):
+        return {'exists': True, 'created': False, 'error': None}
+    if not create:
+        return {'exists': False, 'created': False, 'error': None}
+    try:
+        os.makedirs(path)
+    except OSError as e:
+        # Created by someone else in between is as good
+        if not os.path.isdir(path):
+            return {'exists': False, 'created': False, 'error': str(e)}
+    return {'exists': True, 'created': True, 'error': None}
+
+
+class DirectoryCache(object):
+
+    def __init__(self, existing_ttl=EXISTING_TTL, missing_ttl=MISSING_TTL, max_workers=DEFAULT_MAX_WORKERS):
+
+        self.existing_ttl = existing_ttl
+        self.missing_ttl = missing_ttl
+        self.max_workers = max_workers
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+
+    def cached(self, path):
+
+        # True or False while the result is fresh, None otherwise
+        with self.lock:
+            entry = self.entries.get(directory_key(path))
+        if entry is None:
+            return None
+        exists, checked_at = entry
+        if time.time() - checked_at > (self.existing_ttl if exists else self.missing_ttl):
+            return None
+        return exists
+
+
+    def mark(self, path, exists):
+
+        with self.lock:
+            self.entries[directory_key(path)] = (exists, time.time())
+
+
+    def invalidate(self):
+
+        with self.lock:
+            self.entries.clear()
+
+
+    def check(self, paths, create=False):
+
+        # {path: {'exists', 'created', 'error'}} for every path given, each distinct directory looked at once
+        results = {}
+        to_check = {}
+        for path in paths:
+            if path in results:
+                continue
+            exists = self.cached(path)
+            if exists or (exists is False and not create):
+                self.hits += 1
+                results[path] = {'exists': exists, 'created': False, 'error': None}
+            else:
+                to_check.setdefault(directory_key(path), path)
+
+        if to_check:
+            self.misses += len(to_check)
+            pool = ThreadPool(max(1, min(self.max_workers, len(to_check))))
+            try:
+                checked = pool.map(lambda path: check_directory(path, create), list(to_check.values()))
+            finally:
+                pool.close()
+                pool.join()
+
+            for path, result in zip(to_check.values(), checked):
+                if result['error'] is None:
+                    self.mark(path, result['exists'])
+                results[path] = result
+
+        # Same directory spelled differently, e.g. with a trailing slash
+        for path in paths:
+            if path not in results:
+                results[path] = results[to_check[directory_key(path)]]
+
+        return results
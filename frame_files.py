@@ -0,0 +1,111 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: frame_files.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Helpers to expand a Write's file pattern (#### or %04d padding) over a frame range and to check which frames
+       are already on disk, listing each output directory once instead of stat-ing every frame.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import os
+import re
+
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+HASH_PADDING = re.compile(r'#+')
+PRINTF_PADDING = re.compile(r'%(0?)(\d*)d')
+
+# Frames smaller than this fraction of the median frame size are considered truncated
+TRUNCATED_RATIO = 0.1
+
+
+def frame_path(pattern, frame):
+
+    match = HASH_PADDING.search(pattern)
+    if match:
+        return pattern[:match.start()] + str(frame).zfill(len(match.group())) + pattern[match.end():]
+
+    match = PRINTF_PADDING.search(pattern)
+    if match:
+        return pattern[:match.start()] + (match.group() % frame) + pattern[match.end():]
+
+    return pattern
+
+
+def scan_directory(directory, listings=None):
+
+    # {file name: size in bytes} for every file in the directory, listed once and cached in listings
+    if listings is not None and directory in listings:
+        return listings[directory]
+
+    sizes = {}
+    if os.path.isdir(directory):
+        if scandir is not None:
+            for entry in scandir(directory):
+                if entry.is_file():
+                    sizes[entry.name] = entry.stat().st_size
+        else:
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                if os.path.isfile(path):
+                    sizes[name] = os.path.getsize(path)
+
+    if listings is not None:
+        listings[directory] = sizes
+    return sizes
+
+
+def frame_sizes(pattern, frames, listings=None):
+
+    # {frame: size in bytes, or None if the frame is not on disk}
+    sizes = scan_directory(os.path.dirname(pattern), listings)
+    return dict((frame, sizes.get(os.path.basename(frame_path(pattern, frame)))) for frame in frames)
+
+
+def minimum_frame_size(sizes):
+
+    present = sorted(size for size in sizes.values() if size)
+    if not present:
+        return 1
+    median = present[len(present) // 2]
+    return max(1, int(median * TRUNCATED_RATIO))
+
+
+def frames_to_render(pattern, frames, listings=None):
+
+    # Frames that are missing, empty or truncated on disk
+    sizes = frame_sizes(pattern, frames, listings)
+    minimum_size = minimum_frame_size(sizes)
+    return [frame for frame in frames if sizes[frame] is None or sizes[frame] < minimum_size]
+
+
+def contiguous_ranges(frames, step=1):
+
+    # [1, 2, 3, 7, 8] -> [(1, 3), (7, 8)]
+    ranges = []
+    for frame in sorted(frames):
+        if ranges and frame == ranges[-1][1] + step:
+            ranges[-1] = (ranges[-1][0], frame)
+        else:
+            ranges.append((frame, frame))
+    return ranges
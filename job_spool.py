@@ -0,0 +1,244 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: job_spool.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Job spool on a shared directory, drained by spool_worker.py daemons on any number of hosts.
+       Every job is one JSON file moving between sub-directories with atomic renames:
+           pending/<job>.json -> claimed/<job>@<worker>.json -> done/<job>.json or failed/<job>.json
+       The rename out of pending/ is the claim, only one worker can win it. Workers touch their claimed file as a
+       heartbeat, and claims whose heartbeat stops are put back in pending/.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import datetime
+import json
+import os
+import re
+import socket
+import time
+
+PENDING = 'pending'
+CLAIMED = 'claimed'
+DONE = 'done'
+FAILED = 'failed'
+TEMP = 'tmp'
+STATES = (PENDING, CLAIMED, DONE, FAILED)
+
+HEARTBEAT_INTERVAL = 10
+STALE_AFTER = 60
+MAX_ATTEMPTS = 2
+POLL_INTERVAL = 2
+
+
+def ensure_spool(spool_dir):
+
+    for sub_dir in STATES + (TEMP,):
+        path = os.path.join(spool_dir, sub_dir)
+        if not os.path.isdir(path):
+            try:
+                os.makedirs(path)
+            except OSError:
+                # Another host created it first
+                if not os.path.isdir(path):
+                    raise
+
+
+def new_run_id():
+
+    return '{0}_{1}_{2}'.format(datetime.datetime.now().strftime('%Y%m%d_%H%M%S'), re.sub(r'\W', '', socket.gethostname()), os.getpid())
+
+
+def worker_id(slot=0):
+
+    return '{0}-{1}-{2}'.format(re.sub(r'\W', '', socket.gethostname()), os.getpid(), slot)
+
+
+def job_file_id(job_path):
+
+    # pending/<job>.json and claimed/<job>@<worker>.json -> <job>
+    return os.path.basename(job_path)[:-len('.json')].split('@')[0]
+
+
+def write_json(spool_dir, path, data):
+
+    # Written in tmp/ first and renamed in, so readers never see a half-written file
+    temp_path = os.path.join(spool_dir, TEMP, '{0}.{1}.{2}'.format(os.path.basename(path), socket.gethostname(), os.getpid()))
+    with open(temp_path, 'w') as f:
+        json.dump(data, f)
+    os.rename(temp_path, path)
+
+
+def read_json(path):
+
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def submit(spool_dir, jobs, run_id, max_attempts=MAX_ATTEMPTS):
+
+    # Returns the ids of the spooled jobs, in submission order
+    ensure_spool(spool_dir)
+    job_ids = []
+    for position, job in enumerate(jobs):
+        job_id = '{0}_{1:04d}'.format(run_id, position)
+        spooled = dict(job, id=job_id, run=run_id, attempt=1, max_attempts=max_attempts, submitted_at=time.time())
+        write_json(spool_dir, os.path.join(spool_dir, PENDING, job_id + '.json'), spooled)
+        job_ids.append(job_id)
+    return job_ids
+
+
+def claim(spool_dir, worker):
+
+    # Oldest pending job first; returns (job, claimed path), or (None, None) when there is nothing to claim
+    pending_dir = os.path.join(spool_dir, PENDING)
+    for name in sorted(os.listdir(pending_dir)):
+        if not name.endswith('.json'):
+            continue
+        pending_path = os.path.join(pending_dir, name)
+        claimed_path = os.path.join(spool_dir, CLAIMED, '{0}@{1}.json'.format(name[:-len('.json')], worker))
+        try:
+            # Touched first, the rename keeps the mtime and an old one would look like a stale claim
+            os.utime(pending_path, None)
+            os.rename(pending_path, claimed_path)
+        except OSError:
+            # Claimed by another worker in between
+            continue
+        job = read_json(claimed_path)
+        if job is None:
+            continue
+        return job, claimed_path
+    return None, None
+
+
+def heartbeat(claimed_paths):
+
+    for claimed_path in claimed_paths:
+        try:
+            os.utime(claimed_path, None)
+        except OSError:
+            pass
+
+
+def finish(spool_dir, job, claimed_path, result, worker):
+
+    # Failed jobs go back to pending/ until they run out of attempts. Returns the state the job ended in
+    record = dict(job, returncode=result['returncode'], output=result['output'], elapsed=result['elapsed'],
+                  peak_rss=result.get('peak_rss'), worker=worker, host=socket.gethostname(), finished_at=time.time())
+
+    if result['returncode'] == 0:
+        state = DONE
+    elif job.get('attempt', 1) < job.get('max_attempts', MAX_ATTEMPTS):
+        state = PENDING
+        record = dict(job, attempt=job.get('attempt', 1) + 1, last_output=result['output'], last_worker=worker)
+    else:
+        state = FAILED
+
+    write_json(spool_dir, os.path.join(spool_dir, state, job['id'] + '.json'), record)
+    try:
+        os.remove(claimed_path)
+    except OSError:
+        # Requeued as stale meanwhile, the result written above still stands
+        pass
+    return state
+
+
+def requeue_stale(spool_dir, stale_after=STALE_AFTER):
+
+    # Claims without a heartbeat for stale_after seconds belong to a dead worker. Returns the requeued job ids
+    requeued = []
+    claimed_dir = os.path.join(spool_dir, CLAIMED)
+    now = time.time()
+    for name in os.listdir(claimed_dir):
+        claimed_path = os.path.join(claimed_dir, name)
+        try:
+            if now - os.path.getmtime(claimed_path) < stale_after:
+                continue
+            os.rename(claimed_path, os.path.join(spool_dir, PENDING, job_file_id(name) + '.json'))
+        except OSError:
+            continue
+        requeued.append(job_file_id(name))
+    return requeued
+
+
+def run_status(spool_dir, run_id):
+
+    # {job id: (state, worker or None)} for every job of a run still in the spool
+    status = {}
+    for state in STATES:
+        state_dir = os.path.join(spool_dir, state)
+        if not os.path.isdir(state_dir):
+            continue
+        for name in os.listdir(state_dir):
+            if name.startswith(run_id + '_') and name.endswith('.json'):
+                worker = name[:-len('.json')].split('@')[1] if '@' in name else None
+                # A job seen twice mid-rename keeps its most advanced state
+                if job_file_id(name) not in status or STATES.index(state) > STATES.index(status[job_file_id(name)][0]):
+                    status[job_file_id(name)] = (state, worker)
+    return status
+
+
+def run_results(spool_dir, job_ids):
+
+    # Same shape as render_pool.run_job results, for the finished jobs of a run
+    results = []
+    for job_id in job_ids:
+        for state in (DONE, FAILED):
+            record = read_json(os.path.join(spool_dir, state, job_id + '.json'))
+            if record is not None:
+                results.append({'job': record, 'returncode': record['returncode'], 'output': record['output'],
+                                'elapsed': record['elapsed'], 'peak_rss': record.get('peak_rss'), 'worker': record.get('worker')})
+    return results
+
+
+def cancel_pending(spool_dir, job_ids):
+
+    # Unclaimed jobs of a run are dropped, claimed ones finish on their workers. Returns how many were dropped
+    dropped = 0
+    for job_id in job_ids:
+        try:
+            os.remove(os.path.join(spool_dir, PENDING, job_id + '.json'))
+            dropped += 1
+        except OSError:
+            pass
+    return dropped
+
+
+def status_changes(previous, current):
+
+    # Log lines for the jobs whose state or worker changed between two run_status() calls
+    response = []
+    for job_id in sorted(current.keys()):
+        if previous.get(job_id) == current[job_id]:
+            continue
+        state, worker = current[job_id]
+        if state == CLAIMED:
+            response.append(['SPOOL job {0} claimed by {1}'.format(job_id, worker), 'fuchsia'])
+        elif state == DONE:
+            response.append(['SPOOL job {0} done'.format(job_id), 'fuchsia'])
+        elif state == FAILED:
+            response.append(['ERROR: SPOOL job {0} failed on every attempt'.format(job_id), 'red'])
+        elif previous.get(job_id):
+            response.append(['SPOOL job {0} back in the queue'.format(job_id), 'orange'])
+    return response
+
+
+def is_finished(status, job_ids):
+
+    return all(job_id in status and status[job_id][0] in (DONE, FAILED) for job_id in job_ids)
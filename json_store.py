@@ -0,0 +1,65 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: json_store.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: JSON files of entries shared by several sessions (render cache index, worker footprints, render costs).
+       Saving merges with what other sessions wrote since the file was loaded, then replaces the file at once.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import json
+import os
+
+
+def load_entries(path):
+
+    # {} when the file is missing or unreadable
+    try:
+        with open(path) as f:
+            return json.load(f).get('entries', {})
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+def merge_entries(entries, saved_entries, recency_key):
+
+    # Keeps the entries other sessions saved, the most recent one wins where both have a key. entries is updated and returned
+    for key, entry in saved_entries.items():
+        if key not in entries or entries[key].get(recency_key, 0) < entry.get(recency_key, 0):
+            entries[key] = entry
+    return entries
+
+
+def save_json_atomic(path, merge_fn):
+
+    # merge_fn(entries on disk) -> entries to save. Written to a temporary file renamed over the old one,
+    # so readers never see half a file
+    entries = merge_fn(load_entries(path))
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    temp_file = '{0}.{1}.tmp'.format(path, os.getpid())
+    with open(temp_file, 'w') as f:
+        json.dump({'entries': entries}, f)
+    try:
+        os.rename(temp_file, path)
+    except OSError:
+        # Windows can't rename over an existing file
+        os.remove(path)
+        os.rename(temp_file, path)
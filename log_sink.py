@@ -0,0 +1,114 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: log_sink.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Log sink that queues [message, color] lines and flushes them to the log widget in batches, keeping at most
+       a fixed number of lines in the widget and optionally the full log in a file.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+from PySide2 import QtCore, QtGui
+import datetime
+import io
+
+DEFAULT_MAX_LINES = 5000
+DEFAULT_FLUSH_INTERVAL = 100
+
+
+class LogSink(QtCore.QObject):
+
+    def __init__(self, text_edit, max_lines=DEFAULT_MAX_LINES, flush_interval=DEFAULT_FLUSH_INTERVAL, log_file=None):
+
+        QtCore.QObject.__init__(self, text_edit)
+
+        self.text_edit = text_edit
+        self.pending = []
+        self.log_file = None
+        self.log_file_path = None
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(flush_interval)
+        self.timer.timeout.connect(self.flush)
+
+        self.set_max_lines(max_lines)
+        self.set_log_file(log_file)
+
+
+    def set_max_lines(self, max_lines):
+
+        # The document drops its oldest blocks by itself once it goes over the limit
+        self.text_edit.document().setMaximumBlockCount(max_lines)
+
+
+    def set_log_file(self, log_file_path):
+
+        if self.log_file is not None:
+            self.flush()
+            self.log_file.close()
+            self.log_file = None
+
+        self.log_file_path = log_file_path or None
+        if self.log_file_path:
+            self.log_file = io.open(self.log_file_path, 'a', encoding='utf-8')
+
+
+    def append(self, message, color):
+
+        time = str(datetime.datetime.now().time())[:12]
+        self.pending.append((time, message, color))
+
+        if not self.timer.isActive():
+            self.timer.start()
+
+
+    def flush(self):
+
+        if not self.pending:
+            return
+
+        lines = self.pending
+        self.pending = []
+
+        cursor = QtGui.QTextCursor(self.text_edit.document())
+        cursor.movePosition(QtGui.QTextCursor.End)
+        cursor.beginEditBlock()
+        for time, message, color in lines:
+            if not self.text_edit.document().isEmpty():
+                cursor.insertBlock()
+            cursor.insertHtml("<font color = {0}>[{1}] {2}</font>".format(color, time, message))
+        cursor.endEditBlock()
+
+        scroll_bar = self.text_edit.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
+
+        if self.log_file is not None:
+            for time, message, color in lines:
+                self.log_file.write(u'[{0}] {1}\n'.format(time, message))
+            self.log_file.flush()
+
+
+    def clear(self):
+
+        self.pending = []
+        self.text_edit.clear()
+
+
+    def close(self):
+
+        self.timer.stop()
+        self.set_log_file(None)
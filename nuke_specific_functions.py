@@ -20,121 +20,1131 @@ __maintainer__ = 'Jaime Rivera'
 __email__ = 'jaime.rvq@gmail.com'
 __status__ = 'Testing'
 
+import contextlib
+import os
+import time
+
 import nuke
 
+import frame_files
+import job_spool
+import output_verification
+import pipeline_events
+import render_admission
+import render_cache
+import render_costs
+import render_pool
+import run_timing
+import scene_index
+import write_codecs
+
+RENDER_MODE_LOCAL = 'local'
+RENDER_MODE_POOL = 'pool'
+RENDER_MODE_SHARED = 'shared'
+RENDER_MODE_SPOOL = 'spool'
+
+# Applied and restored in this order, file_type goes before the codec knobs it brings
+WRITE_KNOBS = ('file', 'proxy') + write_codecs.CODEC_KNOBS
+INTEGER_KNOBS = ('filter', 'antialiasing', 'samples')
+NODE_CLASSES = {'scanlines': 'ScanlineRender',
+                'rays': 'RayRender',
+                'writes': 'Write',
+                'root': 'Root'}
+ROOT_NODE = 'root'
+PREVIEW_DIR_NAME = 'preview'
+
+DEFAULT_SETTINGS = {'render_mode': RENDER_MODE_LOCAL,
+                    'max_workers': render_pool.default_max_workers(),
+                    'nuke_executable': None,
+                    'chunk_mode': render_pool.CHUNK_MODE_CONTIGUOUS,
+                    'chunk_retries': 1,
+                    'resume': False,
+                    'verify': False,
+                    'checksum': False,
+                    'report_dir': None,
+                    'cache': False,
+                    'cache_file': None,
+                    'suspend_callbacks': False,
+                    'spool_dir': None,
+                    'preview': False,
+                    'preview_step': 5,
+                    'preview_samples': 1,
+                    'preview_antialiasing': 0,
+                    'preview_proxy_scale': 0.5,
+                    'preview_dir': None,
+                    'admission': True,
+                    'footprint_file': None,
+                    'memory_reserve_mb': render_admission.DEFAULT_RESERVE_MB,
+                    'longest_first': True,
+                    'cost_file': None}
+
+# Python callback registries emptied for the customized classes while knobs are applied, when asked to
+SUSPENDABLE_CALLBACKS = ('knobChangeds', 'updateUIs')
+
 def get_the_scene():
     scene = nuke.root().knob('name').value()
     return scene
 
-def customize_nodes(custom_dict, only_selected_writes):
+def get_setting(custom_dict, key):
+
+    settings = custom_dict.get('settings') or {}
+    value = settings.get(key)
+    if value is None:
+        value = DEFAULT_SETTINGS[key]
+    return value
+
+def parse_range(frame_range):
+
+    if '-' in frame_range:
+        frame_start = frame_range.split('-')[0]
+        frame_end = frame_range.split('-')[1]
+    else:
+        frame_start = frame_range
+        frame_end = frame_range
+
+    return int(frame_start), int(frame_end)
+
+def read_knob(node, category, attr):
+
+    if category == 'writes' and attr in WRITE_KNOBS:
+        return str(node[attr].value())
+    if attr in INTEGER_KNOBS:
+        return int(node[attr].getValue())
+    return node[attr].getValue()
+
+def write_attrs(node, write_dict):
+
+    # Knobs of a Write to snapshot, in WRITE_KNOBS order, among the ones it has now. When its file type is changed,
+    # the codec knobs of the current file type are kept too, so they can be restored with it
+    attrs = []
+    for attr in WRITE_KNOBS:
+        if attr in write_dict or (attr in write_codecs.CODEC_KNOBS and 'file_type' in write_dict):
+            if node.knob(attr) is not None:
+                attrs.append(attr)
+    return attrs
+
+def snapshot_nodes(custom_dict, index=None):
+
+    # Qt-free counterpart of SceneWriter.build_original_dictionary, for the nodes listed in custom_dict.
+    # Nodes that can't be found are reported and removed from custom_dict
+    if index is None:
+        index = scene_index.SceneIndex()
 
     response = []
-    response.append(['-- CUSTOMIZING NODES --', 'cyan'])
+    response.append(['-- SAVING ORIGINAL CONFIGURATION OF NODES --', 'cyan'])
+
+    original_dict = {'scanlines': None,
+                     'rays': None,
+                     'writes': None,
+                     'root': None}
+
+    for category in original_dict.keys():
+
+        if not custom_dict.get(category):
+            continue
+
+        category_dict = {}
+        for node_name in list(custom_dict[category].keys()):
+
+            node = index.node(node_name)
+            if node is None:
+                response.append(['ERROR: {0} node {1} not found, skipped'.format(NODE_CLASSES[category], node_name), 'red'])
+                del custom_dict[category][node_name]
+                continue
+
+            if category == 'writes':
+                attrs = write_attrs(node, custom_dict[category][node_name])
+            else:
+                attrs = custom_dict[category][node_name].keys()
+
+            category_dict[node_name] = {}
+            for attr in attrs:
+                category_dict[node_name][attr] = read_knob(node, category, attr)
+
+            response.append(['{0} node {1}, {2}'.format(NODE_CLASSES[category], node_name, category_dict[node_name]), 'lime'])
+
+        original_dict[category] = category_dict
+
+    return original_dict, response
+
+def extend_snapshot(original_dict, custom_dict, index):
+
+    # Adds the original value of every custom knob the snapshot doesn't have yet (e.g. the ones added by preview mode)
+    for category in NODE_CLASSES.keys():
+
+        for node_name, attrs in (custom_dict.get(category) or {}).items():
+
+            node = index.node(node_name)
+            if node is None:
+                continue
+
+            if category == 'writes':
+                attrs = write_attrs(node, attrs)
+
+            for attr in attrs:
+                if attr not in ((original_dict.get(category) or {}).get(node_name) or {}):
+                    if not original_dict.get(category):
+                        original_dict[category] = {}
+                    original_dict[category].setdefault(node_name, {})[attr] = read_knob(node, category, attr)
+
+    return original_dict
+
+def preview_path(file_value, preview_dir=None):
+
+    # /renders/shot.####.exr -> /renders/preview/shot.####.exr, or <preview_dir>/shot.####.exr
+    directory, name = os.path.split(file_value)
+    return os.path.join(preview_dir or os.path.join(directory, PREVIEW_DIR_NAME), name).replace('\\', '/')
+
+def apply_preview(custom_dict):
+
+    # Turns custom_dict into a quick preview: lower samples and antialiasing, proxy on, every Nth frame,
+    # rendered next to the real output in a preview folder. The knobs changed are restored like any other
+    response = []
+    if not get_setting(custom_dict, 'preview'):
+        return response
+
+    samples = get_setting(custom_dict, 'preview_samples')
+    antialiasing = get_setting(custom_dict, 'preview_antialiasing')
+    step = max(1, int(get_setting(custom_dict, 'preview_step')))
+
+    for scanline_dict in (custom_dict.get('scanlines') or {}).values():
+        scanline_dict['samples'] = min(samples, scanline_dict.get('samples', samples))
+        scanline_dict['antialiasing'] = antialiasing
+
+    for ray_dict in (custom_dict.get('rays') or {}).values():
+        ray_dict['samples'] = min(samples, ray_dict.get('samples', samples))
+
+    for write_name, write_dict in (custom_dict.get('writes') or {}).items():
+        write_dict['file'] = preview_path(write_dict['file'], get_setting(custom_dict, 'preview_dir'))
+        write_dict['proxy'] = write_dict['file']
+        write_dict['step'] = write_dict.get('step', 1) * step
+
+        # Nuke doesn't create missing output directories
+        preview_dir = os.path.dirname(write_dict['file'])
+        if preview_dir and not os.path.isdir(preview_dir):
+            try:
+                os.makedirs(preview_dir)
+            except OSError as e:
+                response.append(['ERROR: Could not create the preview directory {0} of Write node {1}: {2}'.format(preview_dir, write_name, e), 'red'])
+
+    custom_dict['root'] = {ROOT_NODE: {'proxy': True,
+                                       'proxy_scale': get_setting(custom_dict, 'preview_proxy_scale')}}
+
+    response.append(['PREVIEW: every {0} frame(s), {1} sample(s), antialiasing {2}, proxy at {3}, Writes to their preview folder'
+                     ''.format(step, samples, antialiasing, get_setting(custom_dict, 'preview_proxy_scale')), 'orange'])
+    return response
+
+def values_differ(old_value, new_value):
+
+    if isinstance(old_value, (int, float)) and isinstance(new_value, (int, float)):
+        return abs(old_value - new_value) > 1e-6
+    return old_value != new_value
+
+def build_delta(original_dict, custom_dict, only_selected_writes):
+
+    # Knobs whose custom value differs from the original one, as {category: {node: {attr: (original, custom)}}}
+    delta = {'scanlines': {}, 'rays': {}, 'writes': {}, 'root': {}}
+
+    for category in delta.keys():
+
+        custom_nodes = custom_dict.get(category) or {}
+        original_nodes = original_dict.get(category) or {}
+
+        for node in custom_nodes.keys():
+
+            if category == 'writes':
+                if (not custom_nodes[node]['selected']) and (only_selected_writes):
+                    continue
+                attrs = [attr for attr in WRITE_KNOBS if attr in custom_nodes[node]]
+            else:
+                attrs = custom_nodes[node].keys()
+
+            for attr in attrs:
+                new_value = custom_nodes[node][attr]
+                old_value = original_nodes.get(node, {}).get(attr)
+                if old_value is None or values_differ(old_value, new_value):
+                    delta[category].setdefault(node, {})[attr] = (old_value, new_value)
+
+            # A new file type drops the codec knobs of the old one, they are restored even if they were not customized
+            if category == 'writes' and 'file_type' in delta[category].get(node, {}):
+                for attr in write_codecs.CODEC_KNOBS:
+                    if attr in original_nodes.get(node, {}) and attr not in delta[category][node]:
+                        delta[category][node][attr] = (original_nodes[node][attr], None)
+
+    return delta
+
+def in_delta(delta, category, node, attr):
+
+    if delta is None:
+        return True
+    return attr in delta[category].get(node, {})
+
+@contextlib.contextmanager
+def undo_group(label):
+
+    # Every knob set inside the block is a single entry of the undo stack
+    undo = nuke.Undo()
+    undo.begin(label)
+    try:
+        yield
+    finally:
+        undo.end()
+
+
+@contextlib.contextmanager
+def suspended_callbacks(node_classes, enabled=True):
+
+    # Takes out the knobChanged/updateUI callbacks registered for these classes and for every class ('*'),
+    # puts them back when the block ends, even if it raises. Yields the number of callbacks taken out
+    saved = []
+    if enabled:
+        for registry_name in SUSPENDABLE_CALLBACKS:
+            registry = getattr(nuke, registry_name, None)
+            if registry is None:
+                continue
+            for node_class in ['*'] + sorted(node_classes):
+                if registry.get(node_class):
+                    saved.append((registry, node_class, registry.pop(node_class)))
+
+    try:
+        yield sum(len(callbacks) for registry, node_class, callbacks in saved)
+    finally:
+        for registry, node_class, callbacks in saved:
+            registry[node_class] = callbacks + registry.get(node_class, [])
+
+
+def iter_apply_knobs(operations, label, suspend_callbacks=False, stage=None):
+
+    # operations is a (node_name, node, attr, value, message, old) list, applied as one batch in a single undo group.
+    # message is logged once the knob is set. A knob that can't be set is reported and the batch goes on,
+    # so one bad node never blocks the others
+    if not operations:
+        return
+
+    node_classes = set(operation[1].Class() for operation in operations if operation[1] is not None)
+
+    with undo_group(label):
+        with suspended_callbacks(node_classes, suspend_callbacks) as suspended:
+            if suspended:
+                yield pipeline_events.event(stage, 'Suspended {0} callback(s) while applying {1} knob(s)'.format(suspended, len(operations)), 'orange')
+
+            for node_name, node, attr, value, message, old in operations:
+                if node is None:
+                    yield pipeline_events.event(stage, 'ERROR: Node {0} not found, attribute {1} not set to {2}'.format(node_name, attr, value), 'red',
+                                                node_name, attr, new=value)
+                    continue
+                try:
+                    node[attr].setValue(value)
+                except Exception as e:
+                    yield pipeline_events.event(stage, 'ERROR: Could not set node {0} attribute {1} to {2}: {3}'.format(node_name, attr, value, e), 'red',
+                                                node_name, attr, new=value)
+                    continue
+                yield pipeline_events.event(stage, message, 'lime', node_name, attr, old, value)
+
+
+def apply_knobs(operations, label, suspend_callbacks=False):
+
+    return pipeline_events.to_response(iter_apply_knobs(operations, label, suspend_callbacks))
+
+
+def delta_values(delta, category, node, attr):
+
+    # (original, custom) values of a knob, (None, None) without a delta
+    if delta is None:
+        return None, None
+    return delta[category].get(node, {}).get(attr, (None, None))
+
+
+def iter_customize_nodes(custom_dict, only_selected_writes, index=None, delta=None):
+
+    # Every knob is queued, then set in one batch; each one is logged once it is really set, or its error
+    if index is None:
+        index = scene_index.SceneIndex()
+
+    # Whether the script on disk is the scene as it is now, setting the custom knobs marks it as modified
+    custom_dict['scene_modified'] = nuke.root().modified()
+
+    stage = 'customize'
+    yield pipeline_events.event(stage, '-- CUSTOMIZING NODES --', 'cyan')
+    skipped = 0
+    operations = []
 
     if custom_dict['scanlines']:
         for target_scanline_node in custom_dict['scanlines'].keys():
 
-            node = nuke.toNode(target_scanline_node)
+            node = index.node(target_scanline_node)
 
             for attr in custom_dict['scanlines'][target_scanline_node]:
+                if not in_delta(delta, 'scanlines', target_scanline_node, attr):
+                    skipped += 1
+                    continue
                 attr_value = custom_dict['scanlines'][target_scanline_node][attr]
-                node[attr].setValue(attr_value)
-                response.append(['ScanlineRender {0}, Attribute {1} set to {2}'.format(target_scanline_node, attr, attr_value), 'lime'])
+                operations.append((target_scanline_node, node, attr, attr_value,
+                                   'ScanlineRender {0}, Attribute {1} set to {2}'.format(target_scanline_node, attr, attr_value),
+                                   delta_values(delta, 'scanlines', target_scanline_node, attr)[0]))
     else:
-        response.append(['INFO: No ScanlineRender nodes in the list, skipping customization step', 'orange'])
+        yield pipeline_events.event(stage, 'INFO: No ScanlineRender nodes in the list, skipping customization step', 'orange')
 
 
     if custom_dict['rays']:
         for target_ray_node in custom_dict['rays'].keys():
 
-            node = nuke.toNode(target_ray_node)
+            node = index.node(target_ray_node)
 
             for attr in custom_dict['rays'][target_ray_node]:
+                if not in_delta(delta, 'rays', target_ray_node, attr):
+                    skipped += 1
+                    continue
                 attr_value = custom_dict['rays'][target_ray_node][attr]
-                node[attr].setValue(attr_value)
-                response.append(['RayRender {0}, Attribute {1} set to {2}'.format(target_ray_node, attr, attr_value), 'lime'])
+                operations.append((target_ray_node, node, attr, attr_value,
+                                   'RayRender {0}, Attribute {1} set to {2}'.format(target_ray_node, attr, attr_value),
+                                   delta_values(delta, 'rays', target_ray_node, attr)[0]))
     else:
-        response.append(['INFO: No RayRender nodes in the list, skipping customization step', 'orange'])
+        yield pipeline_events.event(stage, 'INFO: No RayRender nodes in the list, skipping customization step', 'orange')
 
 
     if custom_dict['writes']:
         for target_write_node in custom_dict['writes'].keys():
 
-            node = nuke.toNode(target_write_node)
+            node = index.node(target_write_node)
 
             selected = custom_dict['writes'][target_write_node]['selected']
 
             if (not selected) and (only_selected_writes):
-                response.append(['Write node {0} was not selected, will not be customized/rendered'.format(target_write_node), 'orange'])
+                yield pipeline_events.event(stage, 'Write node {0} was not selected, will not be customized/rendered'.format(target_write_node), 'orange',
+                                            target_write_node)
             else:
-                file_value = custom_dict['writes'][target_write_node]['file']
-                node['file'].setValue(file_value)
-                response.append(["Write node {0}, Attribute 'file' set to {1}".format(target_write_node, file_value), 'lime'])
+                for attr in WRITE_KNOBS:
+                    if attr not in custom_dict['writes'][target_write_node]:
+                        continue
+                    if not in_delta(delta, 'writes', target_write_node, attr):
+                        skipped += 1
+                        continue
+                    attr_value = custom_dict['writes'][target_write_node][attr]
+                    operations.append((target_write_node, node, attr, attr_value,
+                                       "Write node {0}, Attribute '{1}' set to {2}".format(target_write_node, attr, attr_value),
+                                       delta_values(delta, 'writes', target_write_node, attr)[0]))
     else:
-        response.append(['INFO: No Write nodes in the list, skipping customization step', 'orange'])
+        yield pipeline_events.event(stage, 'INFO: No Write nodes in the list, skipping customization step', 'orange')
 
+    # Project settings, only changed by preview mode
+    for attr, attr_value in (custom_dict.get('root') or {}).get(ROOT_NODE, {}).items():
+        if not in_delta(delta, 'root', ROOT_NODE, attr):
+            skipped += 1
+            continue
+        operations.append((ROOT_NODE, index.node(ROOT_NODE), attr, attr_value,
+                           'Root, Attribute {0} set to {1}'.format(attr, attr_value),
+                           delta_values(delta, 'root', ROOT_NODE, attr)[0]))
 
-    return response
+    # Every knob is set in one batch, once all of them are known
+    for item in iter_apply_knobs(operations, 'Scene writer: customize', get_setting(custom_dict, 'suspend_callbacks'), stage):
+        yield item
+
+    if skipped:
+        yield pipeline_events.event(stage, 'INFO: Skipped {0} knob(s) already at their custom value'.format(skipped), 'orange')
+
+
+def customize_nodes(custom_dict, only_selected_writes, index=None, delta=None):
+
+    return pipeline_events.to_response(iter_customize_nodes(custom_dict, only_selected_writes, index, delta))
 
 
-def write_custom(custom_dict, only_selected_writes):
+def plan_writes(custom_dict, only_selected_writes, index=None, cache=None):
+
+    # (write, frame_start, frame_end, frame_step) ranges to render, once selection, resume and the render cache are applied
+    if index is None:
+        index = scene_index.SceneIndex()
 
     response = []
-    response.append(['-- WRITING --', 'cyan'])
+    plan = []
+    resume = get_setting(custom_dict, 'resume')
+    listings = {}
+    frames_skipped = 0
+    frames_planned = 0
 
-    if custom_dict['writes']:
-        for target_write_node in custom_dict['writes'].keys():
+    for target_write_node in custom_dict['writes'].keys():
 
-            node = nuke.toNode(target_write_node)
+        write_dict = custom_dict['writes'][target_write_node]
 
-            frame_start = 0
-            frame_end = 1
-            frame_range = custom_dict['writes'][target_write_node]['range']
-            if '-' in frame_range:
-                frame_start = frame_range.split('-')[0]
-                frame_end = frame_range.split('-')[1]
-            else:
-                frame_start = frame_range
-                frame_end = frame_range
+        if (not write_dict['selected']) and (only_selected_writes):
+            response.append(['Write node {0} was not selected, will not be rendered'.format(target_write_node), 'orange'])
+            continue
 
-            selected = custom_dict['writes'][target_write_node]['selected']
+        frame_start, frame_end = parse_range(write_dict['range'])
+        frame_step = write_dict.get('step', 1)
 
-            if (not selected) and (only_selected_writes):
-                response.append(['Write node {0} was not selected, will not be rendered'.format(target_write_node), 'orange'])
+        if not resume and cache is None:
+            plan.append((target_write_node, frame_start, frame_end, frame_step))
+            continue
+
+        frames = list(range(frame_start, frame_end + 1, frame_step))
+        missing = frames
+
+        if resume:
+            missing = frame_files.frames_to_render(write_dict['file'], frames, listings)
+            frames_skipped += len(frames) - len(missing)
+            frames_planned += len(missing)
+            if missing:
+                response.append(['RESUME Write node {0}: {1} frame(s) already on disk, rendering {2} frame(s) in {3}'
+                                 ''.format(target_write_node, len(frames) - len(missing), len(missing),
+                                           ', '.join('{0}-{1}'.format(*r) for r in frame_files.contiguous_ranges(missing, frame_step))), 'lime'])
             else:
-                response.append(["STARTED Writing node {0}, for frame range {1}-{2}".format(target_write_node, frame_start, frame_end), 'fuchsia'])
-                nuke.execute(target_write_node, frame_start, frame_end)
-                response.append(["FINISHED Writing node {0}, for frame range {1}-{2}".format(target_write_node, frame_start, frame_end), 'fuchsia'])
+                response.append(['RESUME Write node {0}: all {1} frame(s) already on disk, skipped'.format(target_write_node, len(frames)), 'orange'])
+
+        if cache is not None:
+            uncached = cache.frames_to_render(target_write_node, index.node(target_write_node), write_dict['file'], missing)
+            if len(uncached) < len(missing):
+                response.append(['CACHE Write node {0}: {1} frame(s) unchanged since their last render, rendering {2} frame(s)'
+                                 ''.format(target_write_node, len(missing) - len(uncached), len(uncached)), 'lime'])
+            missing = uncached
+
+        for range_start, range_end in frame_files.contiguous_ranges(missing, frame_step):
+            plan.append((target_write_node, range_start, range_end, frame_step))
+
+    if resume:
+        response.append(['RESUME: {0} frame(s) skipped, {1} frame(s) to render'.format(frames_skipped, frames_planned), 'cyan'])
+    if cache is not None:
+        response.append(['CACHE: {0} frame(s) skipped, {1} frame(s) to render'.format(cache.hits, cache.misses), 'cyan'])
+
+    if get_setting(custom_dict, 'longest_first') and plan:
+        plan, order_response = order_by_cost(custom_dict, plan, index)
+        response.extend(order_response)
+
+    return plan, response
+
+
+def order_by_cost(custom_dict, plan, index):
+
+    # Most expensive Writes first, so a long one doesn't start last and hold the whole run; the ranges of a Write keep their order
+    history = render_costs.CostHistory(get_setting(custom_dict, 'cost_file'))
+    script = get_the_scene()
+
+    frame_counts = {}
+    for target_write_node, frame_start, frame_end, frame_step in plan:
+        frame_counts[target_write_node] = frame_counts.get(target_write_node, 0) + len(range(frame_start, frame_end + 1, frame_step))
+
+    for target_write_node in unique_writes(plan):
+        node = index.node(target_write_node)
+        if node is not None:
+            # Kept with the Write, the durations of this run are charged to these units once it is over
+            custom_dict['writes'][target_write_node]['estimate'] = history.estimate(script, target_write_node, node,
+                                                                                    frame_counts[target_write_node])
+
+    def write_cost(target_write_node):
+        return (custom_dict['writes'][target_write_node].get('estimate') or {}).get('seconds', 0)
+
+    order = sorted(unique_writes(plan), key=write_cost, reverse=True)
+    plan = sorted(plan, key=lambda item: order.index(item[0]))
+
+    labels = []
+    for target_write_node in order:
+        estimate = custom_dict['writes'][target_write_node].get('estimate')
+        labels.append('{0} ({1})'.format(target_write_node, render_costs.estimate_label(estimate) if estimate else '?'))
+    return plan, [['ORDER, longest first: {0}'.format(', '.join(labels)), 'cyan']]
+
+
+def record_costs(custom_dict, timer):
+
+    # Measured seconds per unit of the Writes estimated for this run; shared passes are skipped, every Write is charged the whole pass
+    history = render_costs.CostHistory(get_setting(custom_dict, 'cost_file'))
+    script = get_the_scene()
+    for row in timer.write_rows():
+        write_dict = (custom_dict.get('writes') or {}).get(row['write']) or {}
+        if write_dict.get('estimate') and row['mode'] != RENDER_MODE_SHARED:
+            history.record(script, row['write'], write_dict['estimate']['units'], row['frames'], row['elapsed'])
+
+    if not history.recorded:
+        return []
+    try:
+        history.save()
+    except (IOError, OSError) as e:
+        return [['WARNING: Could not save the render costs to {0}: {1}'.format(history.cost_file, e), 'orange']]
+    return [['Render times of {0} Write node(s) saved to {1}'.format(history.recorded, history.cost_file), 'grey']]
+
+
+def open_render_cache(custom_dict):
+
+    # None when the render cache is off
+    if not get_setting(custom_dict, 'cache'):
+        return None
+    return render_cache.RenderCache(get_setting(custom_dict, 'cache_file'))
+
+
+def record_cache(cache, write_name, frames=None):
+
+    # Frames of write_name rendered in this run go into the cache
+    if cache is None:
+        return []
+    recorded = cache.commit(write_name, frames)
+    if not recorded:
+        return []
+    return [['CACHE Write node {0}: {1} rendered frame(s) recorded'.format(write_name, recorded), 'lime']]
+
+
+def save_cache(cache):
+
+    if cache is None:
+        return []
+    try:
+        cache.save()
+    except (IOError, OSError) as e:
+        return [['ERROR: Could not save the render cache index {0}: {1}'.format(cache.index_file, e), 'red']]
+    return [['Render cache index saved to {0}, {1} entries'.format(cache.index_file, len(cache.entries)), 'cyan']]
+
+
+def unique_writes(plan):
+
+    write_names = []
+    for item in plan:
+        if item[0] not in write_names:
+            write_names.append(item[0])
+    return write_names
+
+
+def verify_outputs(custom_dict, write_names):
+
+    response = []
+    if not get_setting(custom_dict, 'verify'):
+        return response
+
+    for target_write_node in write_names:
+
+        write_dict = custom_dict['writes'][target_write_node]
+        frame_start, frame_end = parse_range(write_dict['range'])
+        frames = list(range(frame_start, frame_end + 1, write_dict.get('step', 1)))
+
+        result = output_verification.verify_write(target_write_node, write_dict['file'], frames,
+                                                  get_setting(custom_dict, 'checksum'), get_setting(custom_dict, 'max_workers'))
+        try:
+            manifest = output_verification.write_manifest(result)
+        except (IOError, OSError) as e:
+            manifest = None
+            response.append(['ERROR: Could not save the manifest of Write node {0}: {1}'.format(target_write_node, e), 'red'])
+
+        response.extend(output_verification.verification_response(result, manifest))
+
+    return response
 
+
+def direct_call(function, *args):
+
+    return function(*args)
+
+
+def is_cancelled(cancelled):
+
+    return cancelled is not None and cancelled()
+
+
+def iter_write_custom(custom_dict, only_selected_writes, index=None, timer=None, main_thread=None, cancelled=None, progress=None):
+
+    # Events of the write step as it goes, whatever the render mode. The hooks let a background thread drive it:
+    #   main_thread(function, *args) runs every call that touches the scene, directly by default
+    #   cancelled() is looked at between frames, shared passes and worker jobs, and while polling the spool
+    #   progress(write, frame, done, total) follows local renders, called with done=0 when a range starts
+    # With cancelled or progress, local renders go frame by frame instead of one nuke.execute per range
+    if index is None:
+        index = scene_index.SceneIndex()
+    if timer is None:
+        timer = run_timing.RunTimer()
+    if main_thread is None:
+        main_thread = direct_call
+
+    render_mode = get_setting(custom_dict, 'render_mode')
+    if render_mode == RENDER_MODE_POOL:
+        events = iter_write_pool(custom_dict, only_selected_writes, index, timer, main_thread, cancelled)
+    elif render_mode == RENDER_MODE_SHARED:
+        events = iter_write_shared(custom_dict, only_selected_writes, index, timer, main_thread, cancelled)
+    elif render_mode == RENDER_MODE_SPOOL:
+        events = iter_write_spool(custom_dict, only_selected_writes, index, timer, main_thread, cancelled)
     else:
-        response.append(['ERROR: No valid Write nodes to write', 'red'])
+        events = iter_write_local(custom_dict, only_selected_writes, index, timer, main_thread, cancelled, progress)
+
+    for item in events:
+        yield item
+
+
+def write_custom(custom_dict, only_selected_writes, index=None, timer=None):
+
+    return pipeline_events.to_response(iter_write_custom(custom_dict, only_selected_writes, index, timer))
+
+
+def iter_finish_write(custom_dict, cache, write_name, frames, stage):
+
+    # Verification and the cache only read files, any thread can run them
+    for item in pipeline_events.from_response(stage, verify_outputs(custom_dict, [write_name])):
+        yield item
+    for item in pipeline_events.from_response(stage, record_cache(cache, write_name, frames)):
+        yield item
+
+
+def iter_write_local(custom_dict, only_selected_writes, index, timer, main_thread=direct_call, cancelled=None, progress=None):
+
+    stage = 'write'
+    yield pipeline_events.event(stage, '-- WRITING --', 'cyan')
+
+    if not custom_dict['writes']:
+        yield pipeline_events.event(stage, 'ERROR: No valid Write nodes to write', 'red')
+        return
+
+    cache = open_render_cache(custom_dict)
+    plan, plan_response = main_thread(plan_writes, custom_dict, only_selected_writes, index, cache)
+    for item in pipeline_events.from_response(stage, plan_response):
+        yield item
+
+    per_frame = cancelled is not None or progress is not None
+    rendered_frames = []
+    pending_write = None
+
+    for position, (target_write_node, frame_start, frame_end, frame_step) in enumerate(plan):
+
+        if is_cancelled(cancelled):
+            yield pipeline_events.event(stage, 'CANCELLED: Write node {0} will not be rendered for frame range {1}-{2}'
+                                               ''.format(target_write_node, frame_start, frame_end), 'orange', target_write_node)
+            continue
+
+        frames = range(frame_start, frame_end + 1, frame_step)
+        node = main_thread(index.node, target_write_node)
+
+        yield pipeline_events.event(stage, "STARTED Writing node {0}, for frame range {1}-{2}".format(target_write_node, frame_start, frame_end), 'fuchsia',
+                                    target_write_node)
+        if progress is not None:
+            progress(target_write_node, frame_start, 0, len(frames))
+
+        start_time = time.time()
+        frame_times = []
+        if per_frame:
+            for frame in frames:
+                if is_cancelled(cancelled):
+                    break
+                frame_start_time = time.time()
+                main_thread(nuke.execute, node, frame, frame, 1)
+                frame_times.append(time.time() - frame_start_time)
+                if progress is not None:
+                    progress(target_write_node, frame, len(frame_times), len(frames))
+            done = len(frame_times)
+        else:
+            main_thread(nuke.execute, node, frame_start, frame_end, frame_step)
+            done = len(frames)
+        elapsed = time.time() - start_time
+
+        timer.add_write(target_write_node, done, elapsed, frame_times, mode=RENDER_MODE_LOCAL)
+        rendered_frames.extend(frames[:done])
+        pending_write = target_write_node
+
+        if done == len(frames):
+            yield pipeline_events.event(stage, "FINISHED Writing node {0}, for frame range {1}-{2} in {3:.3f}s".format(target_write_node, frame_start, frame_end, elapsed), 'fuchsia',
+                                        target_write_node)
+        else:
+            yield pipeline_events.event(stage, 'STOPPED Writing node {0} after {1} of the {2} frame(s) of range {3}-{4}'
+                                               ''.format(target_write_node, done, len(frames), frame_start, frame_end), 'orange', target_write_node)
+
+        # Each Write is verified and cached once its last range is done
+        if position == len(plan) - 1 or plan[position + 1][0] != target_write_node:
+            for item in iter_finish_write(custom_dict, cache, target_write_node, rendered_frames, stage):
+                yield item
+            rendered_frames = []
+            pending_write = None
+
+    # A cancel skips the end of a Write split in several ranges, the frames it already has are still verified and cached
+    if pending_write is not None:
+        for item in iter_finish_write(custom_dict, cache, pending_write, rendered_frames, stage):
+            yield item
+
+    for item in pipeline_events.from_response(stage, save_cache(cache)):
+        yield item
+
+
+def write_nodes(index, write_names):
+
+    return [index.node(write_name) for write_name in write_names]
+
+
+def iter_write_shared(custom_dict, only_selected_writes, index, timer, main_thread=direct_call, cancelled=None):
+
+    stage = 'write'
+    yield pipeline_events.event(stage, '-- WRITING (SHARED PASS) --', 'cyan')
+
+    if not custom_dict['writes']:
+        yield pipeline_events.event(stage, 'ERROR: No valid Write nodes to write', 'red')
+        return
+
+    cache = open_render_cache(custom_dict)
+    plan, plan_response = main_thread(plan_writes, custom_dict, only_selected_writes, index, cache)
+    for item in pipeline_events.from_response(stage, plan_response):
+        yield item
+
+    # Writes with the same range are executed together, so their shared upstream tree is cooked once per frame
+    groups = {}
+    for target_write_node, frame_start, frame_end, frame_step in plan:
+        groups.setdefault((frame_start, frame_end, frame_step), []).append(target_write_node)
+
+    rendered_frames = {}
+    for frame_start, frame_end, frame_step in sorted(groups.keys()):
+
+        write_names = groups[(frame_start, frame_end, frame_step)]
+        if is_cancelled(cancelled):
+            yield pipeline_events.event(stage, 'CANCELLED: Write nodes {0} will not be rendered for frame range {1}-{2}'
+                                               ''.format(', '.join(write_names), frame_start, frame_end), 'orange')
+            continue
+
+        nodes = main_thread(write_nodes, index, write_names)
+
+        yield pipeline_events.event(stage, "STARTED Writing nodes {0} in one pass, for frame range {1}-{2}".format(', '.join(write_names), frame_start, frame_end), 'fuchsia')
+        start_time = time.time()
+        main_thread(nuke.executeMultiple, nodes, ((frame_start, frame_end, frame_step),))
+        elapsed = time.time() - start_time
+        yield pipeline_events.event(stage, "FINISHED Writing nodes {0} in one pass, for frame range {1}-{2} in {3:.3f}s".format(', '.join(write_names), frame_start, frame_end, elapsed), 'fuchsia')
+
+        # Every Write of the pass is charged the whole pass
+        frames = range(frame_start, frame_end + 1, frame_step)
+        for write_name in write_names:
+            timer.add_write(write_name, len(frames), elapsed, mode=RENDER_MODE_SHARED)
+            rendered_frames.setdefault(write_name, set()).update(frames)
+
+    for target_write_node in unique_writes(plan):
+        if target_write_node in rendered_frames:
+            for item in iter_finish_write(custom_dict, cache, target_write_node, rendered_frames[target_write_node], stage):
+                yield item
+
+    for item in pipeline_events.from_response(stage, save_cache(cache)):
+        yield item
+
+
+def write_custom_shared(custom_dict, only_selected_writes, index, timer):
+
+    return pipeline_events.to_response(iter_write_shared(custom_dict, only_selected_writes, index, timer))
+
+
+def saved_script(custom_dict, response, renderer):
+
+    # Path of the script on disk, None (with an error in response) if it was never saved.
+    # Only edits made before customizing count as unsaved, workers apply the customization themselves
+    script = nuke.root().name()
+    if script in ('', 'Root'):
+        response.append(['ERROR: The scene has to be saved before rendering with {0}'.format(renderer), 'red'])
+        return None
+    modified = custom_dict.get('scene_modified')
+    if modified is None:
+        modified = nuke.root().modified()
+    if modified:
+        response.append(['WARNING: The scene has unsaved changes, workers will render the version saved on disk', 'orange'])
+    return script
+
+
+def chunk_jobs(custom_dict, plan, script):
+
+    # Worker jobs for the planned ranges, split into chunks; returns (jobs, {write: worker limit}, response)
+    response = []
+    chunk_mode = get_setting(custom_dict, 'chunk_mode')
+    jobs = []
+    write_limits = {}
+    for target_write_node, frame_start, frame_end, frame_step in plan:
+
+        write_dict = custom_dict['writes'][target_write_node]
+        chunks = render_pool.split_range(frame_start, frame_end, write_dict.get('chunk_size', 0),
+                                         write_dict.get('chunk_mode', chunk_mode), frame_step)
+        write_limits[target_write_node] = write_dict.get('workers')
+
+        for chunk_start, chunk_end, chunk_step in chunks:
+            jobs.append({'script': script,
+                         'write': target_write_node,
+                         'file': write_dict['file'],
+                         'first': chunk_start,
+                         'last': chunk_end,
+                         'step': chunk_step,
+                         'proxy': write_dict.get('proxy'),
+                         'codec': dict((attr, write_dict[attr]) for attr in write_codecs.CODEC_KNOBS if attr in write_dict),
+                         'scanlines': custom_dict['scanlines'],
+                         'rays': custom_dict['rays'],
+                         'root': custom_dict.get('root')})
+
+        if len(chunks) > 1:
+            response.append(['Write node {0} range {1}-{2} split into {3} {4} chunk(s), up to {5} worker(s)'
+                             ''.format(target_write_node, frame_start, frame_end, len(chunks), write_dict.get('chunk_mode', chunk_mode),
+                                       write_dict.get('workers') or 'any'), 'lime'])
+
+    return jobs, write_limits, response
+
+
+def chunk_results_response(custom_dict, plan, results, timer, cache, mode):
+
+    # Totals of a pool or spool run, once every job is over; the jobs themselves are reported as they end
+    response = []
+
+    # Worker time of the chunks that succeeded, each chunk gives its average time per frame
+    rendered_frames = {}
+    for result in results:
+        if result['returncode'] == 0:
+            job = result['job']
+            chunk_frames = range(job['first'], job['last'] + 1, job['step'])
+            rendered_frames.setdefault(job['write'], set()).update(chunk_frames)
+            timer.add_write(job['write'], len(chunk_frames), result['elapsed'], [result['elapsed'] / max(1, len(chunk_frames))], mode)
+
+    # A Write is done only when every one of its chunks has succeeded
+    failed = render_pool.failed_jobs(results)
+    for target_write_node in unique_writes(plan):
+        failed_chunks = [render_pool.job_label(job) for job in failed if job['write'] == target_write_node]
+        if failed_chunks:
+            response.append(['ERROR: Write node {0} is incomplete, failed chunk(s): {1}'.format(target_write_node, ', '.join(failed_chunks)), 'red'])
+        else:
+            response.append(['FINISHED Writing node {0} with the {1} workers'.format(target_write_node, mode), 'fuchsia'])
+
+    response.extend(verify_outputs(custom_dict, unique_writes(plan)))
+
+    # Only the frames of chunks that succeeded are cached
+    for target_write_node in unique_writes(plan):
+        response.extend(record_cache(cache, target_write_node, rendered_frames.get(target_write_node, set())))
+    response.extend(save_cache(cache))
 
     return response
 
 
-def return_to_normal(original_dict):
+def prepare_pool(custom_dict, only_selected_writes, index):
+
+    # Every step that reads the scene (planning, cache keys, cost order, jobs), for the main thread.
+    # Returns (batch, response), batch is None when there is nothing to hand to the workers
+    response = []
+    response.append(['-- WRITING (WORKER POOL) --', 'cyan'])
+
+    if not custom_dict['writes']:
+        response.append(['ERROR: No valid Write nodes to write', 'red'])
+        return None, response
+
+    script = saved_script(custom_dict, response, 'the worker pool')
+    if script is None:
+        return None, response
+
+    cache = open_render_cache(custom_dict)
+    plan, plan_response = plan_writes(custom_dict, only_selected_writes, index, cache)
+    response.extend(plan_response)
+
+    jobs, write_limits, jobs_response = chunk_jobs(custom_dict, plan, script)
+    response.extend(jobs_response)
+
+    return {'plan': plan, 'jobs': jobs, 'write_limits': write_limits, 'cache': cache}, response
+
+
+def iter_run_pool(custom_dict, batch, timer, cancelled=None):
+
+    # Runs the jobs of prepare_pool, every job is reported as soon as it ends. Doesn't touch the scene, any thread can run it
+    stage = 'write'
+    executable = get_setting(custom_dict, 'nuke_executable') or render_pool.default_nuke_executable()
+    max_workers = get_setting(custom_dict, 'max_workers')
+
+    for job in batch['jobs']:
+        yield pipeline_events.event(stage, 'QUEUED worker job {0}'.format(render_pool.job_label(job)), 'fuchsia', job['write'])
+    yield pipeline_events.event(stage, 'Running {0} job(s) on up to {1} worker(s) with {2}'.format(len(batch['jobs']), max_workers, executable), 'cyan')
+
+    admission = None
+    if get_setting(custom_dict, 'admission'):
+        admission = render_admission.AdmissionController(max_workers,
+                                                         render_admission.FootprintStore(get_setting(custom_dict, 'footprint_file')),
+                                                         get_setting(custom_dict, 'memory_reserve_mb'))
+
+    # Admission decisions are logged as they are taken, a job can wait for memory a long time after being queued
+    results = []
+    for result in render_pool.iter_jobs_with_retries(batch['jobs'], executable, max_workers, batch['write_limits'],
+                                                     get_setting(custom_dict, 'chunk_retries'), admission, cancelled,
+                                                     notices=True):
+        if 'notice' in result:
+            yield pipeline_events.event(stage, result['notice'][0], result['notice'][1], result['job']['write'])
+            continue
+        results.append(result)
+        for message, color in render_pool.results_to_response([result]):
+            yield pipeline_events.event(stage, message, color, result['job']['write'])
 
     response = []
-    response.append(['-- RESETING NODES BACK TO ORIGINAL VALUES --', 'cyan'])
+    if admission is not None:
+        response.extend(admission.summary_response())
+        response.extend(admission.save_footprints())
+    response.extend(chunk_results_response(custom_dict, batch['plan'], results, timer, batch['cache'], RENDER_MODE_POOL))
+    for item in pipeline_events.from_response(stage, response):
+        yield item
+
+
+def iter_write_pool(custom_dict, only_selected_writes, index, timer, main_thread=direct_call, cancelled=None):
+
+    batch, response = main_thread(prepare_pool, custom_dict, only_selected_writes, index)
+    for item in pipeline_events.from_response('write', response):
+        yield item
+    if batch is None:
+        return
+
+    for item in iter_run_pool(custom_dict, batch, timer, cancelled):
+        yield item
+
+
+def write_custom_pool(custom_dict, only_selected_writes, index, timer):
+
+    return pipeline_events.to_response(iter_write_pool(custom_dict, only_selected_writes, index, timer))
+
+
+def submit_to_spool(custom_dict, only_selected_writes, index):
+
+    # Spools the chunk jobs of the planned Writes; returns (submission, response), submission is None if nothing was spooled
+    response = []
+    response.append(['-- SUBMITTING TO THE JOB SPOOL --', 'cyan'])
+
+    spool_dir = get_setting(custom_dict, 'spool_dir')
+    if not spool_dir:
+        response.append(['ERROR: No spool directory set, jobs can\'t be submitted', 'red'])
+        return None, response
+
+    if not custom_dict['writes']:
+        response.append(['ERROR: No valid Write nodes to write', 'red'])
+        return None, response
+
+    script = saved_script(custom_dict, response, 'the job spool')
+    if script is None:
+        return None, response
+
+    cache = open_render_cache(custom_dict)
+    plan, plan_response = plan_writes(custom_dict, only_selected_writes, index, cache)
+    response.extend(plan_response)
+
+    jobs, write_limits, jobs_response = chunk_jobs(custom_dict, plan, script)
+    response.extend(jobs_response)
+
+    # Per-Write worker limits only apply to the local pool, spool workers take whatever is pending
+    run_id = job_spool.new_run_id()
+    try:
+        job_ids = job_spool.submit(spool_dir, jobs, run_id, get_setting(custom_dict, 'chunk_retries') + 1)
+    except (IOError, OSError) as e:
+        response.append(['ERROR: Could not submit to the spool {0}: {1}'.format(spool_dir, e), 'red'])
+        return None, response
+
+    for job_id, job in zip(job_ids, jobs):
+        response.append(['SPOOLED job {0}: {1}'.format(job_id, render_pool.job_label(job)), 'fuchsia'])
+    response.append(['Submitted {0} job(s) to {1} as run {2}, start spool_worker.py on the render hosts to drain it'
+                     ''.format(len(job_ids), spool_dir, run_id), 'cyan'])
+
+    submission = {'spool_dir': spool_dir, 'run_id': run_id, 'job_ids': job_ids, 'plan': plan, 'cache': cache, 'status': {}}
+    return submission, response
+
+
+def poll_spool(submission):
+
+    # One look at the spool: logs the jobs that changed, returns (response, finished)
+    status = job_spool.run_status(submission['spool_dir'], submission['run_id'])
+    response = job_spool.status_changes(submission['status'], status)
+    submission['status'] = status
+
+    finished = job_spool.is_finished(status, submission['job_ids'])
+    if not finished:
+        counts = dict((state, 0) for state in job_spool.STATES)
+        for state, worker in status.values():
+            counts[state] += 1
+        workers = set(worker for state, worker in status.values() if worker)
+        submission['progress'] = '{0}/{1} job(s) done, {2} rendering on {3} worker(s), {4} pending, {5} failed' \
+                                 ''.format(counts[job_spool.DONE], len(submission['job_ids']), counts[job_spool.CLAIMED],
+                                           len(workers), counts[job_spool.PENDING], counts[job_spool.FAILED])
+    return response, finished
+
+
+def finish_spool(custom_dict, submission, timer):
+
+    results = job_spool.run_results(submission['spool_dir'], submission['job_ids'])
+    response = render_pool.results_to_response(results)
+    response.extend(chunk_results_response(custom_dict, submission['plan'], results, timer, submission['cache'], RENDER_MODE_SPOOL))
+    return response
+
+
+def iter_write_spool(custom_dict, only_selected_writes, index, timer, main_thread=direct_call, cancelled=None):
+
+    # Submits, then follows the spool until its workers finish the run; a cancel drops the jobs no worker has claimed yet
+    stage = 'write'
+    submission, response = main_thread(submit_to_spool, custom_dict, only_selected_writes, index)
+    for item in pipeline_events.from_response(stage, response):
+        yield item
+    if submission is None:
+        return
+
+    progress = None
+    while True:
+        poll_response, finished = poll_spool(submission)
+        for item in pipeline_events.from_response(stage, poll_response):
+            yield item
+        if finished:
+            break
+
+        if submission['progress'] != progress:
+            progress = submission['progress']
+            yield pipeline_events.event(stage, 'SPOOL run {0}: {1}'.format(submission['run_id'], progress), 'cyan')
+
+        if is_cancelled(cancelled):
+            dropped = job_spool.cancel_pending(submission['spool_dir'], submission['job_ids'])
+            yield pipeline_events.event(stage, 'CANCELLED: {0} pending job(s) removed from the spool, claimed jobs finish on their workers'
+                                               ''.format(dropped), 'orange')
+            break
+
+        time.sleep(job_spool.POLL_INTERVAL)
+
+    for item in pipeline_events.from_response(stage, finish_spool(custom_dict, submission, timer)):
+        yield item
+
+
+def write_custom_spool(custom_dict, only_selected_writes, index, timer):
+
+    return pipeline_events.to_response(iter_write_spool(custom_dict, only_selected_writes, index, timer))
+
+
+def timing_report(custom_dict, timer):
+
+    # Summary table for the log, then the JSON/CSV export
+    response = timer.summary_response()
+    response.extend(record_costs(custom_dict, timer))
+    report_dir = get_setting(custom_dict, 'report_dir') or run_timing.default_report_dir(get_the_scene())
+    response.extend(timer.export_response(report_dir))
+    return response
+
+
+def iter_return_to_normal(original_dict, index=None, delta=None, suspend_callbacks=False):
+
+    if index is None:
+        index = scene_index.SceneIndex()
+
+    stage = 'restore'
+    yield pipeline_events.event(stage, '-- RESETING NODES BACK TO ORIGINAL VALUES --', 'cyan')
+    skipped = 0
+    operations = []
 
     for category in original_dict.keys():
 
         if original_dict[category]:
             for node in original_dict[category].keys():
 
-                n = nuke.toNode(node)
+                n = index.node(node)
+
+                attributes = list(original_dict[category][node].keys())
+                if category == 'writes':
+                    attributes = [attr for attr in WRITE_KNOBS if attr in attributes]
+
+                for attribute in attributes:
 
-                for attribute in original_dict[category][node].keys():
+                    if not in_delta(delta, category, node, attribute):
+                        skipped += 1
+                        continue
 
                     attr_value = original_dict[category][node][attribute]
-                    n[attribute].setValue(attr_value)
-                    response.append(["Restored node {0} attribute {1} back to {2}".format(node,attribute, attr_value), 'lime'])
+                    operations.append((node, n, attribute, attr_value,
+                                       "Restored node {0} attribute {1} back to {2}".format(node, attribute, attr_value),
+                                       delta_values(delta, category, node, attribute)[1]))
         else:
             if category == 'scanlines':
-                response.append(["INFO: No ScanlineRender nodes were previously customized, skipping step", 'orange'])
+                yield pipeline_events.event(stage, "INFO: No ScanlineRender nodes were previously customized, skipping step", 'orange')
             if category == 'rays':
-                response.append(["INFO: No RayRender nodes were previously customized, skipping step", 'orange'])
+                yield pipeline_events.event(stage, "INFO: No RayRender nodes were previously customized, skipping step", 'orange')
             if category == 'writes':
-                response.append(["INFO: No Write nodes were previously customized, skipping step", 'orange'])
+                yield pipeline_events.event(stage, "INFO: No Write nodes were previously customized, skipping step", 'orange')
+
+    for item in iter_apply_knobs(operations, 'Scene writer: restore', suspend_callbacks, stage):
+        yield item
+
+    if skipped:
+        yield pipeline_events.event(stage, 'INFO: Skipped {0} knob(s) that were never changed'.format(skipped), 'orange')
+
+
+def return_to_normal(original_dict, index=None, delta=None, suspend_callbacks=False):
 
-    return response
\ No newline at end of file
+    return pipeline_events.to_response(iter_return_to_normal(original_dict, index, delta, suspend_callbacks))
@@ -0,0 +1,131 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: output_verification.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Post-render verification of a Write's output: checks every expected frame is on disk with a plausible size,
+       optionally hashes the frames on a thread pool, and writes a JSON manifest next to the output.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import datetime
+import hashlib
+import json
+import os
+from multiprocessing.pool import ThreadPool
+
+import frame_files
+
+CHECKSUM_ALGORITHM = 'sha1'
+CHECKSUM_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+def checksum_file(path):
+
+    digest = hashlib.new(CHECKSUM_ALGORITHM)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHECKSUM_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def checksum_files(paths, workers):
+
+    # Hashing is I/O bound and hashlib releases the GIL, so threads hash large sequences concurrently
+    if not paths:
+        return {}
+
+    pool = ThreadPool(max(1, min(int(workers), len(paths))))
+    try:
+        checksums = pool.map(checksum_file, paths)
+    finally:
+        pool.close()
+        pool.join()
+
+    return dict(zip(paths, checksums))
+
+
+def manifest_path(pattern):
+
+    # /renders/shot.####.exr -> /renders/shot.manifest.json
+    directory, name = os.path.split(pattern)
+    match = frame_files.HASH_PADDING.search(name) or frame_files.PRINTF_PADDING.search(name)
+    if match:
+        name = name[:match.start()]
+    name = name.rstrip('._') or os.path.splitext(os.path.basename(pattern))[0]
+    return os.path.join(directory, name + '.manifest.json')
+
+
+def verify_write(write_name, pattern, frames, checksum=False, workers=1):
+
+    sizes = frame_files.frame_sizes(pattern, frames)
+    minimum_size = frame_files.minimum_frame_size(sizes)
+
+    result = {'write': write_name,
+              'pattern': pattern,
+              'verified_at': datetime.datetime.now().isoformat(),
+              'minimum_size': minimum_size,
+              'frames': {},
+              'missing': [],
+              'truncated': []}
+
+    for frame in frames:
+        path = frame_files.frame_path(pattern, frame)
+        result['frames'][str(frame)] = {'path': path, 'size': sizes[frame]}
+        if sizes[frame] is None:
+            result['missing'].append(frame)
+        elif sizes[frame] < minimum_size:
+            result['truncated'].append(frame)
+
+    if checksum:
+        paths = [entry['path'] for entry in result['frames'].values() if entry['size'] is not None]
+        checksums = checksum_files(paths, workers)
+        for entry in result['frames'].values():
+            entry[CHECKSUM_ALGORITHM] = checksums.get(entry['path'])
+
+    return result
+
+
+def write_manifest(result):
+
+    path = manifest_path(result['pattern'])
+    with open(path, 'w') as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+    return path
+
+
+def verification_response(result, manifest=None):
+
+    response = []
+    frame_count = len(result['frames'])
+    bad_frames = len(result['missing']) + len(result['truncated'])
+
+    if bad_frames == 0:
+        response.append(['VERIFIED Write node {0}: all {1} frame(s) on disk'.format(result['write'], frame_count), 'lime'])
+    else:
+        if result['missing']:
+            response.append(['ERROR: Write node {0} is missing {1} frame(s): {2}'
+                             ''.format(result['write'], len(result['missing']),
+                                       ', '.join('{0}-{1}'.format(*r) for r in frame_files.contiguous_ranges(result['missing']))), 'red'])
+        if result['truncated']:
+            response.append(['ERROR: Write node {0} has {1} truncated frame(s) under {2} bytes: {3}'
+                             ''.format(result['write'], len(result['truncated']), result['minimum_size'],
+                                       ', '.join(str(frame) for frame in result['truncated'])), 'red'])
+
+    if manifest:
+        response.append(['Manifest for Write node {0} saved to {1}'.format(result['write'], manifest), 'cyan'])
+
+    return response
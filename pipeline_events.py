@@ -0,0 +1,103 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: pipeline_events.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Events streamed by the pipeline steps as they go, instead of [message, color] lists returned at the end.
+       Every event is a dictionary with its stage, node, knob, old and new values, level, color, message and
+       timestamp. The widget log, the headless runner and a JSONL file sink all consume the same stream.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import io
+import json
+import os
+import threading
+import time
+
+INFO = 'info'
+WARNING = 'warning'
+ERROR = 'error'
+
+# Log colors of the [message, color] responses, and the level each one stands for
+LEVELS = {'red': ERROR, 'orange': WARNING}
+
+
+def event(stage, message, color, node=None, knob=None, old=None, new=None):
+
+    return {'time': time.time(),
+            'stage': stage,
+            'level': LEVELS.get(color, INFO),
+            'color': color,
+            'message': message,
+            'node': node,
+            'knob': knob,
+            'old': old,
+            'new': new}
+
+
+def from_response(stage, response):
+
+    # Events of a step that still returns a [message, color] list
+    for message, color in response:
+        yield event(stage, message, color)
+
+
+def to_response(events):
+
+    # Back to the [message, color] list, for the callers of the list-returning functions
+    return [[item['message'], item['color']] for item in events]
+
+
+def tee(*sinks):
+
+    # One callable feeding every event to all the sinks, in order
+    def emit(item):
+        for sink in sinks:
+            sink(item)
+    return emit
+
+
+class JsonlSink(object):
+
+    def __init__(self, path):
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.file = io.open(path, 'a', encoding='utf-8')
+        self.lock = threading.Lock()
+
+
+    def __call__(self, item):
+
+        # Knob values that JSON can't hold are written as text
+        line = json.dumps(item, default=str, sort_keys=True)
+        with self.lock:
+            if self.file is None:
+                return
+            self.file.write(u'{0}\n'.format(line))
+            self.file.flush()
+
+
+    def close(self):
+
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
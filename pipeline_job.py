@@ -0,0 +1,148 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: pipeline_job.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Background customize -> write -> restore job. Runs in its own QThread, sends every Nuke call to the main
+       thread one frame at a time so the UI stays responsive, and reports its progress through Qt signals.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+from PySide2 import QtCore
+import nuke
+
+import nuke_specific_functions
+import pipeline_events
+
+
+def in_main_thread(function, *args):
+
+    if QtCore.QThread.currentThread() == QtCore.QCoreApplication.instance().thread():
+        return function(*args)
+    return nuke.executeInMainThreadWithResult(function, args=args)
+
+
+class PipelineJob(QtCore.QObject):
+
+    stage_changed = QtCore.Signal(str)
+    write_started = QtCore.Signal(str, int)
+    frame_progress = QtCore.Signal(str, int, int, int)
+    log = QtCore.Signal(str, str)
+    finished = QtCore.Signal(bool)
+
+    def __init__(self, original_dict, custom_dict, only_selected_writes, index, delta, timer, sinks=None):
+
+        QtCore.QObject.__init__(self)
+
+        self.original_dict = original_dict
+        self.custom_dict = custom_dict
+        self.only_selected_writes = only_selected_writes
+        self.index = index
+        self.delta = delta
+        self.timer = timer
+        self.cancelled = False
+
+        # Every event is handed to these callables too, e.g. a pipeline_events.JsonlSink
+        self.sinks = sinks or []
+        self.stage = None
+
+
+    def cancel(self):
+
+        # Read by the job thread between frames, shared passes and worker jobs
+        self.cancelled = True
+
+
+    def is_cancelled(self):
+
+        return self.cancelled
+
+
+    def write_progress(self, write_name, frame, done, total):
+
+        if done == 0:
+            self.write_started.emit(write_name, total)
+        else:
+            self.frame_progress.emit(write_name, frame, done, total)
+
+
+    def set_stage(self, stage):
+
+        self.stage = stage
+        self.stage_changed.emit(stage)
+
+
+    def emit_event(self, event):
+
+        for sink in self.sinks:
+            sink(event)
+        self.log.emit(event['message'], event['color'])
+
+
+    def emit_events(self, events):
+
+        # Each event reaches the log as soon as it is yielded, from the main thread (customize, restore) or this one (write)
+        for event in events:
+            self.emit_event(event)
+
+
+    def emit_message(self, message, color):
+
+        self.emit_event(pipeline_events.event(self.stage, message, color))
+
+
+    def emit_logs(self, logs):
+
+        self.emit_events(pipeline_events.from_response(self.stage, logs))
+
+
+    def run(self):
+
+        try:
+            # CUSTOMIZING NODES
+            self.set_stage('customize')
+            with self.timer.stage('customize'):
+                in_main_thread(self.emit_events, nuke_specific_functions.iter_customize_nodes(self.custom_dict, self.only_selected_writes,
+                                                                                              self.index, self.delta))
+
+            # WRITING, THE SAME STREAM AS THE HEADLESS RUNNER: THIS THREAD DRIVES IT, THE SCENE IS ONLY TOUCHED IN THE MAIN THREAD
+            self.set_stage('write')
+            with self.timer.stage('write'):
+                self.emit_events(nuke_specific_functions.iter_write_custom(self.custom_dict, self.only_selected_writes, self.index, self.timer,
+                                                                           in_main_thread, self.is_cancelled, self.write_progress))
+
+        except Exception as e:
+            self.emit_message('ERROR: {0}'.format(e), 'red')
+
+        finally:
+            # RESETING NODES, ALSO AFTER A CANCEL OR AN ERROR
+            self.set_stage('restore')
+            try:
+                with self.timer.stage('restore'):
+                    in_main_thread(self.emit_events,
+                                   nuke_specific_functions.iter_return_to_normal(self.original_dict, self.index, self.delta,
+                                                                                 nuke_specific_functions.get_setting(self.custom_dict, 'suspend_callbacks')))
+            except Exception as e:
+                self.emit_message('ERROR: Could not restore the original values: {0}'.format(e), 'red')
+
+            # The widget waits for finished to free the job, whatever happens to the report
+            self.stage = 'report'
+            try:
+                self.emit_logs(in_main_thread(nuke_specific_functions.timing_report, self.custom_dict, self.timer))
+            except Exception as e:
+                self.emit_message('ERROR: Could not build the timing report: {0}'.format(e), 'red')
+            finally:
+                self.finished.emit(self.cancelled)
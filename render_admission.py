@@ -0,0 +1,318 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: render_admission.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Admission control for the worker pool. A job only starts when the memory it is expected to use fits in what
+       is free and there are cores left for its threads; otherwise it waits for a running job to finish. Every
+       worker gets a thread count and a cache size (nuke -m / -c), and the peak RSS measured for each job is kept
+       in a JSON file, so later runs plan with measured footprints instead of the default guess.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import multiprocessing
+import os
+import threading
+import time
+
+import json_store
+
+DEFAULT_FOOTPRINT_FILE = os.path.join(os.path.expanduser('~'), '.scene_writer', 'render_footprints.json')
+DEFAULT_JOB_MEMORY_MB = 2048
+DEFAULT_RESERVE_MB = 1024
+KEPT_PEAKS = 5
+
+# Share of a job's memory given to Nuke's own cache, the rest is left for the graph itself
+CACHE_FRACTION = 0.5
+MIN_CACHE_MB = 256
+
+# Seconds between two looks at the free memory while a job waits, memory freed by other processes doesn't wake it up
+RECHECK_INTERVAL = 2
+
+
+def cpu_count():
+
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+
+def available_memory_mb():
+
+    # Memory that can be used without swapping, None when it can't be read on this platform
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except (IOError, OSError, ValueError):
+        pass
+
+    if os.name == 'nt':
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [('dwLength', ctypes.c_ulong),
+                        ('dwMemoryLoad', ctypes.c_ulong),
+                        ('ullTotalPhys', ctypes.c_ulonglong),
+                        ('ullAvailPhys', ctypes.c_ulonglong),
+                        ('ullTotalPageFile', ctypes.c_ulonglong),
+                        ('ullAvailPageFile', ctypes.c_ulonglong),
+                        ('ullTotalVirtual', ctypes.c_ulonglong),
+                        ('ullAvailVirtual', ctypes.c_ulonglong),
+                        ('ullAvailExtendedVirtual', ctypes.c_ulonglong)]
+
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return int(status.ullAvailPhys // (1024 * 1024))
+        return None
+
+    try:
+        return int(os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // (1024 * 1024))
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def process_rss_mb(pid):
+
+    # Resident memory of a running process, None when it can't be read on this platform
+    try:
+        with open('/proc/{0}/status'.format(pid)) as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) // 1024
+    except (IOError, OSError, ValueError):
+        pass
+    return None
+
+
+def busy_cores():
+
+    # Cores already taken by other processes, from the 1 minute load average where there is one
+    try:
+        return min(cpu_count(), int(round(os.getloadavg()[0])))
+    except (AttributeError, OSError):
+        return 0
+
+
+def footprint_key(job):
+
+    return '{0}|{1}'.format(os.path.normcase(os.path.abspath(job['script'])), job['write'])
+
+
+class FootprintStore(object):
+
+    def __init__(self, footprint_file=None, default_mb=DEFAULT_JOB_MEMORY_MB):
+
+        self.footprint_file = footprint_file or DEFAULT_FOOTPRINT_FILE
+        self.default_mb = default_mb
+        self.entries = self.load()
+        self.lock = threading.Lock()
+        self.recorded = 0
+
+
+    def load(self):
+
+        return json_store.load_entries(self.footprint_file)
+
+
+    def estimate(self, job):
+
+        # Highest of the last measured peaks of this Write, the default for a Write never measured. Returns (MB, measured)
+        entry = self.entries.get(footprint_key(job))
+        if not entry or not entry['peaks']:
+            return self.default_mb, False
+        return max(entry['peaks']), True
+
+
+    def record(self, job, peak_mb):
+
+        if not peak_mb:
+            return
+        with self.lock:
+            entry = self.entries.setdefault(footprint_key(job), {'peaks': []})
+            entry['peaks'] = (entry['peaks'] + [int(peak_mb)])[-KEPT_PEAKS:]
+            entry['updated'] = time.time()
+            self.recorded += 1
+
+
+    def save(self):
+
+        # Writes measured by other sessions since load() are kept, the most recently measured entry wins
+        json_store.save_json_atomic(self.footprint_file,
+                                    lambda saved_entries: json_store.merge_entries(self.entries, saved_entries, 'updated'))
+
+
+class AdmissionController(object):
+
+    def __init__(self, max_workers, footprints=None, reserve_mb=DEFAULT_RESERVE_MB):
+
+        self.footprints = footprints or FootprintStore()
+        self.reserve_mb = reserve_mb
+        self.max_workers = max(1, int(max_workers))
+        self.cores = cpu_count()
+
+        # Cores in use before the run are measured once, later load averages already include our own workers.
+        # Free memory is read again at every admission
+        self.core_budget = max(1, self.cores - busy_cores())
+        self.start_free_mb = available_memory_mb()
+
+        # Jobs announced by expect() and not admitted yet, only these many can run next to the running ones
+        self.expected = 0
+        self.running = {}
+        self.pids = {}
+        self.waiting = []
+        self.condition = threading.Condition()
+        self.admitted = 0
+        self.queued = 0
+        self.alone = 0
+
+
+    def memory_budget(self):
+
+        # Memory the running jobs and the next one can share: free now, plus what our own workers already hold
+        free_mb = available_memory_mb()
+        if free_mb is None:
+            return None
+        held_mb = 0
+        for label, pid in self.pids.items():
+            # Where it can't be read, the worker is taken as holding nothing: the budget is only smaller
+            held_mb += min(process_rss_mb(pid) or 0, self.running[label][0])
+        return max(0, free_mb + held_mb - self.reserve_mb)
+
+
+    def expect(self, job_count):
+
+        # Jobs about to be admitted (negative for the ones dropped before admission), so a single job gets every idle core
+        with self.condition:
+            self.expected = max(0, self.expected + job_count)
+
+
+    def job_threads(self):
+
+        # Idle cores shared among the jobs that will really run at once, counting the one being admitted
+        committed_threads = sum(threads for memory, threads in self.running.values())
+        free_slots = max(1, min(self.max_workers - len(self.running), self.expected))
+        return max(1, (self.core_budget - committed_threads) // free_slots)
+
+
+    def limits(self, job, threads):
+
+        # (threads, cache MB) handed to the worker
+        memory_mb = self.footprints.estimate(job)[0]
+        return threads, max(MIN_CACHE_MB, int(memory_mb * CACHE_FRACTION))
+
+
+    def fits(self, memory_mb, memory_budget):
+
+        if not self.running:
+            # Alone it has to run, even if it is bigger than the whole budget
+            return True
+        committed_memory = sum(memory for memory, threads in self.running.values())
+        committed_threads = sum(threads for memory, threads in self.running.values())
+        if memory_budget is not None and committed_memory + memory_mb > memory_budget:
+            return False
+        return committed_threads < self.core_budget
+
+
+    @staticmethod
+    def report(notify, message, color):
+
+        if notify is not None:
+            notify([message, color])
+
+
+    def admit(self, job, label, notify=None):
+
+        # Blocks until the job fits next to the running ones; returns its (threads, cache MB).
+        # notify: called with every decision ([message, color]) as it is taken, the job may wait a long time after one
+        memory_mb, measured = self.footprints.estimate(job)
+        source = 'measured' if measured else 'default'
+        waited = False
+        ticket = object()
+        with self.condition:
+            # First come first served, small jobs arriving later can't starve a big one at the head of the queue
+            self.waiting.append(ticket)
+            while True:
+                memory_budget = self.memory_budget()
+                if self.waiting[0] is ticket and self.fits(memory_mb, memory_budget):
+                    break
+                if not waited:
+                    waited = True
+                    self.queued += 1
+                    self.report(notify, 'QUEUED worker job {0}: needs ~{1} MB ({2}), {3} MB and {4} core(s) in use by {5} running job(s), {6} MB budget'
+                                        ''.format(label, memory_mb, source,
+                                                  sum(memory for memory, threads in self.running.values()),
+                                                  sum(threads for memory, threads in self.running.values()),
+                                                  len(self.running),
+                                                  'unknown' if memory_budget is None else memory_budget), 'orange')
+                self.condition.wait(RECHECK_INTERVAL)
+
+            if memory_budget is not None and memory_mb > memory_budget:
+                self.alone += 1
+                self.report(notify, 'WARNING: Worker job {0} needs ~{1} MB, more than the {2} MB free, started alone'
+                                    ''.format(label, memory_mb, memory_budget), 'orange')
+
+            self.waiting.pop(0)
+            self.condition.notify_all()
+            threads, cache_mb = self.limits(job, self.job_threads())
+            self.expected = max(0, self.expected - 1)
+            self.running[label] = (memory_mb, threads)
+            self.admitted += 1
+            self.report(notify, 'ADMITTED worker job {0}: ~{1} MB ({2}), {3} thread(s), {4} MB cache'
+                                ''.format(label, memory_mb, source, threads, cache_mb), 'lime')
+        return threads, cache_mb
+
+
+    def started(self, label, pid):
+
+        # The worker process of an admitted job, its resident memory counts as available to the jobs that follow
+        with self.condition:
+            if label in self.running:
+                self.pids[label] = pid
+
+
+    def release(self, job, label, peak_mb):
+
+        self.footprints.record(job, peak_mb)
+        with self.condition:
+            self.running.pop(label, None)
+            self.pids.pop(label, None)
+            self.condition.notify_all()
+
+
+    def summary_response(self):
+
+        response = []
+        free = 'unknown' if self.start_free_mb is None else '{0} MB'.format(self.start_free_mb)
+        response.append(['Admission control: {0} free at the start, {1} MB kept for the system, {2} of {3} core(s) for up to {4} worker(s)'
+                         ''.format(free, self.reserve_mb, self.core_budget, self.cores, self.max_workers), 'cyan'])
+        response.append(['{0} worker job(s) admitted, {1} waited for memory or cores, {2} started alone over the memory budget'
+                         ''.format(self.admitted, self.queued, self.alone), 'orange' if self.queued or self.alone else 'cyan'])
+        return response
+
+
+    def save_footprints(self):
+
+        if not self.footprints.recorded:
+            return []
+        try:
+            self.footprints.save()
+        except (IOError, OSError) as e:
+            return [['WARNING: Could not save the render footprints to {0}: {1}'.format(self.footprints.footprint_file, e), 'orange']]
+        return [['Peak memory of {0} worker job(s) saved to {1}'.format(self.footprints.recorded, self.footprints.footprint_file), 'grey']]
@@ -0,0 +1,217 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: render_cache.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Render cache. Every frame of a Write gets a key hashed from its upstream node graph (classes, knob values,
+       input file modification times), its customized file path and the frame number. Frames whose key was
+       rendered before, with the output still on disk and untouched, can be skipped. Keys are kept in a JSON
+       index file, trimmed by age and number of entries.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import hashlib
+import os
+import time
+
+import frame_files
+import json_store
+
+DEFAULT_INDEX_FILE = os.path.join(os.path.expanduser('~'), '.scene_writer', 'render_cache.json')
+DEFAULT_MAX_ENTRIES = 200000
+DEFAULT_MAX_AGE_DAYS = 30
+
+# Knobs that only change how a node looks in the DAG, not what it renders
+IGNORED_KNOBS = ('name', 'xpos', 'ypos', 'selected', 'label', 'note_font', 'note_font_size', 'note_font_color',
+                 'tile_color', 'gl_color', 'hide_input', 'postage_stamp', 'postage_stamp_frame', 'icon',
+                 'indicators', 'help', 'onCreate', 'onDestroy', 'knobChanged', 'updateUI', 'autolabel', 'panel',
+                 'dope_sheet', 'bookmark', 'cached', 'disable_cache')
+
+# Classes whose 'file' knob is an output, not an input of the graph
+OUTPUT_CLASSES = ('Write', 'DeepWrite', 'WriteGeo')
+
+
+def knob_script(knob):
+
+    # toScript() keeps expressions and animation curves, value() is the fallback for simpler knobs
+    try:
+        return str(knob.toScript())
+    except AttributeError:
+        return str(knob.value())
+
+
+class GraphHasher(object):
+
+    def __init__(self):
+
+        # Shared upstream nodes are hashed once, whatever the number of Writes they feed
+        self.node_hashes = {}
+        self.node_inputs = {}
+
+
+    def node_hash(self, node):
+
+        # Keyed by full name, Nuke hands out a new Python object for the same node on every call
+        node_id = node.fullName()
+        if node_id in self.node_hashes:
+            return self.node_hashes[node_id]
+
+        # Set before recursing, so a cycle through expression links can't loop forever
+        self.node_hashes[node_id] = ''
+
+        digest = hashlib.sha1()
+        digest.update(node.Class().encode('utf-8'))
+
+        knobs = node.knobs()
+        for knob_name in sorted(knobs.keys()):
+            if knob_name in IGNORED_KNOBS:
+                continue
+            digest.update('{0}={1};'.format(knob_name, knob_script(knobs[knob_name])).encode('utf-8'))
+
+        input_files = []
+        if node.Class() not in OUTPUT_CLASSES and 'file' in knobs:
+            input_files.append(str(knobs['file'].value()))
+
+        for upstream in node.dependencies():
+            digest.update(self.node_hash(upstream).encode('utf-8'))
+            input_files.extend(self.node_inputs.get(upstream.fullName(), []))
+
+        self.node_hashes[node_id] = digest.hexdigest()
+        self.node_inputs[node_id] = sorted(set(input_files))
+        return self.node_hashes[node_id]
+
+
+    def input_files(self, node):
+
+        self.node_hash(node)
+        return self.node_inputs[node.fullName()]
+
+
+def input_stamp(patterns, frame):
+
+    # Modification times of the upstream files read for this frame, -1 for a missing one
+    stamps = []
+    for pattern in patterns:
+        try:
+            stamps.append('{0}:{1}'.format(pattern, os.path.getmtime(frame_files.frame_path(pattern, frame))))
+        except (IOError, OSError):
+            stamps.append('{0}:-1'.format(pattern))
+    return ';'.join(stamps)
+
+
+def frame_key(graph_hash, output_pattern, frame, stamp):
+
+    digest = hashlib.sha1()
+    digest.update('{0}|{1}|{2}|{3}'.format(graph_hash, output_pattern, frame, stamp).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def output_signature(path):
+
+    # (size, mtime) of a rendered frame, None if it is not on disk
+    try:
+        stat = os.stat(path)
+    except (IOError, OSError):
+        return None
+    return stat.st_size, stat.st_mtime
+
+
+class RenderCache(object):
+
+    def __init__(self, index_file=None, max_entries=DEFAULT_MAX_ENTRIES, max_age_days=DEFAULT_MAX_AGE_DAYS):
+
+        self.index_file = index_file or DEFAULT_INDEX_FILE
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 24 * 3600
+        self.entries = self.load()
+        self.hasher = GraphHasher()
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+
+
+    def load(self):
+
+        return json_store.load_entries(self.index_file)
+
+
+    def frame_keys(self, node, output_pattern, frames):
+
+        graph_hash = self.hasher.node_hash(node)
+        patterns = self.hasher.input_files(node)
+        return dict((frame, frame_key(graph_hash, output_pattern, frame, input_stamp(patterns, frame))) for frame in frames)
+
+
+    def frames_to_render(self, write_name, node, output_pattern, frames):
+
+        # Frames without a valid entry; their keys are kept until commit() once they are rendered
+        keys = self.frame_keys(node, output_pattern, frames)
+        now = time.time()
+        missing = []
+
+        for frame in frames:
+            entry = self.entries.get(keys[frame])
+            path = frame_files.frame_path(output_pattern, frame)
+            if entry and entry['path'] == path and output_signature(path) == (entry['size'], entry['mtime']):
+                entry['last_used'] = now
+                self.hits += 1
+            else:
+                missing.append(frame)
+                self.misses += 1
+
+        self.pending[write_name] = dict((frame, (keys[frame], frame_files.frame_path(output_pattern, frame))) for frame in missing)
+        return missing
+
+
+    def commit(self, write_name, frames=None):
+
+        # Records the pending frames of a Write rendered in this run (all of them by default), returns how many
+        now = time.time()
+        recorded = 0
+        for frame, (key, path) in self.pending.pop(write_name, {}).items():
+            if frames is not None and frame not in frames:
+                continue
+            signature = output_signature(path)
+            if signature is None or signature[0] == 0:
+                continue
+            self.entries[key] = {'path': path, 'size': signature[0], 'mtime': signature[1],
+                                 'created': now, 'last_used': now}
+            recorded += 1
+        return recorded
+
+
+    def evict(self):
+
+        # Entries unused for too long go first, then the least recently used ones over max_entries
+        cutoff = time.time() - self.max_age
+        for key in [key for key, entry in self.entries.items() if entry['last_used'] < cutoff]:
+            del self.entries[key]
+
+        if len(self.entries) > self.max_entries:
+            by_use = sorted(self.entries.keys(), key=lambda key: self.entries[key]['last_used'])
+            for key in by_use[:len(self.entries) - self.max_entries]:
+                del self.entries[key]
+
+
+    def save(self):
+
+        # Entries written by other sessions since load() are kept, the newest use of a key wins
+        def merge(saved_entries):
+            json_store.merge_entries(self.entries, saved_entries, 'last_used')
+            self.evict()
+            return self.entries
+
+        json_store.save_json_atomic(self.index_file, merge)
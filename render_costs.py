@@ -0,0 +1,153 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: render_costs.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Render cost estimates per Write, used to start the most expensive Writes first. The cost of a frame is counted
+       in units from the upstream graph: one per node, and samples x antialiasing weighted for ScanlineRender and
+       RayRender nodes. Durations measured on earlier runs turn units into seconds; Writes never measured use a
+       default rate. Rates are kept in a JSON file per script and Write.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import os
+import threading
+import time
+
+import json_store
+
+DEFAULT_COST_FILE = os.path.join(os.path.expanduser('~'), '.scene_writer', 'render_costs.json')
+DEFAULT_SECONDS_PER_UNIT = 0.01
+
+# A render node with one sample and no antialiasing weighs as much as this many plain nodes
+RENDER_CLASSES = ('ScanlineRender', 'RayRender')
+RENDER_WEIGHT = 20
+
+# Weight of the newest measurement against the rate already on file
+RATE_SMOOTHING = 0.5
+
+
+def history_key(script, write_name):
+
+    return '{0}|{1}'.format(os.path.normcase(os.path.abspath(script)), write_name)
+
+
+def node_units(node, overrides=None):
+
+    # overrides: {render node name: {'samples': ..., 'antialiasing': ...}} for values not applied to the scene yet
+    if node.Class() not in RENDER_CLASSES:
+        return 1
+
+    values = {}
+    for knob_name in ('samples', 'antialiasing'):
+        knob = node.knob(knob_name)
+        if knob is not None:
+            values[knob_name] = int(knob.getValue())
+    values.update((overrides or {}).get(node.fullName()) or {})
+
+    return RENDER_WEIGHT * max(1, values.get('samples', 1)) * (1 + values.get('antialiasing', 0))
+
+
+def graph_walk(node, overrides=None, memo=None):
+
+    # (units, names) of one frame: every node upstream of the Write, itself included, counted once.
+    # memo: {node name: (units, dependencies)} shared by the Writes of one pass, so every node is read from the scene once
+    if memo is None:
+        memo = {}
+    units = 0
+    visited = set()
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        name = current.fullName()
+        if name in visited:
+            continue
+        visited.add(name)
+        if name not in memo:
+            memo[name] = (node_units(current, overrides), current.dependencies())
+        units += memo[name][0]
+        pending.extend(memo[name][1])
+    return units, visited
+
+
+def graph_units(node, overrides=None, memo=None):
+
+    return graph_walk(node, overrides, memo)[0]
+
+
+def format_seconds(seconds):
+
+    if seconds < 60:
+        return '{0:.1f}s'.format(seconds)
+    if seconds < 3600:
+        return '{0}m {1:02d}s'.format(int(seconds // 60), int(seconds % 60))
+    return '{0}h {1:02d}m'.format(int(seconds // 3600), int(seconds % 3600 // 60))
+
+
+def estimate_label(estimate):
+
+    # Guesses from the default rate are marked with a tilde, measured estimates are not
+    return '{0}{1}'.format('' if estimate['measured'] else '~', format_seconds(estimate['seconds']))
+
+
+class CostHistory(object):
+
+    def __init__(self, cost_file=None):
+
+        self.cost_file = cost_file or DEFAULT_COST_FILE
+        self.entries = self.load()
+        self.lock = threading.Lock()
+        self.recorded = 0
+
+
+    def load(self):
+
+        return json_store.load_entries(self.cost_file)
+
+
+    def estimate(self, script, write_name, node, frame_count, overrides=None):
+
+        # {'units', 'seconds', 'measured'} for frame_count frames of a Write
+        return self.estimate_units(script, write_name, graph_units(node, overrides), frame_count)
+
+
+    def estimate_units(self, script, write_name, units, frame_count):
+
+        entry = self.entries.get(history_key(script, write_name))
+        rate = entry['seconds_per_unit'] if entry else DEFAULT_SECONDS_PER_UNIT
+        return {'units': units,
+                'seconds': units * rate * frame_count,
+                'measured': entry is not None}
+
+
+    def record(self, script, write_name, units, frames, elapsed):
+
+        if not units or not frames or elapsed <= 0:
+            return
+        rate = elapsed / float(frames) / units
+        with self.lock:
+            entry = self.entries.get(history_key(script, write_name))
+            if entry:
+                rate = RATE_SMOOTHING * rate + (1 - RATE_SMOOTHING) * entry['seconds_per_unit']
+            self.entries[history_key(script, write_name)] = {'seconds_per_unit': rate, 'updated': time.time()}
+            self.recorded += 1
+
+
+    def save(self):
+
+        # Writes measured by other sessions since load() are kept, the most recently measured entry wins
+        json_store.save_json_atomic(self.cost_file,
+                                    lambda saved_entries: json_store.merge_entries(self.entries, saved_entries, 'updated'))
@@ -0,0 +1,334 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: render_pool.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Runs render jobs on a pool of headless Nuke worker processes ("nuke -t render_worker.py job.json").
+       Does not import nuke, so it can be driven with any stand-in worker executable.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'render_worker.py')
+NUKE_EXECUTABLE_ENV = 'SCENE_WRITER_NUKE_EXECUTABLE'
+
+CHUNK_MODE_CONTIGUOUS = 'contiguous'
+CHUNK_MODE_INTERLEAVED = 'interleaved'
+
+
+def default_nuke_executable():
+
+    # Inside a Nuke session sys.executable is the Nuke binary itself
+    return os.environ.get(NUKE_EXECUTABLE_ENV) or sys.executable
+
+
+def default_max_workers():
+
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+
+def build_command(executable, job_file, limits=None):
+
+    # limits: (threads, cache MB) of the worker, as nuke -m / -c
+    if limits is None:
+        return [executable, '-t', WORKER_SCRIPT, job_file]
+    threads, cache_mb = limits
+    return [executable, '-m', str(threads), '-c', '{0}M'.format(cache_mb), '-t', WORKER_SCRIPT, job_file]
+
+
+def wait_process(process):
+
+    # Returns (return code, peak RSS in MB); the peak is only known where os.wait4 exists, None elsewhere
+    if not hasattr(os, 'wait4'):
+        return process.wait(), None
+
+    status, usage = os.wait4(process.pid, 0)[1:]
+    if os.WIFSIGNALED(status):
+        process.returncode = -os.WTERMSIG(status)
+    else:
+        process.returncode = os.WEXITSTATUS(status)
+
+    # ru_maxrss is in KB on Linux, in bytes on macOS
+    peak_rss = usage.ru_maxrss / 1024.0
+    if sys.platform == 'darwin':
+        peak_rss /= 1024.0
+    return process.returncode, int(peak_rss)
+
+
+def job_label(job):
+
+    step = job.get('step', 1)
+    if step > 1:
+        return '{0} [{1}-{2}x{3}]'.format(job['write'], job['first'], job['last'], step)
+    return '{0} [{1}-{2}]'.format(job['write'], job['first'], job['last'])
+
+
+def split_range(frame_start, frame_end, chunk_size, chunk_mode=CHUNK_MODE_CONTIGUOUS, frame_step=1):
+
+    # Returns (first, last, step) chunks covering every frame of the range exactly once
+    frames = list(range(frame_start, frame_end + 1, frame_step))
+    frame_count = len(frames)
+    if chunk_size <= 0 or chunk_size >= frame_count:
+        return [(frame_start, frames[-1], frame_step)]
+
+    chunk_count = (frame_count + chunk_size - 1) // chunk_size
+    chunks = []
+
+    if chunk_mode == CHUNK_MODE_INTERLEAVED:
+        for offset in range(chunk_count):
+            last_offset = offset + ((frame_count - 1 - offset) // chunk_count) * chunk_count
+            chunks.append((frames[offset], frames[last_offset], frame_step * chunk_count))
+    else:
+        for offset in range(0, frame_count, chunk_size):
+            chunks.append((frames[offset], frames[min(offset + chunk_size, frame_count) - 1], frame_step))
+
+    return chunks
+
+
+def run_job(job, executable, limits=None, started=None):
+
+    # started: called with the worker process as soon as it is launched
+
+    handle, job_file = tempfile.mkstemp(prefix='scene_writer_job_', suffix='.json')
+    with os.fdopen(handle, 'w') as f:
+        json.dump(job, f)
+
+    start_time = time.time()
+    peak_rss = None
+    try:
+        process = subprocess.Popen(build_command(executable, job_file, limits),
+                                   stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT,
+                                   universal_newlines=True)
+        if started is not None:
+            started(process)
+        # Read to the end before reaping, stderr goes to the same pipe so nothing else can fill up
+        output = process.stdout.read()
+        process.stdout.close()
+        returncode, peak_rss = wait_process(process)
+    except OSError as e:
+        output = 'Could not launch worker {0}: {1}'.format(executable, e)
+        returncode = -1
+    finally:
+        os.remove(job_file)
+
+    return {'job': job,
+            'returncode': returncode,
+            'output': output,
+            'elapsed': time.time() - start_time,
+            'peak_rss': peak_rss}
+
+
+def cancelled_result(job):
+
+    # Result of a job never started because the run was cancelled
+    return {'job': job,
+            'returncode': None,
+            'output': '',
+            'elapsed': 0.0,
+            'peak_rss': None,
+            'cancelled': True}
+
+
+def interleave_by_write(jobs):
+
+    # Round-robin over the Writes so per-Write limits don't leave pool threads waiting on one Write
+    queues = {}
+    order = []
+    for job in jobs:
+        if job['write'] not in queues:
+            queues[job['write']] = []
+            order.append(job['write'])
+        queues[job['write']].append(job)
+
+    interleaved = []
+    while order:
+        for write in list(order):
+            interleaved.append(queues[write].pop(0))
+            if not queues[write]:
+                order.remove(write)
+
+    return interleaved
+
+
+def iter_jobs(jobs, executable, max_workers, write_limits=None, admission=None, cancelled=None, notices=False):
+
+    # Results in the order the jobs end. cancelled: callable looked at before every job is started,
+    # queued jobs are dropped once it returns True. With notices, the admission decisions are yielded as they
+    # are taken too, as {'notice': [message, color], 'job': job}
+    if not jobs:
+        return
+
+    semaphores = {}
+    for write, limit in (write_limits or {}).items():
+        if limit:
+            semaphores[write] = threading.Semaphore(int(limit))
+
+    # Results and notices of every pool thread, in the order they come
+    outbox = queue.Queue()
+
+    def run_admitted(job):
+        # Admitted only once past its Write limit, a job waiting on its Write doesn't hold memory or cores
+        if cancelled is not None and cancelled():
+            if admission is not None:
+                admission.expect(-1)
+            return cancelled_result(job)
+        if admission is None:
+            return run_job(job, executable)
+        label = job_label(job)
+        notify = (lambda entry: outbox.put({'notice': entry, 'job': job})) if notices else None
+        limits = admission.admit(job, label, notify)
+        result = None
+        try:
+            # Admission can take a while, the run may have been cancelled in between
+            if cancelled is not None and cancelled():
+                result = cancelled_result(job)
+                return result
+            result = run_job(job, executable, limits, lambda process: admission.started(label, process.pid))
+        finally:
+            admission.release(job, label, result and result['peak_rss'])
+        return result
+
+    def run_limited(job):
+        try:
+            semaphore = semaphores.get(job['write'])
+            if semaphore is None:
+                outbox.put(run_admitted(job))
+            else:
+                with semaphore:
+                    outbox.put(run_admitted(job))
+        except Exception as e:
+            # Raised again where the results are read
+            outbox.put({'error': e, 'job': job})
+
+    if admission is not None:
+        admission.expect(len(jobs))
+
+    pool = ThreadPool(max(1, min(int(max_workers), len(jobs))))
+    try:
+        for job in interleave_by_write(jobs):
+            pool.apply_async(run_limited, (job,))
+        pending = len(jobs)
+        while pending:
+            item = outbox.get()
+            if 'error' in item:
+                raise item['error']
+            if 'notice' not in item:
+                pending -= 1
+            yield item
+    finally:
+        pool.close()
+        pool.join()
+
+
+def run_jobs(jobs, executable, max_workers, write_limits=None, admission=None, cancelled=None):
+
+    return list(iter_jobs(jobs, executable, max_workers, write_limits, admission, cancelled))
+
+
+def iter_jobs_with_retries(jobs, executable, max_workers, write_limits=None, retries=0, admission=None, cancelled=None,
+                           notices=False):
+
+    # Only the failed jobs are sent again, once the previous attempt is over; every attempt is yielded. Cancelled jobs are not retried
+    failed = jobs
+    attempt = 0
+    while failed:
+        retry_failed = []
+        for result in iter_jobs(failed, executable, max_workers, write_limits, admission, cancelled, notices):
+            if 'notice' in result:
+                yield result
+                continue
+            if attempt:
+                result['attempt'] = attempt
+            if result['returncode'] != 0 and not result.get('cancelled'):
+                retry_failed.append(result['job'])
+            yield result
+
+        if attempt >= retries:
+            break
+        attempt += 1
+        failed = retry_failed
+
+
+def run_jobs_with_retries(jobs, executable, max_workers, write_limits=None, retries=0, admission=None, cancelled=None):
+
+    return list(iter_jobs_with_retries(jobs, executable, max_workers, write_limits, retries, admission, cancelled))
+
+
+def failed_jobs(results):
+
+    # A job counts as failed only if its last attempt failed
+    last_status = {}
+    for result in results:
+        last_status[job_label(result['job'])] = result
+    return [result['job'] for result in last_status.values() if result['returncode'] != 0]
+
+
+def parse_worker_output(output):
+
+    # Workers print their responses as JSON [message, color] lines, anything else is raw Nuke output
+    response = []
+    for line in output.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            entry = None
+        if isinstance(entry, list) and len(entry) == 2:
+            response.append([entry[0], entry[1]])
+        else:
+            response.append([line, 'grey'])
+
+    return response
+
+
+def results_to_response(results):
+
+    response = []
+    for result in results:
+        label = job_label(result['job'])
+        if result.get('attempt'):
+            label += ' (retry {0})'.format(result['attempt'])
+        if result.get('cancelled'):
+            response.append(['CANCELLED: Worker job {0} was not started'.format(label), 'orange'])
+            continue
+        response.extend(parse_worker_output(result['output']))
+        if result['returncode'] == 0:
+            peak = ', peak {0} MB'.format(result['peak_rss']) if result.get('peak_rss') else ''
+            response.append(['FINISHED worker job {0} in {1:.2f}s{2}'.format(label, result['elapsed'], peak), 'fuchsia'])
+        else:
+            response.append(['ERROR: Worker job {0} failed with exit status {1}'.format(label, result['returncode']), 'red'])
+
+    return response
@@ -0,0 +1,69 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: render_worker.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Headless worker launched by render_pool as "nuke -t render_worker.py job.json".
+       Opens the job's script, applies its overrides and renders a single Write node through batch_writer.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import batch_writer
+
+
+def job_to_custom_dict(job):
+
+    custom_dict = {'scanlines': job.get('scanlines'),
+                   'rays': job.get('rays'),
+                   'writes': {job['write']: {'selected': True,
+                                             'file': job['file'],
+                                             'range': '{0}-{1}'.format(job['first'], job['last']),
+                                             'step': job.get('step', 1)}},
+                   'root': job.get('root')}
+    if job.get('proxy'):
+        custom_dict['writes'][job['write']]['proxy'] = job['proxy']
+    custom_dict['writes'][job['write']].update(job.get('codec') or {})
+    return custom_dict
+
+
+def emit(event):
+
+    # The pool reads the [message, color] lines back into its own log
+    sys.stdout.write(json.dumps([event['message'], event['color']]) + '\n')
+    sys.stdout.flush()
+
+
+def main(argv):
+
+    if len(argv) != 2:
+        sys.stderr.write('Usage: nuke -t render_worker.py <job.json>\n')
+        return 2
+
+    with open(argv[1]) as f:
+        job = json.load(f)
+
+    # Workers never save the script, so there is nothing to restore
+    return batch_writer.run(job['script'], job_to_custom_dict(job), True, emit, restore=False, report=False)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,178 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: run_timing.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Timing of one customize -> write -> restore run: elapsed time of every stage, and frames, elapsed time,
+       frames per second and per-frame times of every Write. Summarized in the log and exported as JSON and CSV.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import contextlib
+import csv
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+REPORT_DIR_NAME = 'scene_writer_reports'
+CSV_COLUMNS = ('write', 'mode', 'frames', 'elapsed', 'fps', 'frame_min', 'frame_avg', 'frame_max')
+
+
+def default_report_dir(script):
+
+    # Next to the script, or in the temp directory for an untitled one
+    if script in ('', 'Root', 'Untitled'):
+        return os.path.join(tempfile.gettempdir(), REPORT_DIR_NAME)
+    return os.path.join(os.path.dirname(script), REPORT_DIR_NAME)
+
+
+class RunTimer(object):
+
+    def __init__(self, script='', mode=''):
+
+        self.script = script
+        self.mode = mode
+        self.started_at = datetime.datetime.now()
+        self.start_time = time.time()
+        self.stages = []
+        self.writes = {}
+        self.write_order = []
+
+
+    @contextlib.contextmanager
+    def stage(self, name):
+
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.time() - start_time)
+
+
+    def add_stage(self, name, elapsed):
+
+        for stage in self.stages:
+            if stage['stage'] == name:
+                stage['elapsed'] += elapsed
+                return
+        self.stages.append({'stage': name, 'elapsed': elapsed})
+
+
+    def add_write(self, write_name, frames, elapsed, frame_times=None, mode=None):
+
+        # Several ranges or chunks of the same Write add up
+        if write_name not in self.writes:
+            self.write_order.append(write_name)
+            self.writes[write_name] = {'write': write_name, 'mode': mode or self.mode,
+                                       'frames': 0, 'elapsed': 0.0, 'frame_times': []}
+
+        write_timing = self.writes[write_name]
+        write_timing['frames'] += frames
+        write_timing['elapsed'] += elapsed
+        write_timing['frame_times'].extend(frame_times or [])
+
+
+    def total(self):
+
+        return time.time() - self.start_time
+
+
+    def write_rows(self):
+
+        rows = []
+        for write_name in self.write_order:
+            write_timing = self.writes[write_name]
+            frame_times = write_timing['frame_times']
+            elapsed = write_timing['elapsed']
+            rows.append({'write': write_name,
+                         'mode': write_timing['mode'],
+                         'frames': write_timing['frames'],
+                         'elapsed': round(elapsed, 4),
+                         'fps': round(write_timing['frames'] / elapsed, 3) if elapsed > 0 else None,
+                         'frame_min': round(min(frame_times), 4) if frame_times else None,
+                         'frame_avg': round(sum(frame_times) / len(frame_times), 4) if frame_times else None,
+                         'frame_max': round(max(frame_times), 4) if frame_times else None})
+        return rows
+
+
+    def to_dict(self):
+
+        return {'script': self.script,
+                'mode': self.mode,
+                'host': platform.node(),
+                'started_at': self.started_at.isoformat(),
+                'total': round(self.total(), 4),
+                'stages': [{'stage': stage['stage'], 'elapsed': round(stage['elapsed'], 4)} for stage in self.stages],
+                'writes': self.write_rows()}
+
+
+    def summary_response(self):
+
+        response = []
+        response.append(['-- TIMING --', 'cyan'])
+
+        for stage in self.stages:
+            response.append(['{0:<14}{1:>10.3f}s'.format(stage['stage'].upper(), stage['elapsed']), 'cyan'])
+        response.append(['{0:<14}{1:>10.3f}s'.format('TOTAL', self.total()), 'cyan'])
+
+        for row in self.write_rows():
+            line = 'Write node {0} ({1}): {2} frame(s) in {3:.3f}s'.format(row['write'], row['mode'], row['frames'], row['elapsed'])
+            if row['fps'] is not None:
+                line += ', {0:.2f} fps'.format(row['fps'])
+            if row['frame_avg'] is not None:
+                line += ', frame min/avg/max {0:.3f}/{1:.3f}/{2:.3f}s'.format(row['frame_min'], row['frame_avg'], row['frame_max'])
+            response.append([line, 'cyan'])
+
+        return response
+
+
+    def export(self, directory):
+
+        # <directory>/<script>_<timestamp>.json with everything, and .csv with one row per Write
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        script_name = os.path.splitext(os.path.basename(self.script))[0] or 'untitled'
+        base_path = os.path.join(directory, '{0}_{1}'.format(script_name, self.started_at.strftime('%Y%m%d_%H%M%S_%f')))
+
+        with open(base_path + '.json', 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+
+        # The csv module wants binary files on Python 2 and untranslated newlines on Python 3
+        if sys.version_info[0] < 3:
+            csv_file = open(base_path + '.csv', 'wb')
+        else:
+            csv_file = open(base_path + '.csv', 'w', newline='')
+        with csv_file as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+            for row in self.write_rows():
+                writer.writerow(row)
+
+        return base_path + '.json', base_path + '.csv'
+
+
+    def export_response(self, directory):
+
+        try:
+            json_path, csv_path = self.export(directory)
+        except (IOError, OSError) as e:
+            return [['ERROR: Could not save the timing report to {0}: {1}'.format(directory, e), 'red']]
+        return [['Timing report saved to {0} and {1}'.format(json_path, csv_path), 'cyan']]
@@ -0,0 +1,208 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: scene_index.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Name -> node handle/class index shared by all the steps of one operation, so every node is looked up once.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import time
+
+import nuke
+
+INDEXED_CLASSES = ('ScanlineRender', 'RayRender', 'Write')
+
+
+class SceneIndex(object):
+
+    def __init__(self):
+
+        self.nodes = {}
+        self.classes = {}
+        self.lookups = 0
+        self.callbacks_registered = False
+        self.scan_stats = None
+
+
+    def node(self, name):
+
+        node = self.nodes.get(name)
+        if node is not None and self.is_valid(node, name):
+            return node
+
+        self.lookups += 1
+        node = nuke.toNode(name)
+        if node is None:
+            self.discard(name)
+            return None
+
+        self.nodes[name] = node
+        self.classes[name] = node.Class()
+        return node
+
+
+    def node_class(self, name):
+
+        if self.node(name) is None:
+            return None
+        return self.classes[name]
+
+
+    def add(self, node):
+
+        name = node.fullName()
+        self.nodes[name] = node
+        self.classes[name] = node.Class()
+
+
+    def discard(self, name):
+
+        self.nodes.pop(name, None)
+        self.classes.pop(name, None)
+
+
+    def invalidate(self):
+
+        self.nodes.clear()
+        self.classes.clear()
+
+
+    def scan(self, classes=INDEXED_CLASSES):
+
+        # One recursive pass over the whole node graph, inside Groups and Gizmos too, bucketing nodes by class
+        buckets = dict((node_class, []) for node_class in classes)
+        visited = 0
+        start_time = time.time()
+
+        pending = [nuke.root()]
+        while pending:
+            group = pending.pop(0)
+            for node in group.nodes():
+                visited += 1
+                node_class = node.Class()
+                if node_class in buckets:
+                    buckets[node_class].append(node)
+                    self.add(node)
+                if isinstance(node, nuke.Group):
+                    pending.append(node)
+
+        self.scan_stats = {'visited': visited,
+                           'elapsed': time.time() - start_time,
+                           'counts': dict((node_class, len(buckets[node_class])) for node_class in classes)}
+        return buckets
+
+
+    @staticmethod
+    def is_valid(node, name):
+
+        # Handles of deleted nodes raise ValueError, renamed nodes no longer match their key
+        try:
+            return node.fullName() == name
+        except ValueError:
+            return False
+
+
+    # CALLBACKS
+    def on_destroy(self):
+
+        try:
+            self.discard(nuke.thisNode().fullName())
+        except ValueError:
+            self.invalidate()
+
+
+    def on_knob_changed(self):
+
+        if nuke.thisKnob().name() != 'name':
+            return
+        self.invalidate()
+
+
+    def register_callbacks(self):
+
+        if self.callbacks_registered:
+            return
+        for node_class in INDEXED_CLASSES:
+            nuke.addOnDestroy(self.on_destroy, nodeClass=node_class)
+            nuke.addKnobChanged(self.on_knob_changed, nodeClass=node_class)
+        self.callbacks_registered = True
+
+
+    def unregister_callbacks(self):
+
+        if not self.callbacks_registered:
+            return
+        for node_class in INDEXED_CLASSES:
+            nuke.removeOnDestroy(self.on_destroy, nodeClass=node_class)
+            nuke.removeKnobChanged(self.on_knob_changed, nodeClass=node_class)
+        self.callbacks_registered = False
+
+
+class SceneWatcher(object):
+
+    # Forwards the creation, deletion and renaming of indexed nodes to the given functions, to keep views of the scene live
+    def __init__(self, created, destroyed, renamed):
+
+        self.created = created
+        self.destroyed = destroyed
+        self.renamed = renamed
+        self.callbacks_registered = False
+
+
+    # CALLBACKS
+    def on_create(self):
+
+        self.created(nuke.thisNode())
+
+
+    def on_destroy(self):
+
+        node = nuke.thisNode()
+        try:
+            self.destroyed(node.fullName(), node.Class())
+        except ValueError:
+            pass
+
+
+    def on_knob_changed(self):
+
+        # Called for every knob of every watched node, only renames go any further
+        if nuke.thisKnob().name() != 'name':
+            return
+        self.renamed(nuke.thisNode())
+
+
+    def register_callbacks(self):
+
+        if self.callbacks_registered:
+            return
+        for node_class in INDEXED_CLASSES:
+            nuke.addOnCreate(self.on_create, nodeClass=node_class)
+            nuke.addOnDestroy(self.on_destroy, nodeClass=node_class)
+            nuke.addKnobChanged(self.on_knob_changed, nodeClass=node_class)
+        self.callbacks_registered = True
+
+
+    def unregister_callbacks(self):
+
+        if not self.callbacks_registered:
+            return
+        for node_class in INDEXED_CLASSES:
+            nuke.removeOnCreate(self.on_create, nodeClass=node_class)
+            nuke.removeOnDestroy(self.on_destroy, nodeClass=node_class)
+            nuke.removeKnobChanged(self.on_knob_changed, nodeClass=node_class)
+        self.callbacks_registered = False
@@ -20,12 +20,116 @@ __maintainer__ = 'Jaime Rivera'
 __email__ = 'jaime.rvq@gmail.com'
 __status__ = 'Testing'
 
+import time
+IMPORT_STARTED = time.time()
+
 from PySide2 import QtWidgets, QtCore, QtGui, QtUiTools
 import os
-import datetime
+import subprocess
 
+import directory_checks
+import render_pool
+import scene_index
 import nuke_specific_functions
-reload(nuke_specific_functions)
+import table_models
+import log_sink
+import pipeline_events
+import pipeline_job
+import render_admission
+import render_cache
+import render_costs
+import run_timing
+import write_codecs
+
+# Modules are only reloaded on import when developing the tool, e.g. SCENE_WRITER_DEV=1
+DEV_MODE = os.environ.get('SCENE_WRITER_DEV', '') not in ('', '0')
+if DEV_MODE:
+    try:
+        from importlib import reload
+    except ImportError:
+        pass
+    # Only imported through the modules below, listed here so they are reloaded too
+    import frame_files
+    import job_spool
+    import json_store
+    import output_verification
+
+    # Dependencies before the modules importing them, so every module picks up the reloaded code
+    for module in (frame_files, json_store, pipeline_events, write_codecs, run_timing, render_pool, render_admission,
+                   render_costs, render_cache, job_spool, output_verification, directory_checks, scene_index, log_sink,
+                   nuke_specific_functions, table_models, pipeline_job):
+        reload(module)
+
+IMPORT_TIME = time.time() - IMPORT_STARTED
+
+UI_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scene_writerUI.ui')
+FORM_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scene_writerUI_form.py')
+FORM_CLASS = None
+
+
+def compile_form():
+
+    # Precompiles the .ui file to Python, only when the cached form is missing or older than the .ui file
+    if os.path.exists(FORM_FILE) and os.path.getmtime(FORM_FILE) >= os.path.getmtime(UI_FILE):
+        return True
+
+    # Compiled to a temporary file renamed into place, so an interrupted compile or another session
+    # importing the form at the same time never sees half a file
+    temp_file = '{0}.{1}.tmp'.format(FORM_FILE, os.getpid())
+    try:
+        compiled = compile_to(temp_file)
+        if compiled:
+            replace_form(temp_file)
+        return compiled
+    except (IOError, OSError):
+        # e.g. a read-only install location
+        return False
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
+def compile_to(form_file):
+
+    try:
+        from pyside2uic import compileUi
+        with open(UI_FILE, 'r') as ui_file:
+            with open(form_file, 'w') as f:
+                compileUi(ui_file, f)
+        return True
+    except ImportError:
+        pass
+
+    try:
+        return subprocess.call(['pyside2-uic', UI_FILE, '-o', form_file]) == 0
+    except OSError:
+        return False
+
+
+def replace_form(temp_file):
+
+    try:
+        os.rename(temp_file, FORM_FILE)
+    except OSError:
+        # Windows can't rename over an existing file
+        os.remove(FORM_FILE)
+        os.rename(temp_file, FORM_FILE)
+
+
+def get_form_class():
+
+    global FORM_CLASS
+
+    if FORM_CLASS is None or DEV_MODE:
+        if not compile_form():
+            return None
+        import scene_writerUI_form
+        if DEV_MODE:
+            reload(scene_writerUI_form)
+        FORM_CLASS = scene_writerUI_form.Ui_Form
+
+    return FORM_CLASS
+
 
 class SceneWriter(QtWidgets.QWidget):
 
@@ -34,10 +138,22 @@ class SceneWriter(QtWidgets.QWidget):
         QtWidgets.QWidget.__init__(self)
         path = os.path.abspath(__file__)
         dir_path = os.path.dirname(path).replace('\\', '/') + '/'
-        file = QtCore.QFile(dir_path+'scene_writerUI.ui')
-        file.open(QtCore.QFile.ReadOnly)
-        loader = QtUiTools.QUiLoader()
-        self.ui = loader.load(file, self)
+
+        # UI, FROM THE CACHED PRECOMPILED FORM WHEN POSSIBLE
+        self.startup_times = {'import': IMPORT_TIME}
+        start_time = time.time()
+        form_class = get_form_class()
+        if form_class is not None:
+            self.ui = form_class()
+            self.ui.setupUi(self)
+            ui_source = 'precompiled form'
+        else:
+            file = QtCore.QFile(dir_path+'scene_writerUI.ui')
+            file.open(QtCore.QFile.ReadOnly)
+            loader = QtUiTools.QUiLoader()
+            self.ui = loader.load(file, self)
+            ui_source = 'QUiLoader'
+        self.startup_times['ui'] = time.time() - start_time
 
         # WINDOW STYLE
         self.icons_path = dir_path + '/icons/'
@@ -49,22 +165,72 @@ class SceneWriter(QtWidgets.QWidget):
         self.setFixedSize(1167,501)
         self.setWindowFlags(QtCore.Qt.WindowStaysOnTopHint)
 
+        # BACKGROUND JOB
+        self.job = None
+        self.job_thread = None
+        self.job_index = None
+        self.job_sinks = []
+
+        # RENDER COST ESTIMATES, READ FROM DISK ONCE AND AGAIN AFTER EVERY RUN; UPSTREAM NODE NAMES OF EVERY WRITE ESTIMATED
+        self.cost_history = render_costs.CostHistory()
+        self.write_upstream = {}
+
+        # OUTPUT DIRECTORIES, CHECKED IN BATCHES AND CACHED FOR A FEW SECONDS
+        self.directory_cache = directory_checks.DirectoryCache()
+
         # LOG
         self.showing_log = True
+        self.log_sink = log_sink.LogSink(self.ui.log)
+
+        # TABLE MODELS
+        self.setup_models()
 
         # SETUP
         self.setup_style()
         self.make_connections()
-        self.append_to_log('-- POPULATING SCANLINE RENDER TABLE --', 'cyan')
-        self.populate_scanline()
-        self.append_to_log('-- POPULATING RAY RENDER TABLE --', 'cyan')
-        self.populate_ray()
-        self.append_to_log('-- POPULATING WRITE NODES TABLE --', 'cyan')
-        self.populate_write()
+
+        start_time = time.time()
+        self.discover_nodes()
+        self.startup_times['scan'] = time.time() - start_time
+
+        # ONLY THE CURRENT TAB IS FILLED NOW, THE OTHERS WHEN THEY ARE FIRST OPENED
+        self.populated_tabs = set()
+        start_time = time.time()
+        self.populate_tab(self.ui.tabs.currentIndex())
+        self.startup_times['fill'] = time.time() - start_time
+
+        # ROWS FOLLOW THE NODES CREATED, DELETED AND RENAMED WHILE THE WINDOW IS OPEN
+        self.scene_watcher = scene_index.SceneWatcher(self.scene_node_created, self.scene_node_destroyed, self.scene_node_renamed)
+        self.scene_watcher.register_callbacks()
+
+        self.append_to_log('Startup: import {0:.3f}s, UI load {1:.3f}s ({2}), scene scan {3:.3f}s, table fill {4:.3f}s'
+                           ''.format(self.startup_times['import'], self.startup_times['ui'], ui_source,
+                                     self.startup_times['scan'], self.startup_times['fill']), 'cyan')
 
         self.show()
 
 
+    def setup_models(self):
+
+        self.scanline_model = table_models.NodeTableModel(table_models.SCANLINE_COLUMNS, self)
+        self.ray_model = table_models.NodeTableModel(table_models.RAY_COLUMNS, self)
+        self.write_model = table_models.NodeTableModel(table_models.WRITE_COLUMNS, self)
+
+        check_icon = QtGui.QIcon(self.icons_path + 'check.png')
+        check_icon.addPixmap(self.icons_path + 'check.png', QtGui.QIcon.Disabled)
+        dir_icon = QtGui.QIcon(self.icons_path + 'folder.png')
+        dir_icon.addPixmap(self.icons_path + 'folder.png', QtGui.QIcon.Disabled)
+        self.write_model.icons = {'selected': check_icon, 'directory': dir_icon}
+
+        self.table_delegate = table_models.NodeTableDelegate(self)
+        for table, model in [(self.ui.scanline_table, self.scanline_model),
+                             (self.ui.ray_table, self.ray_model),
+                             (self.ui.write_table, self.write_model)]:
+            table.setModel(model)
+            table.setItemDelegate(self.table_delegate)
+            table.setEditTriggers(QtWidgets.QAbstractItemView.AllEditTriggers)
+
+
     def setup_style(self):
 
         # TABLE SIZES
@@ -84,14 +250,21 @@ class SceneWriter(QtWidgets.QWidget):
         write_header = self.ui.write_table.horizontalHeader()
         write_header.setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeToContents)
         write_header.setSectionResizeMode(1, QtWidgets.QHeaderView.Stretch)
-        write_header.resizeSection(2, 200)
+        write_header.resizeSection(2, 160)
         write_header.setSectionResizeMode(2, QtWidgets.QHeaderView.Fixed)
         write_header.resizeSection(3, 90)
         write_header.setSectionResizeMode(3, QtWidgets.QHeaderView.Fixed)
         write_header.resizeSection(4, 70)
         write_header.setSectionResizeMode(4, QtWidgets.QHeaderView.Fixed)
-        write_header.resizeSection(5, 120)
-        write_header.setSectionResizeMode(5, QtWidgets.QHeaderView.Fixed)
+        write_header.setSectionResizeMode(5, QtWidgets.QHeaderView.ResizeToContents)
+        write_header.setSectionResizeMode(6, QtWidgets.QHeaderView.ResizeToContents)
+        write_header.resizeSection(7, 120)
+        write_header.setSectionResizeMode(7, QtWidgets.QHeaderView.Fixed)
+        write_header.resizeSection(8, 70)
+        write_header.setSectionResizeMode(8, QtWidgets.QHeaderView.Fixed)
+        write_header.resizeSection(9, 70)
+        write_header.setSectionResizeMode(9, QtWidgets.QHeaderView.Fixed)
+        write_header.setSectionResizeMode(10, QtWidgets.QHeaderView.ResizeToContents)
 
 
         # BUTTONS
@@ -101,6 +274,17 @@ class SceneWriter(QtWidgets.QWidget):
         self.ui.write_selected_btn.setIcon(QtGui.QIcon(self.icons_path + 'check.png'))
         self.ui.write_selected_btn.setIconSize(QtCore.QSize(15, 15))
 
+        # OPTIONS
+        self.ui.workers_spin.setValue(nuke_specific_functions.DEFAULT_SETTINGS['max_workers'])
+        self.ui.nuke_executable_line.setPlaceholderText(render_pool.default_nuke_executable())
+        self.ui.nuke_executable_line.setToolTip('Executable launched as "nuke -t" for every worker pool job')
+
+        self.ui.cancel_btn.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_BrowserStop))
+        self.ui.cancel_btn.setIconSize(QtCore.QSize(20, 20))
+        self.ui.cancel_btn.setToolTip('Cancel after the current frame, nodes are restored anyway')
+        self.ui.progress_bar.hide()
+        self.ui.checksum_check.setEnabled(False)
+
         # LOG
         self.ui.clear_btn.setIcon(QtGui.QIcon(self.icons_path + 'clear.png'))
         self.ui.clear_btn.setIconSize(QtCore.QSize(25, 25))
@@ -111,173 +295,314 @@ class SceneWriter(QtWidgets.QWidget):
         self.ui.eye_btn.setToolTip('Hide log output text')
 
 
-        self.ui.log.insertHtml("<font color = cyan>[{}] SCENE WRITER WINDOW CREATED".format(str(datetime.datetime.now().time())[:12]))
-        self.ui.log.insertHtml("<br><font color = cyan>[{0}] SCENE: {1}".format(str(datetime.datetime.now().time())[:12], self.scene_name))
+        self.ui.log.clear()
+        self.ui.max_log_lines_spin.setValue(log_sink.DEFAULT_MAX_LINES)
+        self.ui.max_log_lines_spin.setToolTip('Oldest lines are dropped from the log once it reaches this size')
+        self.ui.log_file_line.setToolTip('Optional file that receives the full log, including lines dropped from the widget')
+        self.ui.events_file_line.setToolTip('Optional file receiving every event of a job as one JSON object per line, '
+                                            'with its stage, node, knob, old and new values, level and timestamp')
+        self.ui.events_file_line.setPlaceholderText('events.jsonl')
+        self.ui.report_dir_line.setPlaceholderText(run_timing.default_report_dir(self.scene_name))
+        self.ui.report_dir_line.setToolTip('Directory of the JSON and CSV timing report saved after every run')
+        self.ui.cache_check.setToolTip('Frames rendered before with the same upstream nodes, knob values, input files and output path are skipped')
+        self.ui.suspend_callbacks_check.setToolTip('Python knobChanged/updateUI callbacks of the customized node classes are '
+                                                   'taken out while knobs are set, and put back right after')
+        self.ui.spool_dir_line.setToolTip('Shared directory drained by spool_worker.py on the render hosts, used by "Submit to job spool"')
+        self.ui.preview_check.setToolTip('Quick sanity pass: samples and antialiasing lowered, proxy mode on, every Nth frame, '
+                                         'written to a preview folder; everything is restored afterwards')
+        self.ui.preview_dir_line.setPlaceholderText('<Write directory>/{0}'.format(nuke_specific_functions.PREVIEW_DIR_NAME))
+        self.ui.preview_dir_line.setToolTip('Directory of the preview frames, by default a preview folder next to each Write output')
+        self.ui.admission_check.setToolTip('Worker pool only: each job waits until its expected memory (the peak measured on '
+                                           'earlier runs, or {0} MB) fits in free memory, and gets its share of the cores as '
+                                           'thread and cache limits'.format(render_admission.DEFAULT_JOB_MEMORY_MB))
+        self.ui.longest_first_check.setToolTip('Writes are rendered, queued or spooled in order of their Estimate column, '
+                                               'so a long one does not start last and keep the whole run going')
+        self.ui.create_dirs_check.setToolTip('Output directories of the Write nodes that do not exist yet are created '
+                                             'before writing, instead of skipping those Writes')
+        self.ui.cache_file_line.setPlaceholderText(render_cache.DEFAULT_INDEX_FILE)
+        self.ui.cache_file_line.setToolTip('JSON index of the render cache, entries unused for {0} days are dropped'
+                                           ''.format(render_cache.DEFAULT_MAX_AGE_DAYS))
+
+        self.append_to_log('SCENE WRITER WINDOW CREATED', 'cyan')
+        self.append_to_log('SCENE: {}'.format(self.scene_name), 'cyan')
 
 
     def make_connections(self):
 
         self.ui.tabs.currentChanged.connect(self.toggled_tabs)
 
-        self.ui.write_table.cellClicked.connect(self.modify_writes)
+        self.ui.write_table.clicked.connect(self.modify_writes)
+        self.write_model.dataChanged.connect(self.cost_inputs_changed)
+        self.scanline_model.dataChanged.connect(self.cost_inputs_changed)
+        self.ray_model.dataChanged.connect(self.cost_inputs_changed)
 
         self.ui.clear_btn.clicked.connect(self.clear_log)
         self.ui.eye_btn.clicked.connect(self.toggle_log)
+        self.ui.max_log_lines_spin.valueChanged.connect(self.log_sink.set_max_lines)
+        self.ui.log_file_line.editingFinished.connect(self.change_log_file)
+        self.ui.verify_check.toggled.connect(self.ui.checksum_check.setEnabled)
         
         self.ui.write_all_btn.clicked.connect(self.customize_and_write)
         self.ui.write_selected_btn.clicked.connect(lambda: self.customize_and_write(True))
+        self.ui.cancel_btn.clicked.connect(self.cancel_job)
 
-    def populate_scanline(self):
+    def discover_nodes(self):
 
-        import nuke
+        self.append_to_log('-- SCANNING SCENE --', 'cyan')
 
-        if len(nuke.allNodes('ScanlineRender')) == 0:
-            self.append_to_log('INFO: No ScanlineRender nodes found', 'orange')
+        index = scene_index.SceneIndex()
+        buckets = index.scan()
+        self.scene_index = index
 
-        for node in nuke.allNodes('ScanlineRender'):
-            row = self.ui.scanline_table.rowCount()
+        # {class: {name: node}} and {node: name}, the name each node is listed under, so deletions and renames
+        # find their node and row without walking the others
+        self.discovered_nodes = {}
+        self.node_names = {}
+        for node_class, nodes in buckets.items():
+            self.discovered_nodes[node_class] = {}
+            for node in nodes:
+                name = node.fullName()
+                self.discovered_nodes[node_class][name] = node
+                self.node_names[node] = name
 
-            self.ui.scanline_table.insertRow(self.ui.scanline_table.rowCount())
+        counts = index.scan_stats['counts']
+        self.append_to_log('Scanned {0} node(s) in {1:.3f}s, found {2} ScanlineRender, {3} RayRender and {4} Write node(s)'
+                           ''.format(index.scan_stats['visited'], index.scan_stats['elapsed'],
+                                     counts['ScanlineRender'], counts['RayRender'], counts['Write']), 'cyan')
 
-            scanline_name = QtWidgets.QTableWidgetItem()
-            scanline_name.setTextAlignment(QtCore.Qt.AlignCenter)
-            scanline_name.setText(node.name())
-            scanline_name.setFlags(QtCore.Qt.ItemIsEditable)
-            scanline_name.setForeground(QtGui.QBrush(QtGui.QColor(QtCore.Qt.white)))
-            self.ui.scanline_table.setItem(row, 0, scanline_name)
 
-            aa_filter = QtWidgets.QComboBox()
-            aa_filter.addItems(['Impulse', 'Cubic', 'Keys', 'Simon', 'Rifman', 'Mitchell', 'Parzen', 'Notch', 'Lanczos4', 'Lanczos6',
-                                'Sinc4', 'Nearest', 'Bilinear', 'Trilinear', 'Anisotropic'])
-            aa_filter.setCurrentIndex(node['filter'].getValue())
-            self.ui.scanline_table.setCellWidget(row, 1, aa_filter)
+    def populate_tab(self, index):
 
-            aa_options = QtWidgets.QComboBox()
-            aa_options.addItems(['None', 'Low', 'Medium', 'High'])
-            aa_options.setCurrentIndex(node['antialiasing'].getValue())
-            self.ui.scanline_table.setCellWidget(row, 2, aa_options)
+        if index in self.populated_tabs:
+            return
+        self.populated_tabs.add(index)
 
-            aa_samples = QtWidgets.QSpinBox()
-            aa_samples.setMinimum(0)
-            aa_samples.setMaximum(50)
-            aa_samples.setValue(node['samples'].getValue())
-            self.ui.scanline_table.setCellWidget(row, 3, aa_samples)
+        if index == 0:
+            self.append_to_log('-- POPULATING SCANLINE RENDER TABLE --', 'cyan')
+            self.populate_scanline()
+            self.append_to_log('-- POPULATING RAY RENDER TABLE --', 'cyan')
+            self.populate_ray()
+        elif index == 1:
+            self.append_to_log('-- POPULATING WRITE NODES TABLE --', 'cyan')
+            self.populate_write()
 
-            aa_shutter = QtWidgets.QDoubleSpinBox()
-            aa_shutter.setMinimum(-10)
-            aa_shutter.setMaximum(10)
-            aa_shutter.setSingleStep(0.25)
-            aa_shutter.setValue(node['shutter'].getValue())
-            self.ui.scanline_table.setCellWidget(row, 4, aa_shutter)
 
-            self.append_to_log('Found ScanlineRender node {}, added to list'.format(node.name()), 'lime')
+    def populate_all_tabs(self):
 
+        for index in range(self.ui.tabs.count()):
+            self.populate_tab(index)
 
-    def populate_ray(self):
 
-        import nuke
+    def populate_scanline(self):
 
-        if len(nuke.allNodes('RayRender')) == 0:
-            self.append_to_log('INFO: No RayRender nodes found', 'orange')
+        nodes = self.discovered_nodes['ScanlineRender'].values()
+        if len(nodes) == 0:
+            self.append_to_log('INFO: No ScanlineRender nodes found', 'orange')
 
-        for node in nuke.allNodes('RayRender'):
-            row = self.ui.ray_table.rowCount()
+        rows = []
+        for node in nodes:
+            rows.append(self.scanline_row(node))
+            self.append_to_log('Found ScanlineRender node {}, added to list'.format(node.fullName()), 'lime')
 
-            self.ui.ray_table.insertRow(self.ui.ray_table.rowCount())
+        self.scanline_model.add_rows(rows)
 
-            ray_name = QtWidgets.QTableWidgetItem()
-            ray_name.setTextAlignment(QtCore.Qt.AlignCenter)
-            ray_name.setText(node.name())
-            ray_name.setFlags(QtCore.Qt.ItemIsEditable)
-            ray_name.setForeground(QtGui.QBrush(QtGui.QColor(QtCore.Qt.white)))
-            self.ui.ray_table.setItem(row, 0, ray_name)
 
-            aa_filter = QtWidgets.QComboBox()
-            aa_filter.addItems(['Impulse', 'Cubic', 'Keys', 'Simon', 'Rifman', 'Mitchell', 'Parzen', 'Notch', 'Lanczos4', 'Lanczos6', 'Sinc4'])
-            aa_filter.setCurrentIndex(node['filter'].getValue())
-            self.ui.ray_table.setCellWidget(row, 1, aa_filter)
+    def populate_ray(self):
 
-            aa_samples = QtWidgets.QSpinBox()
-            aa_samples.setMinimum(0)
-            aa_samples.setMaximum(50)
-            aa_samples.setValue(node['samples'].getValue())
-            self.ui.ray_table.setCellWidget(row, 2, aa_samples)
+        nodes = self.discovered_nodes['RayRender'].values()
+        if len(nodes) == 0:
+            self.append_to_log('INFO: No RayRender nodes found', 'orange')
 
-            aa_shutter = QtWidgets.QDoubleSpinBox()
-            aa_shutter.setMinimum(-10)
-            aa_shutter.setMaximum(10)
-            aa_shutter.setSingleStep(0.25)
-            aa_shutter.setValue(node['shutter'].getValue())
-            self.ui.ray_table.setCellWidget(row, 3, aa_shutter)
+        rows = []
+        for node in nodes:
+            rows.append(self.ray_row(node))
+            self.append_to_log('Found RayRender node {}, added to list'.format(node.fullName()), 'lime')
 
-            self.append_to_log('Found RayRender node {}, added to list'.format(node.name()), 'lime')
+        self.ray_model.add_rows(rows)
 
 
     def populate_write(self):
         
-        import nuke
-
-        if len(nuke.allNodes('Write')) == 0:
+        nodes = self.discovered_nodes['Write'].values()
+        if len(nodes) == 0:
             self.append_to_log('INFO: No Write nodes found', 'orange')
 
-        for node in nuke.allNodes('Write'):
-            row = self.ui.write_table.rowCount()
-
-            self.ui.write_table.insertRow(self.ui.write_table.rowCount())
-
-            write_name = QtWidgets.QTableWidgetItem()
-            write_name.setText(node.name())
-            write_name.setFlags(QtCore.Qt.ItemIsEditable)
-            write_name.setForeground(QtGui.QBrush(QtGui.QColor(QtCore.Qt.white)))
-            self.ui.write_table.setItem(row, 0, write_name)
-
-            write_directory = QtWidgets.QTableWidgetItem()
-            write_directory.setFlags(QtCore.Qt.ItemIsEditable)
-            write_directory.setForeground(QtGui.QBrush(QtGui.QColor(QtCore.Qt.white)))
-            original_write_dir = os.path.dirname(node['file'].value())
-            if original_write_dir == '':
-                write_directory.setText(os.path.dirname(self.scene_name))
-            else:
-                write_directory.setText(original_write_dir)
-            dir_icon = QtGui.QIcon(self.icons_path + 'folder.png')
-            dir_icon.addPixmap(self.icons_path + 'folder.png', QtGui.QIcon.Disabled)
-            write_directory.setIcon(dir_icon)
-            self.ui.write_table.setItem(row, 1, write_directory)
-
-            comment_line = QtWidgets.QLineEdit()
-            comment_validator = QtGui.QRegExpValidator(QtCore.QRegExp("[a-z0-9_]*"))
-            comment_line.setValidator(comment_validator)
-            comment_line.setAlignment(QtCore.Qt.AlignCenter)
-            comment_line.setText('only_lowkey_comments')
-            self.ui.write_table.setCellWidget(row, 2, comment_line)
-
-            padding_line = QtWidgets.QLineEdit()
-            padding_validator = QtGui.QRegExpValidator(QtCore.QRegExp("#*"))
-            padding_line.setValidator(padding_validator)
-            padding_line.setAlignment(QtCore.Qt.AlignCenter)
-            padding_line.setText('####')
-            self.ui.write_table.setCellWidget(row, 3, padding_line)
-
-            format_line = QtWidgets.QLineEdit()
-            format_validator = QtGui.QRegExpValidator(QtCore.QRegExp("\.[a-z]*"))
-            format_line.setValidator(format_validator)
-            format_line.setAlignment(QtCore.Qt.AlignCenter)
-            format_line.setText('.png')
-            self.ui.write_table.setCellWidget(row, 4, format_line)
-
-            range_line = QtWidgets.QLineEdit()
-            range_validator = QtGui.QRegExpValidator(QtCore.QRegExp("\d+-?\d+"))
-            range_line.setValidator(range_validator)
-            range_line.setAlignment(QtCore.Qt.AlignCenter)
-            range_line.setText('1-10')
-            self.ui.write_table.setCellWidget(row, 5, range_line)
-
-            self.append_to_log('Found Write node {}, added to list'.format(node.name()), 'lime')
+        rows = []
+        for node in nodes:
+            rows.append(self.write_row(node))
+            self.append_to_log('Found Write node {}, added to list'.format(node.fullName()), 'lime')
+
+        self.write_model.add_rows(rows)
+
+        # Walking the upstream graphs can take a while on big scripts, the window opens first
+        QtCore.QTimer.singleShot(0, self.update_estimates)
+
+
+    # TABLE ROWS
+    def scanline_row(self, node):
+
+        return {'name': node.fullName(),
+                'filter': int(node['filter'].getValue()),
+                'antialiasing': int(node['antialiasing'].getValue()),
+                'samples': int(node['samples'].getValue()),
+                'shutter': node['shutter'].getValue()}
+
+
+    def ray_row(self, node):
+
+        return {'name': node.fullName(),
+                'filter': int(node['filter'].getValue()),
+                'samples': int(node['samples'].getValue()),
+                'shutter': node['shutter'].getValue()}
+
+
+    def write_row(self, node):
+
+        original_write_dir = os.path.dirname(node['file'].value())
+        if original_write_dir == '':
+            original_write_dir = os.path.dirname(self.scene_name)
+
+        # The Write keeps its own output format unless it is one we have no codec settings for
+        original_format = os.path.splitext(node['file'].value())[1].lower()
+        if write_codecs.file_type(original_format) is None:
+            original_format = '.png'
+
+        return {'name': node.fullName(),
+                'selected': False,
+                'directory': original_write_dir,
+                'comment': 'only_lowkey_comments',
+                'padding': '####',
+                'format': original_format,
+                'datatype': 0,
+                'compression': 0,
+                'range': '1-10',
+                'chunk_size': 0,
+                'workers': 0,
+                'estimate': ''}
+
+
+    def class_table(self, node_class):
+
+        # (model, tab, row builder) of the table listing a node class
+        return {'ScanlineRender': (self.scanline_model, 0, self.scanline_row),
+                'RayRender': (self.ray_model, 0, self.ray_row),
+                'Write': (self.write_model, 1, self.write_row)}[node_class]
+
+
+    # LIVE SYNC WITH THE SCENE
+    def scene_node_created(self, node):
+
+        name = node.fullName()
+        self.discovered_nodes[node.Class()][name] = node
+        self.node_names[node] = name
+
+        model, tab, row_builder = self.class_table(node.Class())
+        if tab not in self.populated_tabs:
+            # Listed with the others when its tab is first opened
+            return
+
+        model.add_rows([row_builder(node)])
+        self.append_to_log('{0} node {1} created, added to list'.format(node.Class(), node.fullName()), 'lime')
+        if node.Class() == 'Write':
+            self.update_estimates([node.fullName()])
+
+
+    def scene_node_destroyed(self, name, node_class):
+
+        node = self.discovered_nodes[node_class].pop(name, None)
+        self.node_names.pop(node, None)
+
+        self.write_upstream.pop(name, None)
+        model = self.class_table(node_class)[0]
+        row = model.find_row(name)
+        if row is not None:
+            model.remove_row(row)
+            self.append_to_log('{0} node {1} deleted, removed from list'.format(node_class, name), 'orange')
+
+
+    def scene_node_renamed(self, node):
+
+        old_name = self.node_names.get(node)
+        new_name = node.fullName()
+        if old_name is None or old_name == new_name:
+            return
+
+        node_class = node.Class()
+        self.node_names[node] = new_name
+        self.discovered_nodes[node_class][new_name] = self.discovered_nodes[node_class].pop(old_name, node)
+
+        model = self.class_table(node_class)[0]
+        row = model.find_row(old_name)
+        if row is None:
+            # Its tab hasn't been filled yet
+            return
+
+        model.set_row_value(row, 'name', new_name)
+        self.append_to_log('{0} node {1} renamed to {2}'.format(node_class, old_name, new_name), 'lime')
+        if node_class == 'Write':
+            self.write_upstream.pop(old_name, None)
+            self.update_estimates([new_name])
+        else:
+            self.rename_upstream(old_name, new_name)
+
+
+    def update_estimates(self, write_names=None):
+
+        # Estimate column of the Write nodes table, with the samples and antialiasing set in the render tables.
+        # Only the rows of write_names when given; every upstream node is read once per call
+        script = nuke_specific_functions.get_the_scene()
+
+        overrides = {}
+        for model in (self.scanline_model, self.ray_model):
+            for row in range(model.rowCount()):
+                row_data = model.row_data(row)
+                overrides[row_data['name']] = dict((key, row_data[key]) for key in ('samples', 'antialiasing') if key in row_data)
+
+        memo = {}
+        for row in range(self.write_model.rowCount()):
+            row_data = self.write_model.row_data(row)
+            if write_names is not None and row_data['name'] not in write_names:
+                continue
+            node = self.scene_index.node(row_data['name'])
+            try:
+                frame_start, frame_end = nuke_specific_functions.parse_range(row_data['range'])
+            except ValueError:
+                frame_start, frame_end = 1, 0
+            if node is None or frame_end < frame_start:
+                self.write_model.set_row_value(row, 'estimate', '')
+                continue
+            units, self.write_upstream[row_data['name']] = render_costs.graph_walk(node, overrides, memo)
+            estimate = self.cost_history.estimate_units(script, row_data['name'], units, frame_end - frame_start + 1)
+            self.write_model.set_row_value(row, 'estimate', render_costs.estimate_label(estimate))
+
+
+    def rename_upstream(self, old_name, new_name):
+
+        for upstream in self.write_upstream.values():
+            if old_name in upstream:
+                upstream.discard(old_name)
+                upstream.add(new_name)
+
+
+    def cost_inputs_changed(self, top_left, bottom_right):
+
+        # Only the Writes edited, or the ones downstream of the render nodes edited, are estimated again
+        model = top_left.model()
+        key = model.columns[top_left.column()]['key']
+        names = set(model.row_data(row)['name'] for row in range(top_left.row(), bottom_right.row() + 1))
+
+        if model is self.write_model:
+            if key == 'range':
+                self.update_estimates(names)
+        elif key in ('samples', 'antialiasing'):
+            self.update_estimates([write_name for write_name, upstream in self.write_upstream.items() if upstream & names])
 
 
     def toggled_tabs(self, index):
 
-        if index == 1:
+        self.populate_tab(index)
+
+        if index == 1 and self.job is None:
             self.ui.write_all_btn.setEnabled(True)
             self.ui.write_selected_btn.setEnabled(True)
 
@@ -286,28 +611,28 @@ class SceneWriter(QtWidgets.QWidget):
             self.ui.write_selected_btn.setEnabled(False)
 
 
-    def modify_writes(self, row, column):
+    def modify_writes(self, model_index):
 
-        if column == 0:
+        row = model_index.row()
+        column = model_index.column()
 
-            node_cell = self.ui.write_table.item(row, 0)
-            state = node_cell.icon()
+        if column == 0:
 
-            if not state:
-                check_icon = QtGui.QIcon(self.icons_path + 'check.png')
-                check_icon.addPixmap(self.icons_path + 'check.png', QtGui.QIcon.Disabled)
-                node_cell.setIcon(check_icon)
-            else:
-                node_cell.setIcon(QtGui.QIcon())
+            selected = self.write_model.row_data(row)['selected']
+            self.write_model.set_row_value(row, 'selected', not selected)
 
 
         elif column == 1:
 
-            dir_cell = self.ui.write_table.item(row, 1)
-            new_dir = QtWidgets.QFileDialog().getExistingDirectory()
+            # Opened where the Write already points, listing directories only, to keep slow mounts from being walked
+            row_data = self.write_model.row_data(row)
+            new_dir = QtWidgets.QFileDialog.getExistingDirectory(self, 'Output directory of {0}'.format(row_data['name']),
+                                                                 row_data['directory'],
+                                                                 QtWidgets.QFileDialog.ShowDirsOnly | QtWidgets.QFileDialog.DontResolveSymlinks)
 
             if new_dir:
-                dir_cell.setText(new_dir)
+                self.directory_cache.mark(new_dir, True)
+                self.write_model.set_row_value(row, 'directory', new_dir)
 
 
     def toggle_log(self):
@@ -316,7 +641,7 @@ class SceneWriter(QtWidgets.QWidget):
 
             self.ui.log.hide()
             self.ui.clear_btn.hide()
-            self.ui.eye_btn.move(190, 460)
+            self.ui.eye_btn.move(190, 350)
             self.ui.eye_btn.setIcon(QtGui.QIcon(self.icons_path + 'show.png'))
             self.ui.eye_btn.setToolTip('Show log output text')
             self.showing_log = not self.showing_log
@@ -333,23 +658,43 @@ class SceneWriter(QtWidgets.QWidget):
 
     def clear_log(self):
 
-        self.ui.log.clear()
-        self.ui.log.insertHtml("<font color = cyan>[{}] LOG CLEARED".format(str(datetime.datetime.now().time())[:12]))
+        self.log_sink.clear()
+        self.append_to_log('LOG CLEARED', 'cyan')
+
+
+    def change_log_file(self):
+
+        log_file = str(self.ui.log_file_line.text())
+        if log_file == (self.log_sink.log_file_path or ''):
+            return
+
+        try:
+            self.log_sink.set_log_file(log_file)
+        except IOError as e:
+            self.append_to_log('ERROR: Could not open log file {0}: {1}'.format(log_file, e), 'red')
+        else:
+            self.append_to_log('Writing full log to {}'.format(log_file or 'no file'), 'cyan')
 
 
     def append_to_log(self, message, color):
 
-        time = str(datetime.datetime.now().time())[:12]
-        text = "<br><font color = {0}>[{1}] {2}".format(color, time, message)
-        self.ui.log.insertHtml(text)
+        self.log_sink.append(message, color)
 
-        self.ui.log.moveCursor(QtGui.QTextCursor.End)
-        
-    
-    def build_original_dictionary(self):
 
-        import nuke
-        
+    def closeEvent(self, event):
+
+        if self.job is not None:
+            self.append_to_log('INFO: A job is still running, cancel it and wait for the nodes to be restored before closing', 'orange')
+            event.ignore()
+            return
+
+        self.scene_watcher.unregister_callbacks()
+        self.log_sink.close()
+        QtWidgets.QWidget.closeEvent(self, event)
+
+
+    def build_original_dictionary(self, index):
+
         self.append_to_log('-- SAVING ORIGINAL CONFIGURATION OF NODES --', 'cyan')
 
         original_dictionary = {'scanlines': None,
@@ -357,17 +702,17 @@ class SceneWriter(QtWidgets.QWidget):
                                'writes': None}
 
         # SCANLINE RENDER NODES
-        if self.ui.scanline_table.rowCount() == 0:
+        if self.scanline_model.rowCount() == 0:
             self.append_to_log('INFO: No ScanlineRender nodes in the scene', 'orange')
 
         else:
 
             scanlines_dict = {}
 
-            for row in range(self.ui.scanline_table.rowCount()):
+            for row in range(self.scanline_model.rowCount()):
 
-                scnl_name = str(self.ui.scanline_table.item(row, 0).text())
-                scnl_node = nuke.toNode(scnl_name)
+                scnl_name = self.scanline_model.row_data(row)['name']
+                scnl_node = index.node(scnl_name)
 
                 if not scnl_node:
                     self.append_to_log('ERROR: ScanlineRender node {} not found, skipped'.format(scnl_name), 'red')
@@ -393,17 +738,17 @@ class SceneWriter(QtWidgets.QWidget):
 
 
         # RAY RENDER NODES
-        if self.ui.ray_table.rowCount() == 0:
+        if self.ray_model.rowCount() == 0:
             self.append_to_log('INFO: No RayRender nodes in the scene', 'orange')
 
         else:
 
             rays_dict = {}
 
-            for row in range(self.ui.ray_table.rowCount()):
+            for row in range(self.ray_model.rowCount()):
 
-                ray_name = str(self.ui.ray_table.item(row, 0).text())
-                ray_node = nuke.toNode(ray_name)
+                ray_name = self.ray_model.row_data(row)['name']
+                ray_node = index.node(ray_name)
 
                 if not ray_node:
                     self.append_to_log('ERROR: RayRender node {} not found, skipped'.format(ray_name), 'red')
@@ -425,17 +770,17 @@ class SceneWriter(QtWidgets.QWidget):
             original_dictionary['rays'] = rays_dict
 
         # WRITE RENDER NODES
-        if self.ui.write_table.rowCount() == 0:
+        if self.write_model.rowCount() == 0:
             self.append_to_log('INFO: No Write nodes in the scene', 'orange')
 
         else:
 
             writes_dict = {}
 
-            for row in range(self.ui.write_table.rowCount()):
+            for row in range(self.write_model.rowCount()):
 
-                write_name = str(self.ui.write_table.item(row, 0).text())
-                write_node = nuke.toNode(write_name)
+                write_name = self.write_model.row_data(row)['name']
+                write_node = index.node(write_name)
 
                 if not write_node:
                     self.append_to_log('ERROR: Write node {} not found, skipped'.format(write_name), 'red')
@@ -450,9 +795,7 @@ class SceneWriter(QtWidgets.QWidget):
 
         return original_dictionary
 
-    def build_custom_dictionary(self):
-
-        import nuke
+    def build_custom_dictionary(self, index):
 
         self.append_to_log('-- BUILDING CUSTOM CONFIGURATION OF NODES --', 'cyan')
 
@@ -461,32 +804,33 @@ class SceneWriter(QtWidgets.QWidget):
                              'writes': None}
 
         # SCANLINE RENDER NODES
-        if self.ui.scanline_table.rowCount() == 0:
+        if self.scanline_model.rowCount() == 0:
             self.append_to_log('INFO: No ScanlineRender nodes in the list', 'orange')
 
         else:
 
             scanlines_dict = {}
 
-            for row in range(self.ui.scanline_table.rowCount()):
+            for row in range(self.scanline_model.rowCount()):
 
-                scnl_name = str(self.ui.scanline_table.item(row, 0).text())
+                scnl_name = self.scanline_model.row_data(row)['name']
 
-                if nuke.toNode(scnl_name) is None:
+                if index.node(scnl_name) is None:
                     self.append_to_log('ERROR: ScanlineRender node {} not found, skipped'.format(scnl_name), 'red')
                 else:
                     scanlines_dict[scnl_name] = {}
+                    row_data = self.scanline_model.row_data(row)
 
-                    scnl_filter = self.ui.scanline_table.cellWidget(row, 1).currentIndex()
+                    scnl_filter = row_data['filter']
                     scanlines_dict[scnl_name]['filter'] = scnl_filter
 
-                    scnl_antialiasing = self.ui.scanline_table.cellWidget(row, 2).currentIndex()
+                    scnl_antialiasing = row_data['antialiasing']
                     scanlines_dict[scnl_name]['antialiasing'] = scnl_antialiasing
 
-                    scnl_samples = int(self.ui.scanline_table.cellWidget(row, 3).value())
+                    scnl_samples = int(row_data['samples'])
                     scanlines_dict[scnl_name]['samples'] = scnl_samples
 
-                    scnl_shutter = self.ui.scanline_table.cellWidget(row, 4).value()
+                    scnl_shutter = row_data['shutter']
                     scanlines_dict[scnl_name]['shutter'] = scnl_shutter
 
                     self.append_to_log('ScanlineRender node {0}, FILTER:{1}, AA:{2}, SAMPLES:{3}, SHUTTER:{4}'
@@ -496,29 +840,30 @@ class SceneWriter(QtWidgets.QWidget):
             
             
         # RAY RENDER NODES
-        if self.ui.ray_table.rowCount() == 0:
+        if self.ray_model.rowCount() == 0:
             self.append_to_log('INFO: No RayRender nodes in the list', 'orange')
 
         else:
 
             rays_dict = {}
 
-            for row in range(self.ui.ray_table.rowCount()):
+            for row in range(self.ray_model.rowCount()):
 
-                ray_name = str(self.ui.ray_table.item(row, 0).text())
+                ray_name = self.ray_model.row_data(row)['name']
 
-                if nuke.toNode(ray_name) is None:
+                if index.node(ray_name) is None:
                     self.append_to_log('ERROR: RayRender node {} not found, skipped'.format(ray_name), 'red')
                 else:
                     rays_dict[ray_name] = {}
+                    row_data = self.ray_model.row_data(row)
 
-                    ray_filter = self.ui.ray_table.cellWidget(row, 1).currentIndex()
+                    ray_filter = row_data['filter']
                     rays_dict[ray_name]['filter'] = ray_filter
 
-                    ray_samples = int(self.ui.ray_table.cellWidget(row, 2).value())
+                    ray_samples = int(row_data['samples'])
                     rays_dict[ray_name]['samples'] = ray_samples
 
-                    ray_shutter = self.ui.ray_table.cellWidget(row, 3).value()
+                    ray_shutter = row_data['shutter']
                     rays_dict[ray_name]['shutter'] = ray_shutter
 
                     self.append_to_log('RayRender node {0}, FILTER:{1}, SAMPLES:{2}, SHUTTER:{3}'
@@ -528,72 +873,241 @@ class SceneWriter(QtWidgets.QWidget):
             
             
         # WRITE RENDER NODES
-        if self.ui.write_table.rowCount() == 0:
+        if self.write_model.rowCount() == 0:
             self.append_to_log('INFO: No Write nodes in the list', 'orange')
 
         else:
 
             writes_dict = {}
 
-            for row in range(self.ui.write_table.rowCount()):
+            # Every distinct output directory is looked at once, all at the same time, and created first if asked to
+            target_dirs = [self.write_model.row_data(row)['directory'] for row in range(self.write_model.rowCount())
+                           if index.node(self.write_model.row_data(row)['name']) is not None]
+            hits = self.directory_cache.hits
+            directories = self.directory_cache.check(target_dirs, self.ui.create_dirs_check.isChecked())
+            for target_dir in sorted(set(target_dirs)):
+                if directories[target_dir]['created']:
+                    self.append_to_log('Created output directory {0}'.format(target_dir), 'lime')
+                elif directories[target_dir]['error']:
+                    self.append_to_log('ERROR: Could not create output directory {0}: {1}'.format(target_dir, directories[target_dir]['error']), 'red')
+            self.append_to_log('Checked {0} output directories, {1} from the cache'
+                               ''.format(len(set(target_dirs)), self.directory_cache.hits - hits), 'cyan')
+
+            for row in range(self.write_model.rowCount()):
 
-                write_name = str(self.ui.write_table.item(row, 0).text())
+                write_name = self.write_model.row_data(row)['name']
 
-                if nuke.toNode(write_name) is None:
+                if index.node(write_name) is None:
                     self.append_to_log('ERROR: Write node {} not found, skipped'.format(write_name), 'red')
 
                 else:
-                    target_dir = str(self.ui.write_table.item(row, 1).text())
+                    row_data = self.write_model.row_data(row)
+                    target_dir = row_data['directory']
 
-                    if not os.path.exists(target_dir):
+                    if not directories[target_dir]['exists']:
                         self.append_to_log('ERROR: Write node {0} has a non-existent file path, will be skipped'.format(write_name), 'red')
 
                     else:
                         writes_dict[write_name] = {}
 
-                        write_selected = False
-                        if self.ui.write_table.item(row, 0).icon():
-                            write_selected = True
+                        write_selected = row_data['selected']
                         writes_dict[write_name]['selected'] = write_selected
 
                         if target_dir.endswith('/'):
                             target_dir = target_dir[:-1]
                         custom_file = (target_dir) + '/' + \
-                                      str(self.ui.write_table.cellWidget(row, 2).text()) + '.' + \
-                                      str(self.ui.write_table.cellWidget(row, 3).text()) + \
-                                      str(self.ui.write_table.cellWidget(row, 4).text())
+                                      row_data['comment'] + '.' + \
+                                      row_data['padding'] + \
+                                      row_data['format']
                         writes_dict[write_name]['file'] = custom_file
 
-                        write_range = str(self.ui.write_table.cellWidget(row, 5).text())
+                        # File type from the extension, then the bit depth and compression it takes
+                        codec, codec_errors = write_codecs.codec_knobs(row_data['format'],
+                                                                       write_codecs.DATATYPE_OPTIONS[row_data['datatype']],
+                                                                       write_codecs.COMPRESSION_OPTIONS[row_data['compression']])
+                        writes_dict[write_name].update(codec)
+                        for codec_error in codec_errors:
+                            self.append_to_log('WARNING: Write node {0}, {1}'.format(write_name, codec_error), 'orange')
+
+                        write_range = row_data['range']
                         writes_dict[write_name]['range'] = write_range
 
-                        self.append_to_log('Write node {0}, SELECTED:{1}, FILE:{2}, RANGE:{3}'.format(write_name, write_selected, custom_file, write_range), 'lime')
+                        chunk_size = row_data['chunk_size']
+                        writes_dict[write_name]['chunk_size'] = chunk_size
+
+                        chunk_workers = row_data['workers']
+                        writes_dict[write_name]['workers'] = chunk_workers or None
+
+                        self.append_to_log('Write node {0}, SELECTED:{1}, FILE:{2}, CODEC:{3}, RANGE:{4}, CHUNK:{5}, WORKERS:{6}'
+                                           ''.format(write_name, write_selected, custom_file, write_codecs.codec_label(codec),
+                                                     write_range, chunk_size, chunk_workers), 'lime')
 
             custom_dictionary['writes'] = writes_dict
 
+        # RENDER SETTINGS
+        custom_dictionary['settings'] = self.build_settings()
+
 
         return custom_dictionary
 
+
+    def build_settings(self):
+
+        render_mode = nuke_specific_functions.RENDER_MODE_LOCAL
+        if self.ui.render_mode_combo.currentIndex() == 1:
+            render_mode = nuke_specific_functions.RENDER_MODE_POOL
+        elif self.ui.render_mode_combo.currentIndex() == 2:
+            render_mode = nuke_specific_functions.RENDER_MODE_SHARED
+        elif self.ui.render_mode_combo.currentIndex() == 3:
+            render_mode = nuke_specific_functions.RENDER_MODE_SPOOL
+
+        chunk_mode = render_pool.CHUNK_MODE_CONTIGUOUS
+        if self.ui.chunk_mode_combo.currentIndex() == 1:
+            chunk_mode = render_pool.CHUNK_MODE_INTERLEAVED
+
+        settings = {'render_mode': render_mode,
+                    'max_workers': self.ui.workers_spin.value(),
+                    'nuke_executable': str(self.ui.nuke_executable_line.text()) or None,
+                    'chunk_mode': chunk_mode,
+                    'chunk_retries': self.ui.chunk_retries_spin.value(),
+                    'resume': self.ui.resume_check.isChecked(),
+                    'verify': self.ui.verify_check.isChecked(),
+                    'checksum': self.ui.checksum_check.isChecked(),
+                    'report_dir': str(self.ui.report_dir_line.text()) or None,
+                    'cache': self.ui.cache_check.isChecked(),
+                    'cache_file': str(self.ui.cache_file_line.text()) or None,
+                    'suspend_callbacks': self.ui.suspend_callbacks_check.isChecked(),
+                    'spool_dir': str(self.ui.spool_dir_line.text()) or None,
+                    'preview': self.ui.preview_check.isChecked(),
+                    'preview_step': self.ui.preview_step_spin.value(),
+                    'preview_dir': str(self.ui.preview_dir_line.text()) or None,
+                    'admission': self.ui.admission_check.isChecked(),
+                    'longest_first': self.ui.longest_first_check.isChecked()}
+
+        self.append_to_log('Render settings, MODE:{0}, MAX WORKERS:{1}, CHUNKS:{2}, RETRIES:{3}, RESUME:{4}, VERIFY:{5}, CHECKSUM:{6}, CACHE:{7}, PREVIEW:{8}'
+                           ''.format(settings['render_mode'], settings['max_workers'], settings['chunk_mode'], settings['chunk_retries'],
+                                     settings['resume'], settings['verify'], settings['checksum'], settings['cache'],
+                                     'every {0}'.format(settings['preview_step']) if settings['preview'] else False), 'lime')
+
+        return settings
+
         
     def customize_and_write(self, only_selected=False):
 
-        # BUILDING ORIGINAL DICT
-        original_dict = self.build_original_dictionary()
+        if self.job is not None:
+            return
+
+        # TABLES NEVER OPENED STILL HAVE TO BE IN THE DICTIONARIES
+        self.populate_all_tabs()
+
+        # SCENE INDEX, SHARED BY EVERY STEP
+        index = scene_index.SceneIndex()
+        index.register_callbacks()
+
+        # EVERY STAGE AND WRITE IS TIMED, THE SUMMARY IS LOGGED WHEN THE JOB ENDS
+        timer = run_timing.RunTimer(self.scene_name)
+
+        try:
+            # BUILDING ORIGINAL DICT
+            with timer.stage('snapshot'):
+                original_dict = self.build_original_dictionary(index)
+
+            # BUILDING CUSTOM DICT
+            with timer.stage('build'):
+                custom_dict = self.build_custom_dictionary(index)
+
+                # PREVIEW MODE AND THE CODEC COLUMNS CHANGE KNOBS THE ORIGINAL DICT DOESN'T HAVE YET
+                for line in nuke_specific_functions.apply_preview(custom_dict):
+                    self.append_to_log(line[0], line[1])
+                nuke_specific_functions.extend_snapshot(original_dict, custom_dict, index)
+
+                # ONLY KNOBS THAT ACTUALLY CHANGE ARE SET AND RESTORED
+                delta = nuke_specific_functions.build_delta(original_dict, custom_dict, only_selected)
+            timer.mode = nuke_specific_functions.get_setting(custom_dict, 'render_mode')
+
+        except Exception:
+            index.unregister_callbacks()
+            raise
+
+        # EVERY EVENT OF THE JOB ALSO GOES TO THE JSONL EVENT LOG, IF ONE IS SET
+        self.job_sinks = []
+        events_file = str(self.ui.events_file_line.text())
+        if events_file:
+            try:
+                self.job_sinks.append(pipeline_events.JsonlSink(events_file))
+            except (IOError, OSError) as e:
+                self.append_to_log('ERROR: Could not open event log {0}: {1}'.format(events_file, e), 'red')
+
+        # CUSTOMIZING, WRITING AND RESETING RUN AS A BACKGROUND JOB
+        self.job_index = index
+        self.job = pipeline_job.PipelineJob(original_dict, custom_dict, only_selected, index, delta, timer, self.job_sinks)
+        self.job_thread = QtCore.QThread(self)
+        self.job.moveToThread(self.job_thread)
+
+        self.job_thread.started.connect(self.job.run)
+        self.job.log.connect(self.append_to_log)
+        self.job.stage_changed.connect(self.job_stage_changed)
+        self.job.write_started.connect(self.job_write_started)
+        self.job.frame_progress.connect(self.job_frame_progress)
+        self.job.finished.connect(self.job_finished)
+
+        self.set_running(True)
+        self.job_thread.start()
+
+
+    def set_running(self, running):
+
+        writes_tab = self.ui.tabs.currentIndex() == 1
+        self.ui.write_all_btn.setEnabled(writes_tab and not running)
+        self.ui.write_selected_btn.setEnabled(writes_tab and not running)
+        self.ui.cancel_btn.setEnabled(running)
+        self.ui.progress_bar.setVisible(running)
+        self.ui.progress_bar.setValue(0)
+
+
+    def cancel_job(self):
+
+        if self.job is not None:
+            self.append_to_log('CANCEL requested, stopping after the current frame', 'orange')
+            self.job.cancel()
+
+
+    def job_stage_changed(self, stage):
+
+        self.ui.progress_bar.setFormat('{0} %p%'.format(stage.upper()))
+
+
+    def job_write_started(self, write_name, total):
+
+        self.ui.progress_bar.setValue(0)
+
+
+    def job_frame_progress(self, write_name, frame, done, total):
+
+        self.ui.progress_bar.setFormat('{0} frame {1} %p%'.format(write_name, frame))
+        self.ui.progress_bar.setValue(int(100.0 * done / total))
+
+
+    def job_finished(self, cancelled):
 
-        # BUILDING CUSTOM DICT
-        custom_dict = self.build_custom_dictionary()
+        self.job_thread.quit()
+        self.job_thread.wait()
+        self.job_index.unregister_callbacks()
 
-        # CUSTOMIZING NODES
-        logs = nuke_specific_functions.customize_nodes(custom_dict, only_selected)
-        for log in logs:
-            self.append_to_log(log[0], log[1])
+        if cancelled:
+            self.append_to_log('JOB CANCELLED, nodes were restored to their original values', 'orange')
+        self.append_to_log('Scene index resolved {0} node(s) with {1} lookup(s)'.format(len(self.job_index.nodes), self.job_index.lookups), 'cyan')
 
-        # WRITING
-        logs = nuke_specific_functions.write_custom(custom_dict, only_selected)
-        for log in logs:
-            self.append_to_log(log[0], log[1])
+        self.job.deleteLater()
+        self.job_thread.deleteLater()
+        self.job = None
+        self.job_thread = None
+        self.job_index = None
+        for sink in self.job_sinks:
+            sink.close()
+        self.job_sinks = []
+        self.set_running(False)
 
-        # RESETING NODES
-        logs = nuke_specific_functions.return_to_normal(original_dict)
-        for log in logs:
-            self.append_to_log(log[0], log[1])
\ No newline at end of file
+        # Times measured in this run refine the estimates
+        self.cost_history = render_costs.CostHistory()
+        self.update_estimates()
@@ -0,0 +1,137 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: spool_worker.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Worker daemon draining a job spool, one per render host:
+           python spool_worker.py <spool_dir> [--slots 2] [--nuke /path/to/Nuke] [--once]
+       Each slot claims a pending job, renders it with 'nuke -t render_worker.py' and writes the result back.
+       Several daemons, or several slots, can drain the same spool on one machine.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import job_spool
+import render_pool
+
+
+def log(message):
+
+    sys.stdout.write('[{0}] {1}\n'.format(time.strftime('%H:%M:%S'), message))
+    sys.stdout.flush()
+
+
+class SpoolWorker(object):
+
+    def __init__(self, spool_dir, executable, slots=1, once=False, poll=job_spool.POLL_INTERVAL):
+
+        self.spool_dir = spool_dir
+        self.executable = executable
+        self.slots = slots
+        self.once = once
+        self.poll = poll
+        self.stopped = threading.Event()
+        self.active = {}
+        self.lock = threading.Lock()
+
+
+    def run_slot(self, slot):
+
+        worker = job_spool.worker_id(slot)
+        while not self.stopped.is_set():
+
+            job_spool.requeue_stale(self.spool_dir)
+            job, claimed_path = job_spool.claim(self.spool_dir, worker)
+
+            if job is None:
+                if self.once:
+                    return
+                self.stopped.wait(self.poll)
+                continue
+
+            log('{0} claimed {1}: {2}'.format(worker, job['id'], render_pool.job_label(job)))
+            with self.lock:
+                self.active[worker] = claimed_path
+
+            try:
+                result = render_pool.run_job(job, self.executable)
+            finally:
+                with self.lock:
+                    del self.active[worker]
+
+            state = job_spool.finish(self.spool_dir, job, claimed_path, result, worker)
+            log('{0} finished {1} in {2:.1f}s, return code {3}, {4}'.format(worker, job['id'], result['elapsed'], result['returncode'], state))
+
+
+    def run_heartbeat(self):
+
+        while not self.stopped.wait(job_spool.HEARTBEAT_INTERVAL):
+            with self.lock:
+                claimed_paths = list(self.active.values())
+            job_spool.heartbeat(claimed_paths)
+
+
+    def run(self):
+
+        job_spool.ensure_spool(self.spool_dir)
+        log('Draining {0} with {1} slot(s), executable {2}'.format(self.spool_dir, self.slots, self.executable))
+
+        heartbeat_thread = threading.Thread(target=self.run_heartbeat)
+        heartbeat_thread.daemon = True
+        heartbeat_thread.start()
+
+        slot_threads = []
+        for slot in range(self.slots):
+            thread = threading.Thread(target=self.run_slot, args=(slot,))
+            thread.daemon = True
+            thread.start()
+            slot_threads.append(thread)
+
+        try:
+            while any(thread.is_alive() for thread in slot_threads):
+                time.sleep(0.2)
+        except KeyboardInterrupt:
+            # Jobs being rendered are left claimed, their heartbeat stops and they are requeued
+            log('Stopping')
+        self.stopped.set()
+
+
+def main(argv):
+
+    parser = argparse.ArgumentParser(prog='spool_worker.py', description='Render the jobs of a scene writer spool')
+    parser.add_argument('spool_dir', help='shared spool directory')
+    parser.add_argument('--slots', type=int, default=1, help='jobs rendered at once by this daemon')
+    parser.add_argument('--nuke', default=None,
+                        help='Nuke executable, by default ${0} or the running interpreter'.format(render_pool.NUKE_EXECUTABLE_ENV))
+    parser.add_argument('--once', action='store_true', help='exit once the spool has no pending jobs')
+    parser.add_argument('--poll', type=float, default=job_spool.POLL_INTERVAL, help='seconds between looks at an empty spool')
+    args = parser.parse_args(argv[1:])
+
+    worker = SpoolWorker(args.spool_dir, args.nuke or render_pool.default_nuke_executable(),
+                         max(1, args.slots), args.once, args.poll)
+    worker.run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
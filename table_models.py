@@ -0,0 +1,256 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: table_models.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Table models holding the state of the ScanlineRender, RayRender and Write nodes, and the delegate that
+       creates cell editors only while a cell is being edited.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+from PySide2 import QtWidgets, QtCore, QtGui
+
+import write_codecs
+
+
+SCANLINE_FILTERS = ['Impulse', 'Cubic', 'Keys', 'Simon', 'Rifman', 'Mitchell', 'Parzen', 'Notch', 'Lanczos4', 'Lanczos6',
+                    'Sinc4', 'Nearest', 'Bilinear', 'Trilinear', 'Anisotropic']
+RAY_FILTERS = ['Impulse', 'Cubic', 'Keys', 'Simon', 'Rifman', 'Mitchell', 'Parzen', 'Notch', 'Lanczos4', 'Lanczos6', 'Sinc4']
+ANTIALIASING_OPTIONS = ['None', 'Low', 'Medium', 'High']
+
+# Every column maps a key of the row dictionaries to a header and the kind of editor used to change it
+SCANLINE_COLUMNS = [{'key': 'name', 'header': 'Scanline Render', 'editor': None},
+                    {'key': 'filter', 'header': 'Filter', 'editor': 'combo', 'items': SCANLINE_FILTERS},
+                    {'key': 'antialiasing', 'header': 'Antialiasing', 'editor': 'combo', 'items': ANTIALIASING_OPTIONS},
+                    {'key': 'samples', 'header': 'Samples', 'editor': 'int', 'minimum': 0, 'maximum': 50},
+                    {'key': 'shutter', 'header': 'Shutter', 'editor': 'float', 'minimum': -10, 'maximum': 10, 'step': 0.25}]
+
+RAY_COLUMNS = [{'key': 'name', 'header': 'Ray Render', 'editor': None},
+               {'key': 'filter', 'header': 'Filter', 'editor': 'combo', 'items': RAY_FILTERS},
+               {'key': 'samples', 'header': 'Samples', 'editor': 'int', 'minimum': 0, 'maximum': 50},
+               {'key': 'shutter', 'header': 'Shutter', 'editor': 'float', 'minimum': -10, 'maximum': 10, 'step': 0.25}]
+
+WRITE_COLUMNS = [{'key': 'name', 'header': 'Write node', 'editor': None, 'align': 'left'},
+                 {'key': 'directory', 'header': 'Output directory', 'editor': None, 'align': 'left'},
+                 {'key': 'comment', 'header': 'Comment', 'editor': 'text', 'regexp': '[a-z0-9_]*'},
+                 {'key': 'padding', 'header': 'Padding', 'editor': 'text', 'regexp': '#*'},
+                 {'key': 'format', 'header': 'Format', 'editor': 'text', 'regexp': '\\.[a-z]*'},
+                 {'key': 'datatype', 'header': 'Bit depth', 'editor': 'combo', 'items': write_codecs.DATATYPE_OPTIONS,
+                  'tooltip': 'Bit depth written, Default keeps the one set on the Write'},
+                 {'key': 'compression', 'header': 'Compression', 'editor': 'combo', 'items': write_codecs.COMPRESSION_OPTIONS,
+                  'tooltip': 'EXR/TIFF compression, Default keeps the one set on the Write'},
+                 {'key': 'range', 'header': 'Range', 'editor': 'text', 'regexp': '\\d+-?\\d+'},
+                 {'key': 'chunk_size', 'header': 'Chunk', 'editor': 'int', 'minimum': 0, 'maximum': 100000,
+                  'special': 'All', 'tooltip': 'Frames per chunk when rendering with the worker pool'},
+                 {'key': 'workers', 'header': 'Workers', 'editor': 'int', 'minimum': 0, 'maximum': 256,
+                  'special': 'Any', 'tooltip': 'Maximum number of workers rendering chunks of this Write at once'},
+                 {'key': 'estimate', 'header': 'Estimate', 'editor': None,
+                  'tooltip': 'Expected render time of the range, from times measured on earlier runs (~ when never measured)'}]
+
+
+class NodeTableModel(QtCore.QAbstractTableModel):
+
+    def __init__(self, columns, parent=None):
+
+        QtCore.QAbstractTableModel.__init__(self, parent)
+        self.columns = columns
+        self.rows = []
+        self.icons = {}
+
+
+    # ROWS
+    def add_rows(self, rows):
+
+        if not rows:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+
+    def remove_row(self, row):
+
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        del self.rows[row]
+        self.endRemoveRows()
+
+
+    def find_row(self, name):
+
+        for row, row_data in enumerate(self.rows):
+            if row_data['name'] == name:
+                return row
+        return None
+
+
+    def clear(self):
+
+        self.beginResetModel()
+        self.rows = []
+        self.endResetModel()
+
+
+    def row_data(self, row):
+
+        return self.rows[row]
+
+
+    def set_row_value(self, row, key, value):
+
+        self.rows[row][key] = value
+        for column, column_spec in enumerate(self.columns):
+            if column_spec['key'] == key:
+                model_index = self.index(row, column)
+                self.dataChanged.emit(model_index, model_index)
+
+
+    # QAbstractTableModel
+    def rowCount(self, parent=QtCore.QModelIndex()):
+
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+
+        if parent.isValid():
+            return 0
+        return len(self.columns)
+
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.columns[section]['header']
+        return None
+
+
+    def data(self, model_index, role=QtCore.Qt.DisplayRole):
+
+        if not model_index.isValid():
+            return None
+
+        column_spec = self.columns[model_index.column()]
+        row = self.rows[model_index.row()]
+        value = row.get(column_spec['key'])
+
+        if role == QtCore.Qt.DisplayRole:
+            if column_spec['editor'] == 'combo':
+                return column_spec['items'][value]
+            if column_spec.get('special') and not value:
+                return column_spec['special']
+            return str(value)
+
+        if role == QtCore.Qt.EditRole:
+            return value
+
+        if role == QtCore.Qt.TextAlignmentRole:
+            if column_spec.get('align') == 'left':
+                return int(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
+            return int(QtCore.Qt.AlignCenter)
+
+        if role == QtCore.Qt.ForegroundRole and column_spec['editor'] is None:
+            return QtGui.QBrush(QtGui.QColor(QtCore.Qt.white))
+
+        if role == QtCore.Qt.DecorationRole:
+            if column_spec['key'] == 'name' and row.get('selected'):
+                return self.icons.get('selected')
+            if column_spec['key'] == 'directory':
+                return self.icons.get('directory')
+
+        if role == QtCore.Qt.ToolTipRole:
+            return column_spec.get('tooltip')
+
+        return None
+
+
+    def setData(self, model_index, value, role=QtCore.Qt.EditRole):
+
+        if not model_index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+
+        self.rows[model_index.row()][self.columns[model_index.column()]['key']] = value
+        self.dataChanged.emit(model_index, model_index)
+        return True
+
+
+    def flags(self, model_index):
+
+        if not model_index.isValid():
+            return QtCore.Qt.NoItemFlags
+        if self.columns[model_index.column()]['editor'] is None:
+            return QtCore.Qt.ItemIsEnabled
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable
+
+
+class NodeTableDelegate(QtWidgets.QStyledItemDelegate):
+
+    def createEditor(self, parent, option, model_index):
+
+        column_spec = model_index.model().columns[model_index.column()]
+
+        if column_spec['editor'] == 'combo':
+            editor = QtWidgets.QComboBox(parent)
+            editor.addItems(column_spec['items'])
+
+        elif column_spec['editor'] == 'int':
+            editor = QtWidgets.QSpinBox(parent)
+            editor.setMinimum(column_spec['minimum'])
+            editor.setMaximum(column_spec['maximum'])
+            if column_spec.get('special'):
+                editor.setSpecialValueText(column_spec['special'])
+
+        elif column_spec['editor'] == 'float':
+            editor = QtWidgets.QDoubleSpinBox(parent)
+            editor.setMinimum(column_spec['minimum'])
+            editor.setMaximum(column_spec['maximum'])
+            editor.setSingleStep(column_spec['step'])
+
+        elif column_spec['editor'] == 'text':
+            editor = QtWidgets.QLineEdit(parent)
+            editor.setValidator(QtGui.QRegExpValidator(QtCore.QRegExp(column_spec['regexp']), editor))
+            editor.setAlignment(QtCore.Qt.AlignCenter)
+
+        else:
+            return None
+
+        return editor
+
+
+    def setEditorData(self, editor, model_index):
+
+        value = model_index.model().data(model_index, QtCore.Qt.EditRole)
+
+        if isinstance(editor, QtWidgets.QComboBox):
+            editor.setCurrentIndex(value)
+        elif isinstance(editor, (QtWidgets.QSpinBox, QtWidgets.QDoubleSpinBox)):
+            editor.setValue(value)
+        else:
+            editor.setText(value)
+
+
+    def setModelData(self, editor, model, model_index):
+
+        if isinstance(editor, QtWidgets.QComboBox):
+            value = editor.currentIndex()
+        elif isinstance(editor, (QtWidgets.QSpinBox, QtWidgets.QDoubleSpinBox)):
+            value = editor.value()
+        else:
+            value = str(editor.text())
+
+        model.setData(model_index, value, QtCore.Qt.EditRole)
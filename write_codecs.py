@@ -0,0 +1,90 @@
+# -*- coding: UTF-8 -*-
+'''
+Author: Jaime Rivera
+File: write_codecs.py
+Date: 2026.10.18
+Revision: 2026.10.18
+Copyright: Copyright Jaime Rivera 2019 | www.jaimervq.com
+           The program(s) herein may be used, modified and/or distributed in accordance with the terms and conditions
+           stipulated in the Creative Commons license under which the program(s) have been registered. (CC BY-SA 4.0)
+
+Brief: Codec settings of the Write nodes: the file type picked from the output extension, and the bit depth and
+       compression knobs each file type has, with the values Nuke gives them. Settings a file type doesn't have are
+       reported instead of being set.
+
+'''
+
+__author__ = 'Jaime Rivera <jaime.rvq@gmail.com>'
+__copyright__ = 'Copyright 2019, Jaime Rivera'
+__credits__ = []
+__license__ = 'Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)'
+__maintainer__ = 'Jaime Rivera'
+__email__ = 'jaime.rvq@gmail.com'
+__status__ = 'Testing'
+
+import os
+
+# Knobs set on a Write, in this order: the datatype and compression knobs only exist once file_type is set
+CODEC_KNOBS = ('file_type', 'datatype', 'compression')
+
+FILE_TYPES = {'.exr': 'exr',
+              '.png': 'png',
+              '.tif': 'tiff',
+              '.tiff': 'tiff',
+              '.dpx': 'dpx',
+              '.jpg': 'jpeg',
+              '.jpeg': 'jpeg'}
+
+EXR_COMPRESSIONS = ['none', 'Zip (1 scanline)', 'Zip (16 scanlines)', 'PIZ Wavelet (32 scanlines)', 'RLE', 'B44', 'B44A',
+                    'DWAA', 'DWAB']
+TIFF_COMPRESSIONS = ['none', 'PackBits', 'LZW', 'Deflate']
+
+CODEC_VALUES = {'exr': {'datatype': ['16 bit half', '32 bit float'], 'compression': EXR_COMPRESSIONS},
+                'png': {'datatype': ['8 bit', '16 bit']},
+                'tiff': {'datatype': ['8 bit', '16 bit', '32 bit float'], 'compression': TIFF_COMPRESSIONS},
+                'dpx': {'datatype': ['8 bit', '10 bit', '12 bit', '16 bit']},
+                'jpeg': {}}
+
+# Items of the table columns, the first one leaves the knob as the Write has it
+DEFAULT_OPTION = 'Default'
+DATATYPE_OPTIONS = [DEFAULT_OPTION, '8 bit', '10 bit', '12 bit', '16 bit', '16 bit half', '32 bit float']
+COMPRESSION_OPTIONS = [DEFAULT_OPTION] + EXR_COMPRESSIONS + TIFF_COMPRESSIONS[1:]
+
+
+def file_type(file_value):
+
+    # Nuke file type written for a path or an extension, None when it isn't one we know
+    extension = os.path.splitext(file_value)[1] or file_value
+    return FILE_TYPES.get(extension.lower())
+
+
+def codec_knobs(file_value, datatype=None, compression=None):
+
+    # ({knob: value}, [errors]) for a Write rendering to file_value. None or 'Default' leave a knob untouched
+    knobs = {}
+    errors = []
+    output_type = file_type(file_value)
+    if output_type is None:
+        for attr, value in (('datatype', datatype), ('compression', compression)):
+            if value and value != DEFAULT_OPTION:
+                errors.append('{0} {1} ignored, unknown file type of {2}'.format(attr, value, file_value))
+        return knobs, errors
+
+    knobs['file_type'] = output_type
+    for attr, value in (('datatype', datatype), ('compression', compression)):
+        if not value or value == DEFAULT_OPTION:
+            continue
+        values = CODEC_VALUES[output_type].get(attr)
+        if not values:
+            errors.append('{0} {1} ignored, {2} files have no {0} setting'.format(attr, value, output_type))
+        elif value in values:
+            knobs[attr] = value
+        else:
+            errors.append('{0} {1} ignored, {2} files only take {3}'.format(attr, value, output_type, ', '.join(values)))
+    return knobs, errors
+
+
+def codec_label(write_dict):
+
+    # 'exr, 16 bit half, Zip (1 scanline)' for the logs, the settings left untouched are not listed
+    return ', '.join(str(write_dict[attr]) for attr in CODEC_KNOBS if write_dict.get(attr)) or 'unchanged'